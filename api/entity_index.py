@@ -0,0 +1,225 @@
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+# Newest results kept per team
+MAX_TEAM_MATCHES = 500
+# Most recently scraped stats tables kept per player (each filter combination is a table)
+MAX_PLAYER_TABLES = 16
+# Entities kept per kind; the least recently updated are dropped first
+MAX_TEAMS = 5000
+MAX_PLAYERS = 20000
+MAX_SEARCH_RESULTS = 50
+
+NON_WORD_RE = re.compile(r"[^\w]+")
+
+
+def normalize_name(name):
+    """Lookup key for a team or player name: accents stripped, casefolded, punctuation collapsed."""
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return NON_WORD_RE.sub(" ", stripped.casefold()).strip()
+
+
+class _Entities:
+    """
+    Entities of one kind with a sorted token list for prefix search.
+
+    At most ``limit`` entities are kept; by_key is in update order, so the
+    least recently updated one is dropped first.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.by_key = OrderedDict()
+        # (token, key) pairs; every word of a name is a token so "liq" finds "Team Liquid"
+        self.tokens = []
+
+    @staticmethod
+    def _tokens(key):
+        words = key.split(" ")
+        return [(" ".join(words[i:]), key) for i in range(len(words))]
+
+    def get_or_create(self, name, factory):
+        """The entity for ``name`` (created if new), marked as most recently updated."""
+        key = normalize_name(name)
+        if not key:
+            return None
+        entity = self.by_key.get(key)
+        if entity is not None:
+            self.by_key.move_to_end(key)
+            return entity
+        entity = factory(name)
+        self.by_key[key] = entity
+        for token in self._tokens(key):
+            insort(self.tokens, token)
+        if len(self.by_key) > self.limit:
+            self._evict_oldest()
+        return entity
+
+    def _evict_oldest(self):
+        key, _ = self.by_key.popitem(last=False)
+        for token in self._tokens(key):
+            i = bisect_left(self.tokens, token)
+            if i < len(self.tokens) and self.tokens[i] == token:
+                del self.tokens[i]
+
+    def search(self, prefix, limit):
+        prefix = normalize_name(prefix)
+        if not prefix:
+            return []
+        keys = []
+        seen = set()
+        i = bisect_left(self.tokens, (prefix,))
+        while i < len(self.tokens) and len(keys) < limit:
+            token, key = self.tokens[i]
+            if not token.startswith(prefix):
+                break
+            if key not in seen:
+                seen.add(key)
+                keys.append(key)
+            i += 1
+        return [self.by_key[key] for key in keys]
+
+
+class EntityIndex:
+    """
+    In-memory index of teams and players, fed by the scrapers as they run.
+
+    Teams collect their newest results (keyed by match_page, so re-scraped
+    matches replace older copies) and their ranking row per region. Players
+    collect their stats row for the most recently scraped stats tables.
+    Every collection is bounded (see the MAX_* limits). Lookups and prefix
+    searches never scrape.
+    """
+
+    def __init__(self):
+        self._teams = _Entities(MAX_TEAMS)
+        self._players = _Entities(MAX_PLAYERS)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _new_team(name):
+        return {"name": name, "matches": {}, "rankings": {}, "updated_at": None}
+
+    @staticmethod
+    def _new_player(name):
+        # Tables in scrape order, oldest first
+        return {"name": name, "org": None, "stats": OrderedDict(), "updated_at": None}
+
+    def add_results(self, matches):
+        """
+        Index result rows from /match?q=results.
+
+        Args:
+            matches (list): Result dicts; each needs a "completed_at" epoch (or None)
+        """
+        now = time.time()
+        with self._lock:
+            for match in matches:
+                for side in ("team1", "team2"):
+                    team = self._teams.get_or_create(match.get(side), self._new_team)
+                    if team is None:
+                        continue
+                    team["matches"][match["match_page"]] = match
+                    team["updated_at"] = now
+                    if len(team["matches"]) > MAX_TEAM_MATCHES:
+                        oldest = min(
+                            team["matches"].values(),
+                            key=lambda m: m.get("completed_at") or 0,
+                        )
+                        del team["matches"][oldest["match_page"]]
+
+    def add_rankings(self, region_key, rows):
+        now = time.time()
+        with self._lock:
+            for row in rows:
+                team = self._teams.get_or_create(row.get("team"), self._new_team)
+                if team is not None:
+                    team["rankings"][region_key] = row
+                    team["updated_at"] = now
+
+    def add_stats(self, table_key, rows):
+        """
+        Index the rows of one stats table.
+
+        Args:
+            table_key (str): Identifies the table, e.g. "na/60" or "na/60?map_id=1"
+            rows (list): Rows from parse_stats
+        """
+        now = time.time()
+        with self._lock:
+            for row in rows:
+                player = self._players.get_or_create(row.get("player"), self._new_player)
+                if player is not None:
+                    stats = player["stats"]
+                    stats[table_key] = row
+                    stats.move_to_end(table_key)
+                    if len(stats) > MAX_PLAYER_TABLES:
+                        stats.popitem(last=False)
+                    player["org"] = row.get("org")
+                    player["updated_at"] = now
+
+    @staticmethod
+    def _team_summary(team):
+        return {
+            "name": team["name"],
+            "key": normalize_name(team["name"]),
+            "matches": len(team["matches"]),
+            "ranked_regions": sorted(team["rankings"]),
+            "updated_at": team["updated_at"],
+        }
+
+    @staticmethod
+    def _player_summary(player):
+        return {
+            "name": player["name"],
+            "key": normalize_name(player["name"]),
+            "org": player["org"],
+            "stats_tables": sorted(player["stats"]),
+            "updated_at": player["updated_at"],
+        }
+
+    def search_teams(self, prefix, limit=MAX_SEARCH_RESULTS):
+        with self._lock:
+            return [self._team_summary(t) for t in self._teams.search(prefix, limit)]
+
+    def search_players(self, prefix, limit=MAX_SEARCH_RESULTS):
+        with self._lock:
+            return [self._player_summary(p) for p in self._players.search(prefix, limit)]
+
+    def team(self, name, limit=None):
+        """A team's indexed results (newest first) and rankings, or None if unknown."""
+        with self._lock:
+            team = self._teams.by_key.get(normalize_name(name))
+            if team is None:
+                return None
+            matches = sorted(
+                team["matches"].values(),
+                key=lambda m: m.get("completed_at") or 0,
+                reverse=True,
+            )
+            summary = self._team_summary(team)
+            summary["rankings"] = dict(team["rankings"])
+        summary["results"] = matches[:limit] if limit else matches
+        return summary
+
+    def player(self, name):
+        """A player's stats rows across every indexed stats table, or None if unknown."""
+        with self._lock:
+            player = self._players.by_key.get(normalize_name(name))
+            if player is None:
+                return None
+            summary = self._player_summary(player)
+            summary["stats"] = dict(player["stats"])
+        return summary
+
+    def counts(self):
+        with self._lock:
+            return {"teams": len(self._teams.by_key), "players": len(self._players.by_key)}
+
+
+entity_index = EntityIndex()
@@ -0,0 +1,252 @@
+"""
+Export scraped datasets as CSV, Arrow IPC or Parquet with typed columns.
+
+Run from the repository root:
+    python -m api.export results --to-page 20 --format parquet --out results.parquet
+    python -m api.export stats --regions na,eu --timespans 30,all --out stats.csv
+    python -m api.export results --input harvest/results.jsonl --format arrow --out results.arrows
+
+Rows are written batch by batch (one results/events page, stats table or
+rankings region per batch, or --batch-size lines of an --input file), so
+memory stays bounded however large the export is. --input converts the JSON
+lines written by api.harvest instead of scraping.
+"""
+import argparse
+import json
+import sys
+import time
+
+from api.scrapers.events import MAX_EVENT_PAGES, cached_completed_events, cached_upcoming_events
+from api.scrapers.matches import MAX_REFILL_PAGES, StableCrawl, scrape_results_page
+from api.scrapers.rankings import cached_rankings
+from api.stats_table import stats_store
+from utils import deadline
+from utils.columnar import FORMATS, export_chunks
+from utils.utils import STATS_REGIONS, STATS_TIMESPANS, region as REGIONS
+
+# (column, type) per dataset; types are the converters in utils/columnar.py
+SCHEMAS = {
+    "results": [
+        ("match_page", "str"),
+        ("completed_at", "timestamp"),
+        ("team1", "str"),
+        ("team2", "str"),
+        ("score1", "int"),
+        ("score2", "int"),
+        ("flag1", "str"),
+        ("flag2", "str"),
+        ("round_info", "str"),
+        ("tournament_name", "str"),
+        ("tournament_icon", "str"),
+        ("page_number", "int"),
+    ],
+    "stats": [
+        ("region", "str"),
+        ("timespan", "str"),
+        ("player", "str"),
+        ("org", "str"),
+        ("agents", "list"),
+        ("rounds_played", "int"),
+        ("rating", "float"),
+        ("average_combat_score", "float"),
+        ("kill_deaths", "float"),
+        ("kill_assists_survived_traded", "float"),
+        ("average_damage_per_round", "float"),
+        ("kills_per_round", "float"),
+        ("assists_per_round", "float"),
+        ("first_kills_per_round", "float"),
+        ("first_deaths_per_round", "float"),
+        ("headshot_percentage", "float"),
+        ("clutch_success_percentage", "float"),
+    ],
+    "rankings": [
+        ("region", "str"),
+        ("rank", "int"),
+        ("team", "str"),
+        ("country", "str"),
+        ("record", "str"),
+        ("earnings", "int"),
+        ("last_played", "str"),
+        ("last_played_team", "str"),
+        ("last_played_team_logo", "str"),
+        ("logo", "str"),
+    ],
+    "events": [
+        ("url_path", "str"),
+        ("title", "str"),
+        ("status", "str"),
+        ("region", "str"),
+        ("prize", "str"),
+        ("prize_amount", "int"),
+        ("prize_currency", "str"),
+        ("dates", "str"),
+        ("start_date", "date"),
+        ("end_date", "date"),
+        ("thumb", "str"),
+        ("page_number", "int"),
+    ],
+}
+# Lines of an --input file written per batch (row group)
+BATCH_SIZE = 10000
+
+
+def results_batches(from_page=1, to_page=1, request_delay=1.0):
+    """Typed results, one deduplicated page per batch (see StableCrawl)."""
+    crawl = StableCrawl()
+    for page in range(from_page, to_page + 1):
+        if page > from_page:
+            deadline.sleep(request_delay)
+        rows = scrape_results_page(page, request_delay=request_delay, typed=True)
+        if rows is None:
+            raise Exception("Failed to scrape results page {}".format(page))
+        # Only the seen-set outlives a page, so memory stays bounded
+        crawl.rows = []
+        crawl.add(rows)
+        yield crawl.rows
+
+    page = to_page
+    while crawl.missing > 0 and page < to_page + MAX_REFILL_PAGES:
+        page += 1
+        deadline.sleep(request_delay)
+        rows = scrape_results_page(page, request_delay=request_delay, typed=True)
+        if not rows:
+            break
+        crawl.rows = []
+        crawl.refill(rows)
+        yield crawl.rows
+
+
+def stats_batches(regions, timespans):
+    """One stats table per batch, served from the in-memory stats store."""
+    for region in regions:
+        for timespan in timespans:
+            table = stats_store.get(region, timespan)
+            yield [dict(row, region=region, timespan=timespan) for row in table.rows]
+
+
+def rankings_batches(regions):
+    for region_key in regions:
+        yield [dict(row, region=region_key) for row in cached_rankings(region_key)["data"]]
+
+
+def events_batches(from_page=1, to_page=None):
+    """Upcoming events, then completed pages until ``to_page`` or the first empty page."""
+    if from_page == 1:
+        yield cached_upcoming_events()["segments"]
+    last = to_page or MAX_EVENT_PAGES
+    for page in range(from_page, last + 1):
+        events = cached_completed_events(page)["segments"]
+        if not events and to_page is None:
+            break
+        yield [dict(event, page_number=page) for event in events]
+
+
+def jsonl_batches(path, batch_size=BATCH_SIZE):
+    """Rows of a JSON lines file (api.harvest output), ``batch_size`` at a time."""
+    with open(path, encoding="utf-8") as f:
+        batch = []
+        for line in f:
+            batch.append(json.loads(line))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def dataset_batches(dataset, from_page=1, to_page=None, regions=None, timespans=None, request_delay=1.0):
+    """
+    Batches of row dicts for a dataset.
+
+    Args:
+        dataset (str): A key of SCHEMAS
+        from_page (int): First results/events page
+        to_page (int, optional): Last results/events page (results default to
+            from_page; events default to crawling until an empty page)
+        regions (list, optional): Stats or rankings regions (default all)
+        timespans (list, optional): Stats timespans (default all)
+        request_delay (float): Seconds between results pages
+    """
+    if dataset not in SCHEMAS:
+        raise ValueError("Unknown dataset: {} (use {})".format(dataset, ", ".join(SCHEMAS)))
+    if from_page < 1 or (to_page is not None and to_page < from_page):
+        raise ValueError("Invalid page range: {}-{}".format(from_page, to_page))
+    if dataset == "results":
+        return results_batches(from_page, to_page or from_page, request_delay)
+    if dataset == "stats":
+        return stats_batches(
+            regions or list(STATS_REGIONS),
+            timespans or list(STATS_TIMESPANS),
+        )
+    if dataset == "rankings":
+        unknown = [r for r in regions or () if r not in REGIONS]
+        if unknown:
+            raise ValueError("Unknown region(s): {}".format(", ".join(unknown)))
+        return rankings_batches(regions or list(REGIONS))
+    return events_batches(from_page, to_page)
+
+
+def export(dataset, fmt="csv", **params):
+    """
+    Encoded export of a dataset.
+
+    Args:
+        dataset (str): A key of SCHEMAS
+        fmt (str): A key of utils.columnar.FORMATS
+        **params: Passed to dataset_batches
+
+    Returns:
+        iterator: bytes chunks
+    """
+    batches = dataset_batches(dataset, **params)
+    return export_chunks(SCHEMAS[dataset], batches, fmt)
+
+
+def _split(value):
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("dataset", choices=list(SCHEMAS))
+    parser.add_argument("--format", default="csv", choices=list(FORMATS))
+    parser.add_argument("--out", help="Output file (default stdout)")
+    parser.add_argument("--input", help="Convert this JSON lines file instead of scraping")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Rows per batch with --input")
+    parser.add_argument("--from-page", type=int, default=1)
+    parser.add_argument("--to-page", type=int)
+    parser.add_argument("--regions", type=_split, help="Comma-separated regions (stats, rankings)")
+    parser.add_argument("--timespans", type=_split, help="Comma-separated timespans (stats)")
+    parser.add_argument("--request-delay", type=float, default=1.0, help="Seconds between results pages")
+    args = parser.parse_args(argv)
+
+    if args.input:
+        chunks = export_chunks(SCHEMAS[args.dataset], jsonl_batches(args.input, args.batch_size), args.format)
+    else:
+        chunks = export(
+            args.dataset,
+            args.format,
+            from_page=args.from_page,
+            to_page=args.to_page,
+            regions=args.regions,
+            timespans=args.timespans,
+            request_delay=args.request_delay,
+        )
+
+    out = open(args.out, "wb") if args.out else sys.stdout.buffer
+    start = time.perf_counter()
+    size = 0
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+            size += len(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f"Exported {args.dataset} ({size} bytes) in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
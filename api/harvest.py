@@ -0,0 +1,376 @@
+"""
+Harvest whole vlr.gg datasets to disk, driving the scrapers directly.
+
+Run from the repository root:
+    python -m api.harvest --out harvest
+    python -m api.harvest --out harvest --dataset results --pages 12,40-42
+
+Each dataset is appended to <out>/<dataset>.jsonl, one row per line:
+results (typed, deduplicated by match_page), completed and upcoming events
+(deduplicated by event URL) and stats rows for every region/timespan, tagged
+with their table.
+
+Progress is checkpointed to <out>/checkpoint.json after every page, together
+with the length of each output file, so a killed run started again with the
+same --out truncates any half-written rows and carries on where it stopped.
+Pages that still failed after retries are listed in the checkpoint and the
+summary; pass them to --pages to retry just those.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from api.scrapers.events import fetch_events_page
+from api.scrapers.matches import scrape_results_page
+from api.scrapers.stats import stats_table_key, vlr_stats
+from utils.upstream import UPSTREAM_CONCURRENCY
+from utils.utils import STATS_REGIONS, STATS_TIMESPANS
+
+DATASETS = ("results", "events", "stats")
+# Results and events are crawled until an empty page, or this many pages
+MAX_PAGES = 600
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+class Politeness:
+    """Spaces out the start of upstream work across all workers by at least ``delay`` seconds."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.delay
+        if start > now:
+            time.sleep(start - now)
+
+
+def parse_pages(value):
+    """Page list such as "3,7,10-12" -> [3, 7, 10, 11, 12]."""
+    pages = set()
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        first = int(first)
+        last = int(last) if last else first
+        if first < 1 or last < first:
+            raise argparse.ArgumentTypeError("Invalid page range: {}".format(part))
+        pages.update(range(first, last + 1))
+    return sorted(pages)
+
+
+class Checkpoint:
+    """
+    Harvest progress, rewritten atomically after every unit of work.
+
+    ``done`` and ``failed`` hold page numbers (or stats table keys) per
+    dataset, ``end`` the first empty page found, and ``offsets`` the size of
+    each output file when the checkpoint was written.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.state = {"done": {}, "failed": {}, "end": {}, "offsets": {}}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.state.update(json.load(f))
+
+    def done(self, dataset):
+        return set(self.state["done"].get(dataset, []))
+
+    def failed(self, dataset):
+        return set(self.state["failed"].get(dataset, []))
+
+    def end(self, dataset):
+        return self.state["end"].get(dataset)
+
+    def record(self, dataset, unit, ok, offsets, end=None):
+        done = self.state["done"].setdefault(dataset, [])
+        failed = self.state["failed"].setdefault(dataset, [])
+        if unit in failed:
+            failed.remove(unit)
+        (done if ok else failed).append(unit)
+        if end is not None:
+            current = self.state["end"].get(dataset)
+            self.state["end"][dataset] = end if current is None else min(current, end)
+        self.state["offsets"].update(offsets)
+        self.save()
+
+    def save(self):
+        self.state["updated_at"] = time.time()
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+
+class Output:
+    """Append-only JSON lines file of one dataset, deduplicated by ``key(row)``."""
+
+    def __init__(self, path, key, offset=None):
+        self.path = path
+        self.key = key
+        self.seen = set()
+        self.written = 0
+        self.duplicates = 0
+        mode = "r+b" if os.path.exists(path) else "w+b"
+        self.file = open(path, mode)
+        # Rows written after the last checkpoint belong to unfinished pages
+        if offset is not None:
+            self.file.truncate(offset)
+        self.file.seek(0)
+        for line in self.file:
+            self.seen.add(key(json.loads(line)))
+        self.file.seek(0, os.SEEK_END)
+
+    def write(self, rows):
+        for row in rows:
+            value = self.key(row)
+            if value in self.seen:
+                self.duplicates += 1
+                continue
+            self.seen.add(value)
+            self.file.write(json.dumps(row, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.written += 1
+        self.file.flush()
+
+    def offset(self):
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+def _retrying(func, attempts, delay):
+    def run(*args):
+        for attempt in range(1, attempts + 1):
+            try:
+                return func(*args)
+            except Exception as e:
+                print(f"{func.__name__}{args} failed (attempt {attempt}/{attempts}): {e}", file=sys.stderr)
+                if attempt == attempts:
+                    raise
+                time.sleep(delay * (2 ** attempt))
+
+    return run
+
+
+def results_page(page, retries, delay):
+    rows = scrape_results_page(page, retries, delay, typed=True)
+    if rows is None:
+        raise Exception("Failed to scrape results page {}".format(page))
+    return rows, not rows
+
+
+def events_page(page):
+    upcoming, completed = fetch_events_page(page)
+    rows = [dict(event, page_number=page) for event in completed["segments"]]
+    if page == 1:
+        rows = [dict(event, page_number=None) for event in upcoming] + rows
+    # Every page repeats the upcoming events, so only completed ones mark the end
+    return rows, not completed["segments"]
+
+
+def stats_table(table):
+    region, timespan = table.split("/")
+    rows = vlr_stats(region, timespan)["data"]["segments"]
+    return [dict(row, region=region, timespan=timespan, table=table) for row in rows], False
+
+
+# Dedup key of each dataset's rows
+ROW_KEYS = {
+    "results": lambda row: row["match_page"],
+    "events": lambda row: row["url_path"] or row["title"],
+    "stats": lambda row: (row["table"], row["player"]),
+}
+
+
+class Harvester:
+    """Runs page jobs on a thread pool and writes each result as soon as it completes."""
+
+    def __init__(self, out_dir, concurrency, delay):
+        self.out_dir = out_dir
+        self.concurrency = concurrency
+        self.politeness = Politeness(delay)
+        os.makedirs(out_dir, exist_ok=True)
+        self.checkpoint = Checkpoint(os.path.join(out_dir, CHECKPOINT_FILE))
+        self.outputs = {}
+
+    def output(self, dataset):
+        if dataset not in self.outputs:
+            name = dataset + ".jsonl"
+            offset = self.checkpoint.state["offsets"].get(name, 0)
+            self.outputs[dataset] = Output(os.path.join(self.out_dir, name), ROW_KEYS[dataset], offset)
+        return self.outputs[dataset]
+
+    def offsets(self):
+        return {os.path.basename(o.path): o.offset() for o in self.outputs.values()}
+
+    def _polite(self, func):
+        def run(*args):
+            self.politeness.wait()
+            return func(*args)
+
+        return run
+
+    def run(self, dataset, func, units, until_empty=False):
+        """
+        Run ``func(unit)`` for every unit, writing rows as results arrive.
+
+        ``func`` returns (rows, empty). With ``until_empty``, an empty page
+        ends the crawl: pages after it are not submitted, now or on resume.
+        ``units`` may be a generator; it is consumed lazily.
+        """
+        output = self.output(dataset)
+        func = self._polite(func)
+        units = iter(units)
+        end = self.checkpoint.end(dataset) if until_empty else None
+        pending = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            try:
+                while True:
+                    while len(pending) < self.concurrency:
+                        unit = next(units, None)
+                        if unit is None or (end is not None and unit >= end):
+                            break
+                        pending[executor.submit(func, unit)] = unit
+                    if not pending:
+                        break
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        unit = pending.pop(future)
+                        try:
+                            rows = future.result()
+                        except Exception as e:
+                            print(f"{dataset} {unit}: failed: {e}", file=sys.stderr)
+                            self.checkpoint.record(dataset, unit, False, self.offsets())
+                            continue
+                        rows, empty = rows
+                        empty = empty and until_empty
+                        if empty:
+                            end = unit if end is None else min(end, unit)
+                        output.write(rows)
+                        self.checkpoint.record(
+                            dataset, unit, True, self.offsets(), end=unit if empty else None
+                        )
+                        print(f"{dataset} {unit}: {len(rows)} rows", file=sys.stderr)
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
+    def close(self):
+        for output in self.outputs.values():
+            output.close()
+
+
+def _page_units(harvester, dataset, pages, max_pages):
+    """Explicit pages, or every page not yet done or failed (crawled until an empty page)."""
+    if pages:
+        return pages
+    skip = harvester.checkpoint.done(dataset) | harvester.checkpoint.failed(dataset)
+    return (page for page in range(1, max_pages + 1) if page not in skip)
+
+
+def harvest(args):
+    harvester = Harvester(args.out, args.concurrency, args.delay)
+    datasets = args.dataset or list(DATASETS)
+    # Explicit pages are retried as given, even past an empty page
+    crawl = not args.pages
+    start = time.perf_counter()
+    try:
+        if "results" in datasets:
+            harvester.run(
+                "results",
+                lambda page: results_page(page, args.retries, args.delay),
+                _page_units(harvester, "results", args.pages, args.max_pages),
+                until_empty=crawl,
+            )
+        if "events" in datasets:
+            harvester.run(
+                "events",
+                _retrying(events_page, args.retries, args.delay),
+                _page_units(harvester, "events", args.pages, args.max_pages),
+                until_empty=crawl,
+            )
+        if "stats" in datasets:
+            done = harvester.checkpoint.done("stats")
+            tables = [
+                stats_table_key(region, timespan)
+                for region in args.regions
+                for timespan in args.timespans
+            ]
+            harvester.run(
+                "stats",
+                _retrying(stats_table, args.retries, args.delay),
+                [table for table in tables if table not in done],
+            )
+    finally:
+        harvester.close()
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        dataset: {
+            "rows_written": output.written,
+            "duplicates_dropped": output.duplicates,
+            "failed": sorted(harvester.checkpoint.failed(dataset), key=str),
+        }
+        for dataset, output in harvester.outputs.items()
+    }
+    print(json.dumps(summary), file=sys.stderr)
+    print(f"Harvested in {elapsed:.1f}s", file=sys.stderr)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--out", default="harvest", help="Output and checkpoint directory")
+    parser.add_argument(
+        "--dataset",
+        action="append",
+        choices=DATASETS,
+        help="Dataset to harvest (repeatable, default all)",
+    )
+    parser.add_argument(
+        "--pages",
+        type=parse_pages,
+        help='Only these results/events pages, e.g. "3,7,10-12" (retries failed pages)',
+    )
+    parser.add_argument("--max-pages", type=int, default=MAX_PAGES, help="Last page crawled")
+    parser.add_argument(
+        "--regions", type=lambda v: v.split(","), default=list(STATS_REGIONS), help="Stats regions"
+    )
+    parser.add_argument(
+        "--timespans", type=lambda v: v.split(","), default=list(STATS_TIMESPANS), help="Stats timespans"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=UPSTREAM_CONCURRENCY, help="Pages fetched at once"
+    )
+    parser.add_argument(
+        "--delay", type=float, default=1.0, help="Minimum seconds between page fetches (all workers)"
+    )
+    parser.add_argument("--retries", type=int, default=3, help="Attempts per page")
+    args = parser.parse_args(argv)
+
+    try:
+        summary = harvest(args)
+    except KeyboardInterrupt:
+        print("Interrupted; run the same command again to resume", file=sys.stderr)
+        return 130
+    return 1 if any(s["failed"] for s in summary.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Re-run page parsers over the raw HTML archive, without touching vlr.gg.
+
+Run from the repository root:
+    python -m api.reprocess --archive archive --kind rankings --out rankings.jsonl
+    python -m api.reprocess --archive archive --since 2025-01-01 --latest
+
+Every matching index entry becomes one JSON line with its url, fetched_at,
+sha256, kind and parsed data. Bodies are inflated and parsed once per
+distinct sha256, so pages archived many times unchanged
+cost a single parse.
+
+Only pages with a standalone parse function are listed in PARSERS. To rebuild
+anything else (match results, live scores), run the scraper itself against the
+archive with VLR_FETCH_BACKEND=archive.
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from datetime import datetime, timezone
+
+from selectolax.parser import HTMLParser
+
+from api.scrapers.events import parse_events_page
+from api.scrapers.news import parse_news
+from api.scrapers.rankings import parse_rankings
+from api.scrapers.stats import parse_stats, parse_stats_filter_options
+from utils.archive import ARCHIVE_DIR, HtmlArchive
+
+
+def _events(html):
+    upcoming, completed = parse_events_page(html)
+    return {"upcoming": upcoming, "completed": completed}
+
+
+def _stats(html):
+    return {"segments": parse_stats(html), "filter_options": parse_stats_filter_options(html)}
+
+
+# Page kind, URL pattern and parse function (taking an HTMLParser)
+PARSERS = (
+    ("news", re.compile(r"^https://www\.vlr\.gg/news/?(\?page=\d+)?$"), parse_news),
+    ("rankings", re.compile(r"^https://www\.vlr\.gg/rankings/[\w-]+/?$"), parse_rankings),
+    ("stats", re.compile(r"^https://www\.vlr\.gg/stats/?(\?.*)?$"), _stats),
+    ("events", re.compile(r"^https://www\.vlr\.gg/events/?(\?page=\d+)?$"), _events),
+)
+
+
+def parser_for(url, kinds=None):
+    for kind, pattern, parse in PARSERS:
+        if (kinds is None or kind in kinds) and pattern.match(url):
+            return kind, parse
+    return None, None
+
+
+def parse_time(value):
+    """Epoch seconds or an ISO date/datetime (UTC unless it has an offset)."""
+    try:
+        return float(value)
+    except ValueError:
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+
+
+def reprocess(archive, kinds=None, since=None, until=None, latest=False):
+    """
+    Yield parsed records for archived pages.
+
+    Args:
+        archive (HtmlArchive): Archive to read
+        kinds (set, optional): Page kinds from PARSERS to include (default all)
+        since (float, optional): Only fetches at or after this epoch time
+        until (float, optional): Only fetches before this epoch time
+        latest (bool): Only the newest fetch of each URL
+
+    Yields:
+        dict: url, fetched_at, sha256, kind and data for each index entry
+    """
+    entries = [
+        entry
+        for entry in archive.entries(since=since, until=until)
+        if entry["status_code"] == 200
+    ]
+    if latest:
+        entries = list({entry["url"]: entry for entry in entries}.values())
+
+    parsed = {}
+    for entry in entries:
+        kind, parse = parser_for(entry["url"], kinds)
+        if parse is None:
+            continue
+        digest = entry["sha256"]
+        if (kind, digest) not in parsed:
+            parsed[kind, digest] = parse(HTMLParser(archive.read(digest)))
+        yield {
+            "url": entry["url"],
+            "fetched_at": entry["fetched_at"],
+            "sha256": digest,
+            "kind": kind,
+            "data": parsed[kind, digest],
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--archive", default=ARCHIVE_DIR or "archive", help="Archive directory")
+    parser.add_argument(
+        "--kind",
+        action="append",
+        choices=[kind for kind, _, _ in PARSERS],
+        help="Page kind to reprocess (repeatable, default all)",
+    )
+    parser.add_argument("--since", type=parse_time, help="Epoch seconds or ISO date")
+    parser.add_argument("--until", type=parse_time, help="Epoch seconds or ISO date")
+    parser.add_argument("--latest", action="store_true", help="Only the newest fetch of each URL")
+    parser.add_argument("--out", help="Output JSON lines file (default stdout)")
+    args = parser.parse_args(argv)
+
+    archive = HtmlArchive(args.archive)
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    start = time.perf_counter()
+    count = 0
+    try:
+        for record in reprocess(
+            archive, set(args.kind) if args.kind else None, args.since, args.until, args.latest
+        ):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f"Reprocessed {count} pages in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
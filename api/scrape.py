@@ -1,47 +1,113 @@
-from api.scrapers import (
-    check_health,
-    vlr_events,
-    vlr_live_score,
-    vlr_match_results,
-    vlr_news,
-    vlr_rankings,
-    vlr_stats,
-    vlr_upcoming_matches,
-)
+import importlib
+
+
+def _load(module):
+    """
+    Import a scraper module on first use.
+
+    Scrapers pull in requests and selectolax, so importing them lazily keeps
+    app startup (and serverless cold starts) fast; after the first call this
+    is a plain sys.modules lookup.
+    """
+    return importlib.import_module(module)
 
 
 class Vlr:
     @staticmethod
     def vlr_news():
-        return vlr_news()
+        return _load("api.scrapers.news").vlr_news()
+
+    @staticmethod
+    def vlr_news_feed(page=1, since=None, limit=None):
+        return _load("api.scrapers.news").vlr_news_feed(page, since, limit)
+
+    @staticmethod
+    def vlr_news_article(url):
+        return _load("api.scrapers.news").vlr_news_article(url)
 
     @staticmethod
     def vlr_rankings(region):
-        return vlr_rankings(region)
+        return _load("api.scrapers.rankings").cached_rankings(region)
+
+    @staticmethod
+    def vlr_rankings_multi(region_keys=None, merge=None, limit=None):
+        return _load("api.scrapers.rankings").vlr_rankings_multi(region_keys, merge, limit)
 
     @staticmethod
-    def vlr_stats(region: str, timespan: str):
-        return vlr_stats(region, timespan)
+    def vlr_stats(region: str, timespan: str, **filters):
+        return _load("api.scrapers.stats").vlr_stats(region, timespan, **filters)
 
     @staticmethod
-    def vlr_upcoming_matches(num_pages=1, from_page=None, to_page=None):
-        return vlr_upcoming_matches(num_pages, from_page, to_page)
+    def vlr_stats_table(region: str, timespan: str, **filters):
+        return _load("api.stats_table").stats_store.get(region, timespan, **filters)
 
     @staticmethod
-    def vlr_live_score(num_pages=1, from_page=None, to_page=None):
-        return vlr_live_score(num_pages, from_page, to_page)
+    def stats_table_loaded(region: str, timespan: str, **filters):
+        return _load("api.stats_table").stats_store.has(region, timespan, **filters)
 
     @staticmethod
-    def vlr_match_results(num_pages=1, from_page=None, to_page=None, max_retries=3, request_delay=1.0, timeout=30):
-        return vlr_match_results(num_pages, from_page, to_page, max_retries, request_delay, timeout)
+    def uncached_event_pages(from_page=1, to_page=100, until_empty=False, upcoming=False):
+        return _load("api.scrapers.events").uncached_event_pages(from_page, to_page, until_empty, upcoming)
+
+    @staticmethod
+    def vlr_stats_tables(combinations):
+        return _load("api.stats_table").stats_store.get_many(combinations)
+
+    @staticmethod
+    def vlr_upcoming_matches(num_pages=1, from_page=None, to_page=None, typed=False):
+        return _load("api.scrapers.matches").vlr_upcoming_matches(num_pages, from_page, to_page, typed)
+
+    @staticmethod
+    def vlr_live_score(num_pages=1, from_page=None, to_page=None, typed=False):
+        return _load("api.scrapers.matches").vlr_live_score(num_pages, from_page, to_page, typed)
+
+    @staticmethod
+    def vlr_match_results(num_pages=1, from_page=None, to_page=None, max_retries=3, request_delay=1.0, timeout=30, typed=False, stable=False):
+        return _load("api.scrapers.matches").vlr_match_results(num_pages, from_page, to_page, max_retries, request_delay, timeout, typed, stable)
 
     @staticmethod
     def vlr_events(upcoming=True, completed=True, page=1):
-        return vlr_events(upcoming, completed, page)
+        return _load("api.scrapers.events").vlr_events(upcoming, completed, page)
+
+    @staticmethod
+    def vlr_events_crawl(from_page=1, to_page=1):
+        return _load("api.scrapers.events").vlr_events_crawl(from_page, to_page)
+
+    @staticmethod
+    def vlr_events_catalog(max_pages=100):
+        return _load("api.scrapers.events").vlr_events_catalog(max_pages)
+
+    @staticmethod
+    def search_teams(prefix, limit=50):
+        return _load("api.entity_index").entity_index.search_teams(prefix, limit)
+
+    @staticmethod
+    def search_players(prefix, limit=50):
+        return _load("api.entity_index").entity_index.search_players(prefix, limit)
+
+    @staticmethod
+    def team(name, limit=None):
+        return _load("api.entity_index").entity_index.team(name, limit)
+
+    @staticmethod
+    def player(name):
+        return _load("api.entity_index").entity_index.player(name)
+
+    @staticmethod
+    def team_form(name, window=10):
+        return _load("api.team_form").team_form.form(name, window)
+
+    @staticmethod
+    def head_to_head(team1, team2, limit=20):
+        return _load("api.team_form").team_form.head_to_head(team1, team2, limit)
+
+    @staticmethod
+    def export(dataset, fmt="csv", **params):
+        return _load("api.export").export(dataset, fmt, **params)
 
     @staticmethod
     def check_health():
-        return check_health()
+        return _load("api.scrapers.health").check_health()
 
 
 if __name__ == "__main__":
@@ -1,6 +1,33 @@
-from .news import vlr_news
-from .rankings import vlr_rankings
-from .stats import vlr_stats
-from .matches import vlr_upcoming_matches, vlr_live_score, vlr_match_results
-from .events import vlr_events
-from .health import check_health
+"""
+Scrapers of vlr.gg pages, one module per section.
+
+Names are re-exported lazily: importing ``api.scrapers`` (or one scraper
+module) loads no other scraper, so each stays off the import path until it
+is first used.
+"""
+import importlib
+
+_EXPORTS = {
+    "vlr_news": "news",
+    "vlr_news_article": "news",
+    "vlr_news_feed": "news",
+    "vlr_rankings": "rankings",
+    "vlr_rankings_multi": "rankings",
+    "vlr_stats": "stats",
+    "vlr_upcoming_matches": "matches",
+    "vlr_live_score": "matches",
+    "vlr_match_results": "matches",
+    "vlr_events": "events",
+    "vlr_events_catalog": "events",
+    "vlr_events_crawl": "events",
+    "check_health": "health",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    return getattr(importlib.import_module("." + module, __name__), name)
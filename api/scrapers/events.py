@@ -1,8 +1,298 @@
 import re
-import requests
+from datetime import date
+
 from selectolax.parser import HTMLParser
 
-from utils.utils import headers
+from utils.cache import CACHE_TTL, data_cache
+from utils.fetch import fetch
+from utils.upstream import UPSTREAM_CONCURRENCY, fan_out
+
+# vlr.gg currently serves at most this many pages of completed events
+MAX_EVENT_PAGES = 100
+
+
+def events_url(page=1):
+    if page > 1:
+        return f"https://www.vlr.gg/events/?page={page}"
+    return "https://www.vlr.gg/events"
+
+
+PRIZE_LABEL_RE = re.compile(r"prize\s*pool.*$", re.IGNORECASE)
+DATES_LABEL_RE = re.compile(r"dates.*$", re.IGNORECASE)
+WHITESPACE_RE = re.compile(r"\s+")
+MONEY_RE = re.compile(r"^([$€£₩¥]?)([\d,]+)$")
+TBD_RE = re.compile(r"\bTBD\b", re.IGNORECASE)
+DATE_RANGE_RE = re.compile(
+    r"([A-Za-z]{3})\s+(\d+)[—\-–]+([A-Za-z]*)\s*(\d+)(?:,?\s*(\d{4}))?"
+)
+MONTH_RE = re.compile(r"Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec")
+
+MONTHS = {
+    name: i
+    for i, name in enumerate(
+        ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"),
+        start=1,
+    )
+}
+CURRENCIES = {"$": "USD", "€": "EUR", "£": "GBP", "₩": "KRW", "¥": "CNY"}
+
+
+def _label_text(node, label_re):
+    """Text of a desc item before its nested label div, e.g. "$250,000" from "$250,000<div>Prize Pool</div>"."""
+    text = node.text(deep=False, strip=True)
+    if not text:
+        text = label_re.sub("", node.text(strip=True))
+    return WHITESPACE_RE.sub(" ", text).strip()
+
+
+def parse_prize(text):
+    """
+    Parse a prize cell into (display string, amount, currency).
+
+    The display string keeps the historical format: "TBD", "$250,000", or ""
+    when the cell is not a recognizable amount.
+    """
+    if text.upper() == "TBD":
+        return "TBD", None, None
+    match = MONEY_RE.match(text)
+    if not match:
+        return "", None, None
+    symbol, digits = match.groups()
+    amount = int(digits.replace(",", "")) if digits.replace(",", "") else None
+    if symbol == "$" or (not symbol and len(digits) > 2):
+        return "$" + digits, amount, "USD"
+    if symbol:
+        return "", amount, CURRENCIES[symbol]
+    return "", None, None
+
+
+def _infer_year(month, day, status, today):
+    """
+    Pick the year for a card date that omits it, relative to ``today``.
+
+    Completed events resolve to the latest year not in the future, upcoming
+    events to the earliest year not in the past, ongoing events to the
+    current season. Very old completed pages can therefore be off by years.
+    """
+    year = today.year
+    try:
+        candidate = date(year, month, day)
+    except ValueError:
+        return None
+    if status == "completed" and candidate > today:
+        year -= 1
+    elif status == "upcoming" and candidate < today:
+        year += 1
+    elif status == "ongoing" and candidate > today:
+        year -= 1
+    return year
+
+
+def parse_dates(text, status="", today=None):
+    """
+    Parse a dates cell like "Jul 15—Aug 31" or "Dec 1—15".
+
+    Returns:
+        tuple: (display string, ISO start date or None, ISO end date or None)
+    """
+    match = DATE_RANGE_RE.search(text)
+    if not match:
+        if TBD_RE.search(text):
+            return "TBD", None, None
+        if MONTH_RE.search(text) or "—" in text:
+            return text, None, None
+        return "", None, None
+
+    start_month, start_day, end_month, end_day, year = match.groups()
+    display = match.group()
+    if year:
+        display = display[: match.start(5) - match.start()].rstrip(", ")
+    start_month = MONTHS.get(start_month.title())
+    end_month = MONTHS.get(end_month.title()) if end_month else start_month
+    if start_month is None or end_month is None:
+        return display, None, None
+
+    today = today or date.today()
+    start_day, end_day = int(start_day), int(end_day)
+    if year:
+        end_year = int(year)
+    else:
+        end_year = _infer_year(end_month, end_day, status, today)
+    if end_year is None:
+        return display, None, None
+    start_year = end_year - 1 if start_month > end_month else end_year
+    try:
+        start = date(start_year, start_month, start_day)
+        end = date(end_year, end_month, end_day)
+    except ValueError:
+        return display, None, None
+    return display, start.isoformat(), end.isoformat()
+
+
+def _iter_subtree(root):
+    """Depth-first walk of the element nodes below ``root`` (Node.traverse runs past the subtree)."""
+    node = root.child
+    pending = []
+    while node is not None:
+        if node.tag != "-text":
+            yield node
+        if node.child is not None:
+            if node.next is not None:
+                pending.append(node.next)
+            node = node.child
+        else:
+            node = node.next
+            if node is None and pending:
+                node = pending.pop()
+
+
+def _first_in(root, match):
+    """First element below ``root`` for which ``match(node)`` is true, or None."""
+    for node in _iter_subtree(root):
+        if match(node):
+            return node
+    return None
+
+
+def _has_class(node, name):
+    return name in (node.attributes.get("class") or "").split()
+
+
+def parse_event_card(event_item, today=None):
+    """Extract one event card in a single traversal of its nodes."""
+    title = event_status = region = thumb = ""
+    prize_node = dates_node = None
+
+    for node in _iter_subtree(event_item):
+        classes = node.attributes.get("class")
+        if not classes:
+            continue
+        if "event-item-title" in classes:
+            title = node.text(strip=True)
+        elif "event-item-desc-item-status" in classes:
+            event_status = node.text(strip=True)
+        elif "mod-prize" in classes:
+            prize_node = node
+        elif "mod-dates" in classes:
+            dates_node = node
+        elif not region and "mod-location" in classes and _has_class(node, "event-item-desc-item"):
+            # Only flags inside the location item count, like ".mod-location .flag"
+            flag = _first_in(node, lambda n: _has_class(n, "flag"))
+            if flag is not None:
+                region = flag.attributes.get("class", "").replace("flag mod-", "").strip()
+        elif not thumb and _has_class(node, "event-item-thumb"):
+            img = _first_in(node, lambda n: n.tag == "img")
+            if img is not None:
+                thumb = img.attributes.get("src", "") or ""
+
+    if thumb.startswith("//"):
+        thumb = "https:" + thumb
+    elif thumb.startswith("/"):
+        thumb = "https://www.vlr.gg" + thumb
+
+    prize, prize_amount, prize_currency = (
+        parse_prize(_label_text(prize_node, PRIZE_LABEL_RE)) if prize_node else ("", None, None)
+    )
+    dates, start_date, end_date = "", None, None
+    if dates_node:
+        dates, start_date, end_date = parse_dates(
+            _label_text(dates_node, DATES_LABEL_RE), event_status, today
+        )
+
+    url_path = event_item.attributes.get("href", "")
+    full_url = "https://www.vlr.gg" + url_path if url_path else ""
+
+    return {
+        "title": title,
+        "status": event_status,
+        "prize": prize,
+        "prize_amount": prize_amount,
+        "prize_currency": prize_currency,
+        "dates": dates,
+        "start_date": start_date,
+        "end_date": end_date,
+        "region": region,
+        "thumb": thumb,
+        "url_path": full_url,
+    }
+
+
+def parse_events(container, today=None):
+    """Parse the event cards inside a section container"""
+    today = today or date.today()
+    return [parse_event_card(item, today) for item in container.css("a.event-item")]
+
+
+def parse_events_page(html):
+    """
+    Split an /events page into its upcoming and completed event cards.
+
+    Returns:
+        tuple: (upcoming events, completed events)
+    """
+    sections = {}
+    for kind in ("upcoming", "completed"):
+        events = []
+        for section in html.css(f"div.wf-label.mod-large.mod-{kind}"):
+            parent = section.parent
+            if parent:
+                events.extend(parse_events(parent))
+        sections[kind] = events
+    return sections["upcoming"], sections["completed"]
+
+
+def fetch_events_page(page=1):
+    """Fetch and parse one /events page, filling the upcoming and completed caches."""
+    resp = fetch(events_url(page))
+    status = resp.status_code
+    if status != 200:
+        raise Exception("API response: {}".format(status))
+
+    upcoming, completed = parse_events_page(HTMLParser(resp.text))
+    completed_entry = {"status": status, "page": page, "segments": completed}
+    data_cache.set(("events", "completed", page), completed_entry, CACHE_TTL["events_completed"])
+    if page == 1:
+        upcoming_entry = {"status": status, "segments": upcoming}
+        data_cache.set(("events", "upcoming"), upcoming_entry, CACHE_TTL["events_upcoming"])
+    return upcoming, completed_entry
+
+
+def uncached_event_pages(from_page=1, to_page=MAX_EVENT_PAGES, until_empty=False, upcoming=False):
+    """
+    Number of /events pages a crawl of ``from_page``-``to_page`` would fetch.
+
+    Args:
+        until_empty (bool): The crawl stops at the first empty page, so a
+            cached empty page ends the count
+        upcoming (bool): The crawl also reads the upcoming events (page 1)
+    """
+    count = 0
+    for page in range(from_page, to_page + 1):
+        entry = data_cache.get(("events", "completed", page))
+        if entry is None:
+            count += 1
+        elif until_empty and not entry["segments"]:
+            break
+    if upcoming and ("events", "upcoming") not in data_cache and ("events", "completed", 1) in data_cache:
+        count += 1
+    return count
+
+
+def cached_upcoming_events():
+    """Upcoming events (from the first /events page), cached with a short TTL."""
+    entry = data_cache.get(("events", "upcoming"))
+    if entry is None:
+        fetch_events_page(1)
+        entry = data_cache.get(("events", "upcoming"))
+    return entry
+
+
+def cached_completed_events(page=1):
+    """One page of completed events, cached with a long TTL since past events rarely change."""
+    entry = data_cache.get(("events", "completed", page))
+    if entry is None:
+        _, entry = fetch_events_page(page)
+    return entry
 
 
 def vlr_events(upcoming=True, completed=True, page=1):
@@ -17,157 +307,127 @@ def vlr_events(upcoming=True, completed=True, page=1):
     Returns:
         dict: Response with status code and events data
     """
-    # Build URL with pagination for completed events
-    if completed and page > 1:
-        url = f"https://www.vlr.gg/events/?page={page}"
-    else:
-        url = "https://www.vlr.gg/events"
-    
-    resp = requests.get(url, headers=headers)
-    html = HTMLParser(resp.text)
-    status = resp.status_code
-
     # If both are False, show both (default behavior)
     if not upcoming and not completed:
         upcoming = True
         completed = True
 
     events = []
-
-    def parse_events(container):
-        """Helper function to parse event cards"""
-        for event_item in container.css("a.event-item"):
-            title = event_item.css_first(".event-item-title")
-            title = title.text(strip=True) if title else ""
-
-            status_elem = event_item.css_first(".event-item-desc-item-status")
-            event_status = status_elem.text(strip=True) if status_elem else ""
-
-            # Prize - extract monetary value or TBD (before the nested label div)
-            prize_elem = event_item.css_first(".event-item-desc-item.mod-prize")
-            prize = ""
-            if prize_elem:
-                # Get the HTML and extract text before the first nested div
-                full_text = prize_elem.text(strip=True)
-                
-                # Split by common separators and take the first meaningful part
-                # The structure is: "$250,000<div>Prize Pool</div>" or "TBD<div>Prize Pool</div>"
-                parts = re.split(r'(?=Prize Pool|prize pool)', full_text, flags=re.IGNORECASE)
-                if parts:
-                    first_part = parts[0].strip()
-                    
-                    # Clean up any remaining whitespace or newlines
-                    first_part = re.sub(r'\s+', ' ', first_part).strip()
-                    
-                    # Check for TBD
-                    if first_part.upper() == "TBD":
-                        prize = "TBD"
-                    # Check for dollar amounts
-                    elif re.match(r'^\$[\d,]+$', first_part):
-                        prize = first_part
-                    # Check for numeric values (add $ if missing)
-                    elif re.match(r'^[\d,]+$', first_part) and len(first_part) > 2:
-                        prize = "$" + first_part
-
-            # Dates - extract date range like "Jul 15—Aug 31", avoid TBD if it's for prize
-            dates_elem = event_item.css_first(".event-item-desc-item.mod-dates")
-            dates = ""
-            if dates_elem:
-                full_text = dates_elem.text(strip=True)
-                # Use regex to find date patterns like "Jul 15—Aug 31" or "Dec 1—15"
-                date_match = re.search(
-                    r"[A-Za-z]{3}\s+\d+[—\-–]+[A-Za-z]*\s*\d+", full_text
-                )
-                if date_match:
-                    dates = date_match.group()
-                else:
-                    # If TBD was found in prize section from dates, don't use TBD as dates
-                    if prize != "TBD" and re.search(
-                        r"\bTBD\b", full_text, re.IGNORECASE
-                    ):
-                        dates = "TBD"
-                    else:
-                        # Fallback: look for any text before "Dates" or similar keywords
-                        lines = full_text.split("\n")
-                        for line in lines:
-                            line = line.strip()
-                            if line and not any(
-                                keyword in line.lower()
-                                for keyword in ["dates", "label", "prize", "pool"]
-                            ):
-                                # Look for lines that contain month abbreviations or date-like patterns
-                                if (
-                                    any(
-                                        month in line
-                                        for month in [
-                                            "Jan",
-                                            "Feb",
-                                            "Mar",
-                                            "Apr",
-                                            "May",
-                                            "Jun",
-                                            "Jul",
-                                            "Aug",
-                                            "Sep",
-                                            "Oct",
-                                            "Nov",
-                                            "Dec",
-                                        ]
-                                    )
-                                    or "—" in line
-                                ):
-                                    dates = line
-                                    break
-
-            # Region from flag
-            region = ""
-            flag_elem = event_item.css_first(".event-item-desc-item.mod-location .flag")
-            if flag_elem:
-                class_attr = flag_elem.attributes.get("class", "")
-                region = class_attr.replace("flag mod-", "").strip()
-
-            # Thumbnail
-            thumb = ""
-            img_elem = event_item.css_first(".event-item-thumb img")
-            if img_elem:
-                src = img_elem.attributes.get("src", "")
-                if src.startswith("//"):
-                    thumb = "https:" + src
-                elif src.startswith("/"):
-                    thumb = "https://www.vlr.gg" + src
-                else:
-                    thumb = src
-
-            # URL path
-            url_path = event_item.attributes.get("href", "")
-            full_url = "https://www.vlr.gg" + url_path if url_path else ""
-
-            events.append(
-                {
-                    "title": title,
-                    "status": event_status,
-                    "prize": prize,
-                    "dates": dates,
-                    "region": region,
-                    "thumb": thumb,
-                    "url_path": full_url,
-                }
-            )
-
-    # Parse upcoming events
+    status = 200
     if upcoming:
-        upcoming_sections = html.css("div.wf-label.mod-large.mod-upcoming")
-        for section in upcoming_sections:
-            parent = section.parent
-            if parent and parent.css("a.event-item"):
-                parse_events(parent)
-
-    # Parse completed events
+        entry = cached_upcoming_events()
+        events.extend(entry["segments"])
+        status = entry["status"]
     if completed:
-        completed_sections = html.css("div.wf-label.mod-large.mod-completed")
-        for section in completed_sections:
-            parent = section.parent
-            if parent and parent.css("a.event-item"):
-                parse_events(parent)
+        entry = cached_completed_events(page)
+        events.extend(entry["segments"])
+        status = entry["status"]
 
     return {"data": {"status": status, "segments": events}}
+
+
+def vlr_events_crawl(from_page=1, to_page=1):
+    """
+    Get completed events for a page range, fetching uncached pages concurrently.
+
+    Args:
+        from_page (int): First page (1-based)
+        to_page (int): Last page (inclusive)
+
+    Returns:
+        dict: Response with events (each tagged with its page) and crawl meta
+    """
+    if from_page < 1:
+        raise ValueError("from_page must be >= 1")
+    if to_page < from_page:
+        raise ValueError("to_page must be >= from_page")
+
+    pages = list(range(from_page, to_page + 1))
+    outcomes = fan_out(cached_completed_events, [(page,) for page in pages])
+
+    events = []
+    failed_pages = []
+    for page, (entry, error) in zip(pages, outcomes):
+        if error is not None:
+            failed_pages.append(page)
+            continue
+        events.extend(dict(event, page_number=page) for event in entry["segments"])
+
+    if len(failed_pages) == len(pages):
+        raise Exception(f"No data retrieved. Failed pages: {failed_pages}")
+
+    return {
+        "data": {
+            "status": 200,
+            "segments": events,
+            "meta": {
+                "page_range": f"{from_page}-{to_page}",
+                "total_pages_requested": len(pages),
+                "successful_pages": len(pages) - len(failed_pages),
+                "failed_pages": failed_pages,
+                "total_events": len(events),
+            },
+        }
+    }
+
+
+def vlr_events_catalog(max_pages=MAX_EVENT_PAGES):
+    """
+    Get every known event (upcoming and completed), deduplicated by event URL.
+
+    Completed pages are crawled in concurrent batches until an empty page is
+    reached or ``max_pages`` is hit. All pages come from the events cache when
+    warm, so repeated catalog calls cost no upstream requests.
+
+    Args:
+        max_pages (int): Maximum number of completed pages to crawl
+
+    Returns:
+        dict: Response with the deduplicated events and crawl meta
+    """
+    seen = set()
+    events = []
+    duplicates = 0
+
+    def add(event):
+        nonlocal duplicates
+        key = event["url_path"] or event["title"]
+        if key in seen:
+            duplicates += 1
+            return
+        seen.add(key)
+        events.append(event)
+
+    for event in cached_upcoming_events()["segments"]:
+        add(event)
+
+    failed_pages = []
+    pages_crawled = 0
+    page = 1
+    exhausted = False
+    while not exhausted and page <= max_pages:
+        batch = list(range(page, min(page + UPSTREAM_CONCURRENCY, max_pages + 1)))
+        outcomes = fan_out(cached_completed_events, [(p,) for p in batch])
+        for batch_page, (entry, error) in zip(batch, outcomes):
+            if error is not None:
+                failed_pages.append(batch_page)
+                continue
+            pages_crawled += 1
+            if not entry["segments"]:
+                exhausted = True
+            for event in entry["segments"]:
+                add(event)
+        page = batch[-1] + 1
+
+    return {
+        "data": {
+            "status": 200,
+            "segments": events,
+            "meta": {
+                "completed_pages_crawled": pages_crawled,
+                "failed_pages": failed_pages,
+                "duplicates_dropped": duplicates,
+                "total_events": len(events),
+            },
+        }
+    }
@@ -1,16 +1,118 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 
+SITES = ["https://vlrggapi.vercel.app", "https://vlr.gg"]
+# Seconds between background probe rounds
+HEALTH_CHECK_INTERVAL = float(os.environ.get("VLR_HEALTH_CHECK_INTERVAL", 30))
+HEALTH_CHECK_TIMEOUT = 5
+# Number of recent probe latencies kept per site for percentiles
+LATENCY_WINDOW = 120
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def probe(site, timeout=HEALTH_CHECK_TIMEOUT):
+    start = time.perf_counter()
+    try:
+        response = requests.get(site, timeout=timeout)
+        status_code = response.status_code
+    except requests.RequestException:
+        status_code = None
+    latency = (time.perf_counter() - start) * 1000
+    return {
+        "status": "Healthy" if status_code == 200 else "Unhealthy",
+        "status_code": status_code,
+        "latency_ms": round(latency, 1),
+    }
+
+
+class HealthMonitor:
+    """
+    Probes SITES concurrently on a background thread and keeps the last result.
+
+    Reading the status never does network I/O, so /health answers instantly
+    with the last-known state, its age and rolling latency percentiles.
+    """
+
+    def __init__(self, sites=SITES, interval=HEALTH_CHECK_INTERVAL):
+        self.sites = list(sites)
+        self.interval = interval
+        self._results = {}
+        self._latencies = {site: deque(maxlen=LATENCY_WINDOW) for site in self.sites}
+        self._checked_at = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self.sites), thread_name_prefix="health-probe"
+        )
+
+    def check_now(self):
+        results = dict(zip(self.sites, self._executor.map(probe, self.sites)))
+        with self._lock:
+            for site, result in results.items():
+                if result["status_code"] is not None:
+                    self._latencies[site].append(result["latency_ms"])
+            self._results = results
+            self._checked_at = time.time()
+        return results
+
+    def _run(self):
+        while True:
+            try:
+                self.check_now()
+            except Exception as e:
+                print(f"Warning: health check round failed: {e}")
+            time.sleep(self.interval)
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="health-monitor", daemon=True
+                )
+                self._thread.start()
+
+    def snapshot(self):
+        self.start()
+        with self._lock:
+            results = dict(self._results)
+            latencies = {site: sorted(values) for site, values in self._latencies.items()}
+            checked_at = self._checked_at
+
+        age = round(time.time() - checked_at, 1) if checked_at else None
+        snapshot = {}
+        for site in self.sites:
+            entry = dict(results.get(site, {"status": "Unknown", "status_code": None, "latency_ms": None}))
+            values = latencies[site]
+            entry.update(
+                {
+                    "checked_at": int(checked_at) if checked_at else None,
+                    "check_age_seconds": age,
+                    "latency_percentiles_ms": {
+                        "p50": percentile(values, 50),
+                        "p90": percentile(values, 90),
+                        "p99": percentile(values, 99),
+                        "samples": len(values),
+                    },
+                }
+            )
+            snapshot[site] = entry
+        return snapshot
+
+
+health_monitor = HealthMonitor()
+
 
 def check_health():
-    sites = ["https://vlrggapi.vercel.app", "https://vlr.gg"]
-    results = {}
-    for site in sites:
-        try:
-            response = requests.get(site, timeout=5)
-            results[site] = {
-                "status": "Healthy" if response.status_code == 200 else "Unhealthy",
-                "status_code": response.status_code,
-            }
-        except requests.RequestException:
-            results[site] = {"status": "Unhealthy", "status_code": None}
-    return results
+    return health_monitor.snapshot()
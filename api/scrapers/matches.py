@@ -1,98 +1,486 @@
 import re
+import threading
 import time
 from datetime import datetime, timezone
 
 import requests
 from selectolax.parser import HTMLParser
 
-from utils.utils import headers
+from api.entity_index import entity_index
+from api.team_form import team_form
+from utils import deadline
+from utils.cache import CACHE_TTL, data_cache
+from utils.fetch import fetch
+from utils.upstream import fan_out
+from utils.utils import MAX_REFILL_PAGES
 
 
-def vlr_upcoming_matches(num_pages=1, from_page=None, to_page=None):
+RELATIVE_TIME_RE = re.compile(r"(\d+)\s*(mo|y|w|d|h|m|s)")
+RELATIVE_UNITS = {
+    "y": 365 * 86400,
+    "mo": 30 * 86400,
+    "w": 7 * 86400,
+    "d": 86400,
+    "h": 3600,
+    "m": 60,
+    "s": 1,
+}
+DIGITS_RE = re.compile(r"-?\d+")
+
+# Seconds a live match's detail page is reused while its homepage scores are unchanged
+LIVE_DETAIL_MAX_AGE = 60
+
+# match_page -> {"fingerprint", "fetched_at", "detail"} for matches currently live
+_live_states = {}
+_live_lock = threading.Lock()
+
+
+def relative_seconds(text):
+    """Convert a relative vlr.gg time such as "2h 44m" or "1d 3h ago" to seconds (None if unparseable)."""
+    parts = RELATIVE_TIME_RE.findall(text or "")
+    if not parts:
+        return None
+    return sum(int(value) * RELATIVE_UNITS[unit] for value, unit in parts)
+
+
+def to_int(text):
+    """Parse an integer from a score or round cell ("13", " 2 ", "N/A" -> None)."""
+    match = DIGITS_RE.search(text or "")
+    return int(match.group()) if match else None
+
+
+def index_results(matches):
+    """Feed scraped results to the entity index and team form, giving each an absolute completed_at."""
+    now = time.time()
+    rows = []
+    for match in matches:
+        if "completed_at" not in match:
+            ago = relative_seconds(match.get("time_completed"))
+            match = dict(match, completed_at=int(now - ago) if ago is not None else None)
+        rows.append(match)
+    entity_index.add_results(rows)
+    team_form.add_results(rows)
+
+
+def page_range(num_pages=1, from_page=None, to_page=None):
+    """
+    Resolve the num_pages/from_page/to_page options shared by the match scrapers.
+
+    Returns:
+        tuple: (first page, last page), both inclusive
+    """
+    if from_page is not None and to_page is not None:
+        if from_page < 1:
+            raise ValueError("from_page must be >= 1")
+        if to_page < from_page:
+            raise ValueError("to_page must be >= from_page")
+        return from_page, to_page
+    if from_page is not None:
+        if from_page < 1:
+            raise ValueError("from_page must be >= 1")
+        return from_page, from_page + num_pages - 1
+    if to_page is not None:
+        if to_page < 1:
+            raise ValueError("to_page must be >= 1")
+        return max(1, to_page - num_pages + 1), to_page
+    return 1, num_pages
+
+
+def match_id(url):
+    """The numeric vlr.gg match id of a match page URL (the slug after it can change)."""
+    return url.replace("https://www.vlr.gg", "").strip("/").split("/")[0]
+
+
+def matches_url(page=1):
+    if page > 1:
+        return f"https://www.vlr.gg/matches/?page={page}"
+    return "https://www.vlr.gg/matches"
+
+
+def _flag(node):
+    flag = node.css_first(".flag") if node is not None else None
+    if flag is None:
+        return ""
+    # Same format as the results listing: "flag mod-br" -> "flag_br"
+    return flag.attributes.get("class", "").replace(" mod-", "_")
+
+
+def _schedule_cards(html):
+    """(day label, match card) pairs; each day label is followed by sibling cards holding its matches."""
+    labels = html.css("div.wf-label.mod-large")
+    if not labels:
+        for node in html.css("a.wf-module-item"):
+            yield "", node
+        return
+    for label in labels:
+        day = " ".join(label.text(deep=False).split())
+        node = label.next
+        while node is not None and "wf-label" not in (node.attributes.get("class") or ""):
+            if node.tag != "-text":
+                for card in node.css("a.wf-module-item"):
+                    yield day, card
+            node = node.next
+
+
+def parse_match_schedule(html, fetched_at=None):
+    """
+    Parse one page of the /matches listing (live and upcoming matches, grouped by day).
+
+    unix_timestamp comes from a data-utc-ts attribute when the page has one;
+    otherwise upcoming matches get ``fetched_at`` plus their countdown,
+    rounded to the minute, and live matches get None. vlr_upcoming_matches
+    replaces these estimates with the homepage's exact start times where it
+    lists the match.
     """
-    Get upcoming matches from VLR.GG.
+    fetched_at = fetched_at if fetched_at is not None else time.time()
+    result = []
+    for day, node in _schedule_cards(html):
+        teams = []
+        flags = []
+        scores = []
+        for team in node.css(".match-item-vs-team"):
+            name = team.css_first(".match-item-vs-team-name")
+            teams.append(name.text(strip=True) if name else "TBD")
+            flags.append(_flag(team))
+            score = team.css_first(".match-item-vs-team-score")
+            scores.append(score.text(strip=True) if score else "")
+        if len(teams) < 2:
+            continue
+
+        live = node.css_first(".ml.mod-live") is not None
+        eta_node = node.css_first(".ml-eta")
+        eta = eta_node.text(strip=True) if eta_node else ""
+
+        event = node.css_first(".match-item-event")
+        series = node.css_first(".match-item-event-series")
+        series_text = series.text(strip=True) if series else ""
+        event_text = ""
+        if event:
+            lines = [line.strip() for line in event.text().split("\n") if line.strip()]
+            lines = [line for line in lines if line != series_text]
+            event_text = lines[-1] if lines else ""
+
+        time_node = node.css_first(".match-item-time")
+        icon = node.css_first(".match-item-icon img")
+
+        epoch = None
+        utc = node.css_first("[data-utc-ts]")
+        if utc is not None:
+            epoch = to_int(utc.attributes.get("data-utc-ts"))
+        elif not live:
+            seconds = relative_seconds(eta)
+            if seconds is not None:
+                epoch = int(round((fetched_at + seconds) / 60) * 60)
+
+        result.append(
+            {
+                "team1": teams[0],
+                "team2": teams[1],
+                "flag1": flags[0],
+                "flag2": flags[1],
+                "score1": scores[0],
+                "score2": scores[1],
+                "status": "live" if live else "upcoming",
+                "eta": eta,
+                "date": day,
+                "time": time_node.text(strip=True) if time_node else "",
+                "match_event": event_text,
+                "match_series": series_text,
+                "tournament_icon": "https:" + icon.attributes.get("src", "") if icon else "",
+                "unix_timestamp": epoch,
+                "match_page": "https://www.vlr.gg" + node.attributes.get("href", ""),
+            }
+        )
+    return result
+
+
+def fetch_matches_page(page=1):
+    """One page of the /matches listing, cached under the short matches TTL."""
+
+    def scrape():
+        fetched_at = time.time()
+        resp = fetch(matches_url(page))
+        if resp.status_code != 200:
+            raise Exception("API response: {}".format(resp.status_code))
+        return parse_match_schedule(HTMLParser(resp.text), fetched_at)
+
+    return data_cache.get_or_set(("matches", page), scrape, CACHE_TTL["matches"])
+
+
+def homepage_start_times():
+    """Match id -> exact start epoch (data-utc-ts) of every match on the homepage, cached like /matches pages."""
+
+    def scrape():
+        resp = fetch("https://www.vlr.gg")
+        if resp.status_code != 200:
+            raise Exception("API response: {}".format(resp.status_code))
+        times = {}
+        for item in HTMLParser(resp.text).css(".js-home-matches-upcoming a.wf-module-item"):
+            utc = item.css_first(".moment-tz-convert")
+            epoch = to_int(utc.attributes.get("data-utc-ts")) if utc is not None else None
+            if epoch is not None:
+                times[match_id(item.attributes.get("href", ""))] = epoch
+        return times
+
+    return data_cache.get_or_set(("matches", "homepage"), scrape, CACHE_TTL["matches"])
+
+
+def vlr_match_schedule(start_page=1, end_page=1):
+    """
+    Live and upcoming matches from a range of /matches pages.
+
+    Pages are fetched concurrently under the shared upstream budget and cached
+    individually. Matches that shift to the next page between fetches are
+    deduplicated by match_page (the first occurrence wins), and each item
+    carries the page_number it came from.
+
+    Returns:
+        tuple: (merged items, failed page numbers)
+    """
+    pages = list(range(start_page, end_page + 1))
+    items = []
+    seen = set()
+    failed = []
+    for page, (page_items, error) in zip(pages, fan_out(fetch_matches_page, [(p,) for p in pages])):
+        if error is not None:
+            print(f"Warning: failed to fetch matches page {page}: {error}")
+            failed.append(page)
+            continue
+        for item in page_items:
+            if item["match_page"] not in seen:
+                seen.add(item["match_page"])
+                items.append(dict(item, page_number=page))
+    if len(failed) == len(pages):
+        raise Exception("API response: all matches pages failed ({})".format(failed))
+    return items, failed
+
+
+def vlr_upcoming_matches(num_pages=1, from_page=None, to_page=None, typed=False):
+    """
+    Get upcoming matches from VLR.GG's paginated /matches listing.
     
     Args:
         num_pages (int): Number of pages to scrape from page 1 (ignored if from_page/to_page specified)
         from_page (int, optional): Starting page number (1-based)
         to_page (int, optional): Ending page number (1-based, inclusive)
+        typed (bool): Return epoch timestamps instead of relative/formatted time strings
     """
-    # Note: VLR.GG upcoming matches are typically only on the homepage
-    # Page range parameters are included for API consistency but may not apply
-    url = "https://www.vlr.gg"
-    resp = requests.get(url, headers=headers)
-    html = HTMLParser(resp.text)
-    status = resp.status_code
+    start_page, end_page = page_range(num_pages, from_page, to_page)
+    items, failed_pages = vlr_match_schedule(start_page, end_page)
 
-    result = []
-    for item in html.css(".js-home-matches-upcoming a.wf-module-item"):
-        is_upcoming = item.css_first(".h-match-eta.mod-upcoming")
-        if is_upcoming:
-            teams = []
-            flags = []
-            scores = []
-            for team in item.css(".h-match-team"):
-                teams.append(team.css_first(".h-match-team-name").text().strip())
-                flags.append(
-                    team.css_first(".flag")
-                    .attributes["class"]
-                    .replace(" mod-", "")
-                    .replace("16", "_")
-                )
-                scores.append(team.css_first(".h-match-team-score").text().strip())
+    # /matches only has countdowns; the homepage has exact start times for the
+    # soonest matches, which are the ones on page 1
+    exact = {}
+    if start_page == 1:
+        try:
+            exact = homepage_start_times()
+        except deadline.RequestAborted:
+            raise
+        except Exception as e:
+            print(f"Warning: homepage start times unavailable, using countdowns: {e}")
 
-            eta = item.css_first(".h-match-eta").text().strip()
-            if eta != "LIVE":
-                eta = eta + " from now"
-
-            match_event = item.css_first(".h-match-preview-event").text().strip()
-            match_series = item.css_first(".h-match-preview-series").text().strip()
-            timestamp = datetime.fromtimestamp(
-                int(item.css_first(".moment-tz-convert").attributes["data-utc-ts"]),
-                tz=timezone.utc,
-            ).strftime("%Y-%m-%d %H:%M:%S")
-            url_path = "https://www.vlr.gg/" + item.attributes["href"]
+    result = []
+    for item in items:
+        if item["status"] != "upcoming":
+            continue
+        epoch = exact.get(match_id(item["match_page"]), item["unix_timestamp"])
 
+        if typed:
             result.append(
                 {
-                    "team1": teams[0],
-                    "team2": teams[1],
-                    "flag1": flags[0],
-                    "flag2": flags[1],
-                    "time_until_match": eta,
-                    "match_series": match_series,
-                    "match_event": match_event,
-                    "unix_timestamp": timestamp,
-                    "match_page": url_path,
+                    "team1": item["team1"],
+                    "team2": item["team2"],
+                    "flag1": item["flag1"],
+                    "flag2": item["flag2"],
+                    "status": "upcoming",
+                    "match_series": item["match_series"],
+                    "match_event": item["match_event"],
+                    "unix_timestamp": epoch,
+                    "match_page": item["match_page"],
+                    "page_number": item["page_number"],
                 }
             )
+            continue
 
-    segments = {"status": status, "segments": result}
-    data = {"data": segments}
+        timestamp = (
+            datetime.fromtimestamp(epoch, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+            if epoch is not None
+            else None
+        )
+        result.append(
+            {
+                "team1": item["team1"],
+                "team2": item["team2"],
+                "flag1": item["flag1"],
+                "flag2": item["flag2"],
+                "time_until_match": item["eta"] + " from now" if item["eta"] else "",
+                "match_series": item["match_series"],
+                "match_event": item["match_event"],
+                "date": item["date"],
+                "unix_timestamp": timestamp,
+                "match_page": item["match_page"],
+                "page_number": item["page_number"],
+            }
+        )
 
-    if status != 200:
-        raise Exception("API response: {}".format(status))
-    return data
+    segments = {
+        "status": 200,
+        "segments": result,
+        "meta": {
+            "page_range": f"{start_page}-{end_page}",
+            "failed_pages": failed_pages,
+            "total_matches": len(result),
+        },
+    }
+    return {"data": segments}
+
+
+def parse_match_detail(html):
+    """Team logos and the live map (name and number) from a match page."""
+    logos = ["https:" + img.attributes.get("src", "") for img in html.css(".match-header-vs img")]
+
+    current_map = "Unknown"
+    map_number = "Unknown"
+    current_map_element = html.css_first(
+        ".vm-stats-gamesnav-item.js-map-switch.mod-active.mod-live"
+    )
+    if current_map_element:
+        label = (
+            current_map_element.css_first("div", default="Unknown")
+            .text()
+            .strip()
+            .replace("\n", "")
+            .replace("\t", "")
+        )
+        current_map = re.sub(r"^\d+", "", label)
+        map_number_match = re.search(r"^\d+", label)
+        map_number = map_number_match.group(0) if map_number_match else "Unknown"
+    return {"logos": logos, "current_map": current_map, "map_number": map_number}
+
+
+def live_match_detail(url_path, fingerprint):
+    """
+    Detail-page fields of a live match, refetched only when needed.
+
+    The match page is fetched again only when the homepage fragment
+    (``fingerprint``: scores and round counts) changed since the last fetch,
+    or the last fetch is older than LIVE_DETAIL_MAX_AGE. Logos never change
+    during a match, so they are kept from the first fetch that found them.
+
+    Returns:
+        tuple: (detail dict, 1 if the page was fetched else 0)
+    """
+    now = time.time()
+    with _live_lock:
+        state = _live_states.get(url_path)
+    if (
+        state is not None
+        and state["fingerprint"] == fingerprint
+        and now - state["fetched_at"] < LIVE_DETAIL_MAX_AGE
+    ):
+        return state["detail"], 0
+
+    detail = parse_match_detail(HTMLParser(fetch(url_path).text))
+    if state is not None and state["detail"]["logos"] and not detail["logos"]:
+        detail["logos"] = state["detail"]["logos"]
+    with _live_lock:
+        _live_states[url_path] = {"fingerprint": fingerprint, "fetched_at": now, "detail": detail}
+    return detail, 1
+
+
+def forget_finished_matches(live_pages):
+    """Drop live state for matches that are no longer live."""
+    with _live_lock:
+        for url_path in list(_live_states):
+            if url_path not in live_pages:
+                del _live_states[url_path]
+
+
+def _live_row(typed, teams, flags, scores, round_texts, detail, match_event, match_series, epoch, url_path):
+    team_logos = detail["logos"]
+    team1_round_ct = round_texts[0]["ct"] if len(round_texts) > 0 else "N/A"
+    team1_round_t = round_texts[0]["t"] if len(round_texts) > 0 else "N/A"
+    team2_round_ct = round_texts[1]["ct"] if len(round_texts) > 1 else "N/A"
+    team2_round_t = round_texts[1]["t"] if len(round_texts) > 1 else "N/A"
+
+    if typed:
+        return {
+            "team1": teams[0],
+            "team2": teams[1],
+            "flag1": flags[0],
+            "flag2": flags[1],
+            "team1_logo": team_logos[0] if len(team_logos) > 0 else "",
+            "team2_logo": team_logos[1] if len(team_logos) > 1 else "",
+            "score1": to_int(scores[0]),
+            "score2": to_int(scores[1]),
+            "team1_round_ct": to_int(team1_round_ct),
+            "team1_round_t": to_int(team1_round_t),
+            "team2_round_ct": to_int(team2_round_ct),
+            "team2_round_t": to_int(team2_round_t),
+            "map_number": to_int(detail["map_number"]),
+            "current_map": detail["current_map"],
+            "status": "live",
+            "match_event": match_event,
+            "match_series": match_series,
+            "unix_timestamp": epoch,
+            "match_page": url_path,
+        }
+
+    timestamp = (
+        datetime.fromtimestamp(epoch, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        if epoch is not None
+        else None
+    )
+    return {
+        "team1": teams[0],
+        "team2": teams[1],
+        "flag1": flags[0],
+        "flag2": flags[1],
+        "team1_logo": team_logos[0] if len(team_logos) > 0 else "",
+        "team2_logo": team_logos[1] if len(team_logos) > 1 else "",
+        "score1": scores[0],
+        "score2": scores[1],
+        "team1_round_ct": team1_round_ct,
+        "team1_round_t": team1_round_t,
+        "team2_round_ct": team2_round_ct,
+        "team2_round_t": team2_round_t,
+        "map_number": detail["map_number"],
+        "current_map": detail["current_map"],
+        "time_until_match": "LIVE",
+        "match_event": match_event,
+        "match_series": match_series,
+        "unix_timestamp": timestamp,
+        "match_page": url_path,
+    }
 
 
-def vlr_live_score(num_pages=1, from_page=None, to_page=None):
+def vlr_live_score(num_pages=1, from_page=None, to_page=None, typed=False):
     """
     Get live match scores from VLR.GG.
     
+    Live matches come from the homepage, which also carries per-side round
+    counts. When a page range other than the first /matches page is requested,
+    live matches on those /matches pages that the homepage does not list are
+    added too (their round counts are "N/A").
+    
     Args:
-        num_pages (int): Number of pages to scrape from page 1 (ignored if from_page/to_page specified)
+        num_pages (int): Number of /matches pages to scan from page 1 (ignored if from_page/to_page specified)
         from_page (int, optional): Starting page number (1-based)
         to_page (int, optional): Ending page number (1-based, inclusive)
+        typed (bool): Return integer scores/rounds and an epoch timestamp
     """
-    # Note: VLR.GG live matches are typically only on the homepage
-    # Page range parameters are included for API consistency but may not apply
+    start_page, end_page = page_range(num_pages, from_page, to_page)
+
     url = "https://www.vlr.gg"
-    resp = requests.get(url, headers=headers)
+    resp = fetch(url)
     html = HTMLParser(resp.text)
     status = resp.status_code
 
     matches = html.css(".js-home-matches-upcoming a.wf-module-item")
     result = []
+    live_pages = set()
+    homepage_ids = set()
+    detail_fetches = 0
     for match in matches:
         is_live = match.css_first(".h-match-eta.mod-live")
         if is_live:
@@ -117,85 +505,263 @@ def vlr_live_score(num_pages=1, from_page=None, to_page=None):
                 round_text_t = round_info_t[0].text().strip() if round_info_t else "N/A"
                 round_texts.append({"ct": round_text_ct, "t": round_text_t})
 
-            eta = "LIVE"
             match_event = match.css_first(".h-match-preview-event").text().strip()
             match_series = match.css_first(".h-match-preview-series").text().strip()
-            timestamp = datetime.fromtimestamp(
-                int(match.css_first(".moment-tz-convert").attributes["data-utc-ts"]),
-                tz=timezone.utc,
-            ).strftime("%Y-%m-%d %H:%M:%S")
+            epoch = int(match.css_first(".moment-tz-convert").attributes["data-utc-ts"])
             url_path = "https://www.vlr.gg/" + match.attributes["href"]
 
-            match_page = requests.get(url_path, headers=headers)
-            match_html = HTMLParser(match_page.text)
-            
-            team_logos = []
-            for img in match_html.css(".match-header-vs img"):
-                logo_url = "https:" + img.attributes.get("src", "")
-                team_logos.append(logo_url)
+            fingerprint = (tuple(scores), tuple((r["ct"], r["t"]) for r in round_texts))
+            detail, refetched = live_match_detail(url_path, fingerprint)
+            detail_fetches += refetched
+            live_pages.add(url_path)
+            homepage_ids.add(match_id(url_path))
 
-            current_map_element = match_html.css_first(
-                ".vm-stats-gamesnav-item.js-map-switch.mod-active.mod-live"
+            result.append(
+                _live_row(
+                    typed, teams, flags, scores, round_texts, detail,
+                    match_event, match_series, epoch, url_path,
+                )
             )
-            current_map = "Unknown"
-            if current_map_element:
-                current_map = (
-                    current_map_element.css_first("div", default="Unknown")
-                    .text()
-                    .strip()
-                    .replace("\n", "")
-                    .replace("\t", "")
+
+    if status != 200:
+        raise Exception("API response: {}".format(status))
+
+    meta = {}
+    if (start_page, end_page) != (1, 1):
+        items, failed_pages = vlr_match_schedule(start_page, end_page)
+        for item in items:
+            if item["status"] != "live" or match_id(item["match_page"]) in homepage_ids:
+                continue
+            scores = [item["score1"], item["score2"]]
+            detail, refetched = live_match_detail(item["match_page"], (tuple(scores), ()))
+            detail_fetches += refetched
+            live_pages.add(item["match_page"])
+            result.append(
+                _live_row(
+                    typed,
+                    [item["team1"], item["team2"]],
+                    [item["flag1"], item["flag2"]],
+                    scores,
+                    [],
+                    detail,
+                    item["match_event"],
+                    item["match_series"],
+                    item["unix_timestamp"],
+                    item["match_page"],
                 )
-                current_map = re.sub(r"^\d+", "", current_map)
-                map_number_match = (
-                    current_map_element.css_first("div", default="Unknown")
-                    .text()
-                    .strip()
-                    .replace("\n", "")
-                    .replace("\t", "")
+            )
+        meta = {"page_range": f"{start_page}-{end_page}", "failed_pages": failed_pages}
+
+    forget_finished_matches(live_pages)
+
+    segments = {
+        "status": status,
+        "segments": result,
+        "meta": {"live_matches": len(result), "detail_pages_fetched": detail_fetches, **meta},
+    }
+    return {"data": segments}
+
+
+def results_url(page=1):
+    if page > 1:
+        return f"https://www.vlr.gg/matches/results/?page={page}"
+    return "https://www.vlr.gg/matches/results"
+
+
+def parse_results_page(html, page, fetched_at=None, typed=False):
+    """Result rows of one /matches/results page, each tagged with its page_number."""
+    fetched_at = fetched_at if fetched_at is not None else time.time()
+    page_results = []
+    for item in html.css("a.wf-module-item"):
+        try:
+            url_path = item.attributes["href"]
+            eta = item.css_first("div.ml-eta").text() + " ago"
+            rounds = (
+                item.css_first("div.match-item-event-series")
+                .text()
+                .replace("\u2013", "-")
+                .replace("\n", "")
+                .replace("\t", "")
+            )
+            tourney = (
+                item.css_first("div.match-item-event")
+                .text()
+                .replace("\t", " ")
+                .strip()
+                .split("\n")[1]
+                .strip()
+            )
+            tourney_icon_url = f"https:{item.css_first('img').attributes['src']}"
+
+            try:
+                team_array = (
+                    item.css_first("div.match-item-vs").css_first("div:nth-child(2)").text()
                 )
-                map_number_match = re.search(r"^\d+", map_number_match)
-                map_number = (
-                    map_number_match.group(0) if map_number_match else "Unknown"
+            except Exception:
+                team_array = "TBD"
+            team_array = (
+                team_array.replace("\t", " ")
+                .replace("\n", " ")
+                .strip()
+                .split("                                  ")
+            )
+            team1 = team_array[0]
+            score1 = team_array[1].replace(" ", "").strip()
+            team2 = team_array[4].strip()
+            score2 = team_array[-1].replace(" ", "").strip()
+
+            flag_list = [
+                flag_parent.attributes["class"].replace(" mod-", "_")
+                for flag_parent in item.css(".flag")
+            ]
+            flag1 = flag_list[0] if len(flag_list) > 0 else ""
+            flag2 = flag_list[1] if len(flag_list) > 1 else ""
+
+            if typed:
+                ago = relative_seconds(eta)
+                page_results.append(
+                    {
+                        "team1": team1,
+                        "team2": team2,
+                        "score1": to_int(score1),
+                        "score2": to_int(score2),
+                        "flag1": flag1,
+                        "flag2": flag2,
+                        "completed_at": int(fetched_at - ago) if ago is not None else None,
+                        "round_info": rounds,
+                        "tournament_name": tourney,
+                        "match_page": url_path,
+                        "tournament_icon": tourney_icon_url,
+                        "page_number": page,
+                    }
                 )
+                continue
 
-            team1_round_ct = round_texts[0]["ct"] if len(round_texts) > 0 else "N/A"
-            team1_round_t = round_texts[0]["t"] if len(round_texts) > 0 else "N/A"
-            team2_round_ct = round_texts[1]["ct"] if len(round_texts) > 1 else "N/A"
-            team2_round_t = round_texts[1]["t"] if len(round_texts) > 1 else "N/A"
-            result.append(
+            page_results.append(
                 {
-                    "team1": teams[0],
-                    "team2": teams[1],
-                    "flag1": flags[0],
-                    "flag2": flags[1],
-                    "team1_logo": team_logos[0] if len(team_logos) > 0 else "",
-                    "team2_logo": team_logos[1] if len(team_logos) > 1 else "",
-                    "score1": scores[0],
-                    "score2": scores[1],
-                    "team1_round_ct": team1_round_ct,
-                    "team1_round_t": team1_round_t,
-                    "team2_round_ct": team2_round_ct,
-                    "team2_round_t": team2_round_t,
-                    "map_number": map_number,
-                    "current_map": current_map,
-                    "time_until_match": eta,
-                    "match_event": match_event,
-                    "match_series": match_series,
-                    "unix_timestamp": timestamp,
+                    "team1": team1,
+                    "team2": team2,
+                    "score1": score1,
+                    "score2": score2,
+                    "flag1": flag1,
+                    "flag2": flag2,
+                    "time_completed": eta,
+                    "round_info": rounds,
+                    "tournament_name": tourney,
                     "match_page": url_path,
+                    "tournament_icon": tourney_icon_url,
+                    "page_number": page,  # Track which page this came from
                 }
             )
+        except Exception as e:
+            print(f"Warning: Failed to parse match item on page {page}: {str(e)}")
+            continue
+    return page_results
 
-    segments = {"status": status, "segments": result}
-    data = {"data": segments}
 
-    if status != 200:
-        raise Exception("API response: {}".format(status))
-    return data
+def scrape_results_page(page, max_retries=3, request_delay=1.0, timeout=30, typed=False, label=""):
+    """
+    Fetch and parse one results page, retrying with exponential backoff.
 
+    Returns:
+        list: The page's rows (empty for an empty page), or None if every attempt failed
+    """
+    for attempt in range(1, max_retries + 1):
+        try:
+            print(f"Scraping page {page}{label} (attempt {attempt}/{max_retries})")
 
-def vlr_match_results(num_pages=1, from_page=None, to_page=None, max_retries=3, request_delay=1.0, timeout=30):
+            resp = fetch(results_url(page), timeout=timeout)
+            if resp.status_code != 200:
+                print(f"Warning: Page {page} returned status {resp.status_code}")
+            else:
+                page_results = parse_results_page(HTMLParser(resp.text), page, time.time(), typed)
+                if not page_results:
+                    print(f"Warning: No match items found on page {page}")
+                else:
+                    print(f"Successfully scraped page {page}: {len(page_results)} matches")
+                return page_results
+
+        except deadline.RequestAborted:
+            # Nobody is waiting for the rest of the pages
+            raise
+
+        except requests.exceptions.Timeout:
+            print(f"Timeout error on page {page}, attempt {attempt}/{max_retries}")
+
+        except requests.exceptions.ConnectionError:
+            print(f"Connection error on page {page}, attempt {attempt}/{max_retries}")
+
+        except Exception as e:
+            print(f"Unexpected error on page {page}: {str(e)}")
+
+        if attempt < max_retries:
+            backoff_time = request_delay * (2 ** attempt)
+            print(f"Retrying page {page} in {backoff_time:.1f} seconds...")
+            deadline.sleep(backoff_time)
+
+    print(f"Failed to scrape page {page} after {max_retries} attempts")
+    return None
+
+
+class StableCrawl:
+    """
+    Merge results pages fetched one after another into a consistent snapshot.
+
+    The results listing only grows at its head, so while a crawl sleeps
+    between pages, newly finished matches push every row towards later pages.
+    The rows of page N that were already seen on page N-1 measure that drift;
+    they are dropped via a seen-set of match_page. The same number of rows
+    was pushed past the last page of the range, so refill() takes them from
+    the pages after it. The result is the range as it stood when the first
+    page was fetched.
+    """
+
+    def __init__(self):
+        self.rows = []
+        self.seen = set()
+        # Rows the range has shifted by since its first page was fetched
+        self.drift = 0
+        self.duplicates_dropped = 0
+        self.gaps_refilled = 0
+
+    def _add(self, page_results, limit=None):
+        added = duplicates = 0
+        for row in page_results:
+            if row["match_page"] in self.seen:
+                duplicates += 1
+                continue
+            if limit is not None and added >= limit:
+                break
+            self.seen.add(row["match_page"])
+            self.rows.append(row)
+            added += 1
+        self.duplicates_dropped += duplicates
+        return added, duplicates
+
+    def add(self, page_results):
+        """Add the unseen rows of the next page in the range; returns how many were added."""
+        added, duplicates = self._add(page_results)
+        self.drift += duplicates
+        return added
+
+    @property
+    def missing(self):
+        """Rows pushed past the end of the range by drift and not yet refilled."""
+        return self.drift - self.gaps_refilled
+
+    def refill(self, page_results):
+        """
+        Take drifted rows from a page after the range; returns how many were added.
+
+        Its leading rows that are already known moved there after the range was
+        crawled; they are dropped without counting as drift.
+        """
+        added, _ = self._add(page_results, limit=self.missing)
+        self.gaps_refilled += added
+        return added
+
+
+def vlr_match_results(num_pages=1, from_page=None, to_page=None, max_retries=3, request_delay=1.0, timeout=30, typed=False, stable=False):
     """
     Scrape match results with robust error handling for large page counts.
     
@@ -206,185 +772,52 @@ def vlr_match_results(num_pages=1, from_page=None, to_page=None, max_retries=3,
         max_retries (int): Maximum retry attempts per page
         request_delay (float): Delay between requests in seconds
         timeout (int): Request timeout in seconds
+        typed (bool): Return integer scores and an epoch completion time instead of "... ago"
+        stable (bool): Drop rows repeated by pagination drift and refill the rows it
+            pushed past the last page (see StableCrawl); False returns pages as fetched
         
     Returns:
         dict: API response with match data
     """
 
-    result = []
     status = 200
     failed_pages = []
+    refill_pages = []
+    crawl = StableCrawl()
+    raw = []
     
-    # Determine page range
-    if from_page is not None and to_page is not None:
-        if from_page < 1:
-            raise ValueError("from_page must be >= 1")
-        if to_page < from_page:
-            raise ValueError("to_page must be >= from_page")
-        start_page = from_page
-        end_page = to_page
-        total_pages = end_page - start_page + 1
-    elif from_page is not None:
-        if from_page < 1:
-            raise ValueError("from_page must be >= 1")
-        start_page = from_page
-        end_page = from_page + num_pages - 1
-        total_pages = num_pages
-    elif to_page is not None:
-        if to_page < 1:
-            raise ValueError("to_page must be >= 1")
-        start_page = max(1, to_page - num_pages + 1)
-        end_page = to_page
-        total_pages = end_page - start_page + 1
-    else:
-        # Default behavior: scrape from page 1
-        start_page = 1
-        end_page = num_pages
-        total_pages = num_pages
-    
-    # Create a session for connection pooling and efficiency
-    session = requests.Session()
-    session.headers.update(headers)
+    start_page, end_page = page_range(num_pages, from_page, to_page)
+    total_pages = end_page - start_page + 1
     
     print(f"Starting to scrape pages {start_page}-{end_page} ({total_pages} pages) with {request_delay}s delay between requests...")
     
     for page in range(start_page, end_page + 1):
-        page_success = False
-        retry_count = 0
-        
-        while not page_success and retry_count < max_retries:
-            try:
-                if page == 1:
-                    url = "https://www.vlr.gg/matches/results"
-                else:
-                    url = f"https://www.vlr.gg/matches/results/?page={page}"
-                
-                current_page_num = page - start_page + 1
-                print(f"Scraping page {page} ({current_page_num}/{total_pages}) (attempt {retry_count + 1}/{max_retries})")
-                
-                # Add timeout and handle potential connection issues
-                resp = session.get(url, timeout=timeout)
-                html = HTMLParser(resp.text)
-                current_status = resp.status_code
-                
-                if current_status != 200:
-                    print(f"Warning: Page {page} returned status {current_status}")
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        time.sleep(request_delay * (2 ** retry_count))  # Exponential backoff
-                    continue
-                
-                page_results = []
-                items = html.css("a.wf-module-item")
-                
-                if not items:
-                    print(f"Warning: No match items found on page {page}")
-                    page_success = True  # Consider empty page as success
-                    break
-                
-                for item in items:
-                    try:
-                        url_path = item.attributes["href"]
-                        eta = item.css_first("div.ml-eta").text() + " ago"
-                        rounds = (
-                            item.css_first("div.match-item-event-series")
-                            .text()
-                            .replace("\u2013", "-")
-                            .replace("\n", "")
-                            .replace("\t", "")
-                        )
-                        tourney = (
-                            item.css_first("div.match-item-event")
-                            .text()
-                            .replace("\t", " ")
-                            .strip()
-                            .split("\n")[1]
-                            .strip()
-                        )
-                        tourney_icon_url = f"https:{item.css_first('img').attributes['src']}"
-
-                        try:
-                            team_array = (
-                                item.css_first("div.match-item-vs").css_first("div:nth-child(2)").text()
-                            )
-                        except Exception:
-                            team_array = "TBD"
-                        team_array = (
-                            team_array.replace("\t", " ")
-                            .replace("\n", " ")
-                            .strip()
-                            .split("                                  ")
-                        )
-                        team1 = team_array[0]
-                        score1 = team_array[1].replace(" ", "").strip()
-                        team2 = team_array[4].strip()
-                        score2 = team_array[-1].replace(" ", "").strip()
-
-                        flag_list = [
-                            flag_parent.attributes["class"].replace(" mod-", "_")
-                            for flag_parent in item.css(".flag")
-                        ]
-                        flag1 = flag_list[0] if len(flag_list) > 0 else ""
-                        flag2 = flag_list[1] if len(flag_list) > 1 else ""
-
-                        page_results.append(
-                            {
-                                "team1": team1,
-                                "team2": team2,
-                                "score1": score1,
-                                "score2": score2,
-                                "flag1": flag1,
-                                "flag2": flag2,
-                                "time_completed": eta,
-                                "round_info": rounds,
-                                "tournament_name": tourney,
-                                "match_page": url_path,
-                                "tournament_icon": tourney_icon_url,
-                                "page_number": page,  # Track which page this came from
-                            }
-                        )
-                    except Exception as e:
-                        print(f"Warning: Failed to parse match item on page {page}: {str(e)}")
-                        continue
-                
-                result.extend(page_results)
-                print(f"Successfully scraped page {page}: {len(page_results)} matches")
-                page_success = True
-                
-                # Rate limiting between successful requests
-                if page < end_page:
-                    time.sleep(request_delay)
-                
-            except requests.exceptions.Timeout:
-                retry_count += 1
-                print(f"Timeout error on page {page}, attempt {retry_count}/{max_retries}")
-                if retry_count < max_retries:
-                    backoff_time = request_delay * (2 ** retry_count)
-                    print(f"Retrying page {page} in {backoff_time:.1f} seconds...")
-                    time.sleep(backoff_time)
-                
-            except requests.exceptions.ConnectionError:
-                retry_count += 1
-                print(f"Connection error on page {page}, attempt {retry_count}/{max_retries}")
-                if retry_count < max_retries:
-                    backoff_time = request_delay * (2 ** retry_count)
-                    print(f"Retrying page {page} in {backoff_time:.1f} seconds...")
-                    time.sleep(backoff_time)
-                
-            except Exception as e:
-                retry_count += 1
-                print(f"Unexpected error on page {page}: {str(e)}")
-                if retry_count < max_retries:
-                    backoff_time = request_delay * (2 ** retry_count)
-                    print(f"Retrying page {page} in {backoff_time:.1f} seconds...")
-                    time.sleep(backoff_time)
-        
-        if not page_success:
+        if page > start_page:
+            # Rate limiting between requests
+            deadline.sleep(request_delay)
+        label = f" ({page - start_page + 1}/{total_pages})"
+        page_results = scrape_results_page(page, max_retries, request_delay, timeout, typed, label)
+        if page_results is None:
             failed_pages.append(page)
-            print(f"Failed to scrape page {page} after {max_retries} attempts")
-    
-    # Close the session
-    session.close()
+        elif stable:
+            crawl.add(page_results)
+        else:
+            raw.extend(page_results)
+
+    # Drift pushed crawl.missing rows of the snapshot past end_page; a page
+    # that drifted by more than a whole page needs a second refill page
+    page = end_page
+    while stable and crawl.missing > 0 and page < end_page + MAX_REFILL_PAGES:
+        page += 1
+        print(f"Pages drifted by {crawl.missing} rows, refilling from page {page}")
+        deadline.sleep(request_delay)
+        page_results = scrape_results_page(page, max_retries, request_delay, timeout, typed, " (refill)")
+        refill_pages.append(page)
+        if not page_results:
+            break
+        crawl.refill(page_results)
+
+    result = crawl.rows if stable else raw
     
     # Report results
     total_matches = len(result)
@@ -394,25 +827,37 @@ def vlr_match_results(num_pages=1, from_page=None, to_page=None, max_retries=3,
     print(f"  Page range: {start_page}-{end_page}")
     print(f"  Total matches: {total_matches}")
     print(f"  Successful pages: {successful_pages}/{total_pages}")
+    if crawl.duplicates_dropped:
+        print(f"  Duplicates dropped: {crawl.duplicates_dropped}, gaps refilled: {crawl.gaps_refilled}")
     
     if failed_pages:
         print(f"  Failed pages: {failed_pages}")
         print(f"  Consider retrying failed pages or adjusting parameters")
     
+    meta = {
+        "page_range": f"{start_page}-{end_page}",
+        "total_pages_requested": total_pages,
+        "successful_pages": successful_pages,
+        "failed_pages": failed_pages,
+        "total_matches": total_matches,
+    }
+    if stable:
+        meta.update(
+            {
+                "duplicates_dropped": crawl.duplicates_dropped,
+                "gaps_refilled": crawl.gaps_refilled,
+                "refill_pages": refill_pages,
+            }
+        )
     segments = {
         "status": status, 
         "segments": result,
-        "meta": {
-            "page_range": f"{start_page}-{end_page}",
-            "total_pages_requested": total_pages,
-            "successful_pages": successful_pages,
-            "failed_pages": failed_pages,
-            "total_matches": total_matches
-        }
+        "meta": meta,
     }
     data = {"data": segments}
 
     if not result:
         raise Exception(f"No data retrieved. Failed pages: {failed_pages}")
-    
-    return data
\ No newline at end of file
+
+    index_results(result)
+    return data
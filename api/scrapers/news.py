@@ -1,15 +1,30 @@
-import requests
+import re
+import threading
+
 from selectolax.parser import HTMLParser
 
-from utils.utils import headers
+from utils.cache import CACHE_TTL, TTLCache, data_cache
+from utils.fetch import fetch
+from utils.upstream import fan_out
 
+# Newest articles whose bodies are fetched in the background after a news list scrape
+NEWS_PREFETCH_COUNT = 5
+# Pages walked at most when looking for a "since" cursor
+MAX_FEED_PAGES = 10
+
+ARTICLE_PATH_RE = re.compile(r"^/(\d+)/[\w\-%.]*$")
+
+# Articles rarely change once published, so bodies are kept until evicted by size
+article_cache = TTLCache(maxsize=1024, default_ttl=float("inf"))
 
-def vlr_news():
-    url = "https://www.vlr.gg/news"
-    resp = requests.get(url, headers=headers)
-    html = HTMLParser(resp.text)
-    status = resp.status_code
 
+def news_url(page=1):
+    if page > 1:
+        return f"https://www.vlr.gg/news/?page={page}"
+    return "https://www.vlr.gg/news"
+
+
+def parse_news(html):
     result = []
     for item in html.css("a.wf-module-item"):
         date_author = item.css_first("div.ge-text-light").text()
@@ -20,7 +35,7 @@ def vlr_news():
         title = item.css_first("div:nth-child(1)").text().strip().split("\n")[0]
         title = title.replace("\t", "")
 
-        url = item.css_first("a.wf-module-item").attributes["href"]
+        url = item.attributes["href"]
 
         result.append(
             {
@@ -31,9 +46,156 @@ def vlr_news():
                 "url_path": "https://vlr.gg" + url,
             }
         )
+    return result
+
+
+def vlr_news_page(page=1):
+    """One page of the /news listing, cached under the news TTL."""
+
+    def scrape():
+        resp = fetch(news_url(page))
+        status = resp.status_code
+        if status != 200:
+            raise Exception("API response: {}".format(status))
+        return {"status": status, "segments": parse_news(HTMLParser(resp.text))}
+
+    key = ("news", page)
+    entry = data_cache.get(key)
+    if entry is None:
+        entry = scrape()
+        data_cache.set(key, entry, CACHE_TTL["news"])
+        if page == 1:
+            prefetch_articles(entry["segments"][:NEWS_PREFETCH_COUNT])
+    return entry
+
+
+def vlr_news():
+    entry = vlr_news_page(1)
+    return {"data": {"status": entry["status"], "segments": entry["segments"]}}
+
+
+def vlr_news_feed(page=1, since=None, limit=None):
+    """
+    Paginated news listing with cursor-based incremental fetching.
+
+    Args:
+        page (int): Listing page to return when no cursor is given
+        since (str, optional): url_path of the newest item the client already has;
+            pages are walked from the newest until it is found and only newer items are returned
+        limit (int, optional): Maximum number of items returned
+
+    Returns:
+        dict: Response with the items and a cursor (the newest url_path) for the next call
+    """
+    if since is None:
+        entry = vlr_news_page(page)
+        items = entry["segments"]
+        found = None
+        pages_fetched = 1
+    else:
+        # Compared as paths, so a url_path, a www. URL or a bare path all match
+        target = normalize_article_path(since)
+        items = []
+        found = False
+        pages_fetched = 0
+        for current in range(1, MAX_FEED_PAGES + 1):
+            segments = vlr_news_page(current)["segments"]
+            pages_fetched += 1
+            for item in segments:
+                if normalize_article_path(item["url_path"]) == target:
+                    found = True
+                    break
+                items.append(item)
+            if found or not segments or (limit and len(items) >= limit):
+                break
+
+    if limit:
+        items = items[:limit]
+    if items:
+        cursor = items[0]["url_path"]
+    else:
+        # Nothing newer: the client keeps its cursor, in url_path form like every other cursor
+        cursor = "https://vlr.gg" + target if since is not None else None
+
+    return {
+        "data": {
+            "status": 200,
+            "segments": items,
+            "meta": {
+                "page": page if since is None else None,
+                "cursor": cursor,
+                "cursor_found": found,
+                "pages_fetched": pages_fetched,
+            },
+        }
+    }
+
+
+def normalize_article_path(url):
+    """Reduce a vlr.gg article URL or path to its "/<id>/<slug>" path."""
+    path = re.sub(r"^https?://(www\.)?vlr\.gg", "", (url or "").strip())
+    path = "/" + path.lstrip("/")
+    if not ARTICLE_PATH_RE.match(path):
+        raise ValueError("Not a vlr.gg article path: {}".format(url))
+    return path
+
+
+def parse_article(html):
+    title = html.css_first("h1")
+    author = html.css_first(".article-meta-author")
+    date = html.css_first(".article-meta .js-date-toggle")
+    body = html.css_first(".article-body")
+
+    paragraphs = []
+    if body:
+        paragraphs = [p.text(strip=True) for p in body.css("p")]
+        paragraphs = [p for p in paragraphs if p] or [body.text(strip=True)]
+
+    return {
+        "title": title.text(strip=True) if title else "",
+        "author": author.text(strip=True) if author else "",
+        "date": date.text(strip=True) if date else "",
+        "paragraphs": paragraphs,
+        "body": "\n\n".join(paragraphs),
+    }
+
+
+def vlr_news_article(url):
+    """
+    Get the body of one news article. Bodies are cached indefinitely.
+
+    Args:
+        url (str): Article url_path as returned by /news, or its "/<id>/<slug>" path
+    """
+    path = normalize_article_path(url)
+    article = article_cache.get(path)
+    if article is None:
+        resp = fetch("https://www.vlr.gg" + path)
+        status = resp.status_code
+        if status != 200:
+            raise Exception("API response: {}".format(status))
+        article = parse_article(HTMLParser(resp.text))
+        article["url_path"] = "https://vlr.gg" + path
+        article_cache.set(path, article)
+    return {"data": {"status": 200, "segments": [article]}}
+
+
+def prefetch_articles(items):
+    """Fetch uncached article bodies for ``items`` on a background thread."""
+    paths = []
+    for item in items:
+        try:
+            path = normalize_article_path(item["url_path"])
+        except ValueError:
+            continue
+        if path not in article_cache:
+            paths.append(path)
+    if not paths:
+        return
 
-    data = {"data": {"status": status, "segments": result}}
+    def run():
+        for path, (_, error) in zip(paths, fan_out(vlr_news_article, [(p,) for p in paths])):
+            if error is not None:
+                print(f"Warning: failed to prefetch article {path}: {error}")
 
-    if status != 200:
-        raise Exception("API response: {}".format(status))
-    return data
+    threading.Thread(target=run, name="news-prefetch", daemon=True).start()
@@ -1,17 +1,21 @@
 import re
 
-import requests
 from selectolax.parser import HTMLParser
 
-from utils.utils import headers, region
+from api.entity_index import entity_index
+from utils.cache import CACHE_TTL, data_cache
+from utils.fetch import fetch
+from utils.upstream import fan_out
+from utils.utils import region
 
+MERGE_KEYS = ("earnings", "rank")
 
-def vlr_rankings(region_key):
-    url = "https://www.vlr.gg/rankings/" + region[str(region_key)]
-    resp = requests.get(url, headers=headers)
-    html = HTMLParser(resp.text)
-    status = resp.status_code
 
+def rankings_url(region_key):
+    return "https://www.vlr.gg/rankings/" + region[str(region_key)]
+
+
+def parse_rankings(html):
     result = []
     for item in html.css("div.rank-item"):
         rank = item.css_first("div.rank-item-rank-num").text().strip()
@@ -63,9 +67,92 @@ def vlr_rankings(region_key):
                 "logo": logo,
             }
         )
+    return result
+
+
+def vlr_rankings(region_key):
+    resp = fetch(rankings_url(region_key))
+    status = resp.status_code
+    result = parse_rankings(HTMLParser(resp.text))
 
     data = {"status": status, "data": result}
 
     if status != 200:
         raise Exception("API response: {}".format(status))
+    entity_index.add_rankings(str(region_key), result)
     return data
+
+
+def cached_rankings(region_key):
+    """vlr_rankings for one region, cached on its own under the rankings TTL."""
+    return data_cache.get_or_set(
+        ("rankings", region_key),
+        lambda: vlr_rankings(region_key),
+        CACHE_TTL["rankings"],
+    )
+
+
+def _to_int(value):
+    digits = re.sub(r"[^\d]", "", value or "")
+    return int(digits) if digits else None
+
+
+def vlr_rankings_multi(region_keys=None, merge=None, limit=None):
+    """
+    Get rankings for several regions at once.
+
+    Regions are fetched concurrently under the shared upstream budget and
+    cached individually. A failing region does not fail the whole call; its
+    status is reported next to the successful ones.
+
+    Args:
+        region_keys (list, optional): Region shortnames (default: every key in utils.utils.region)
+        merge (str, optional): Also return a merged leaderboard sorted by "earnings" or "rank"
+        limit (int, optional): Maximum rows in the merged leaderboard
+
+    Returns:
+        dict: Per-region rankings and status, plus the merged view if requested
+    """
+    region_keys = list(region_keys or region)
+    unknown = [key for key in region_keys if key not in region]
+    if unknown:
+        raise ValueError("Unknown region(s): {}".format(", ".join(unknown)))
+    if merge is not None and merge not in MERGE_KEYS:
+        raise ValueError("merge must be one of: {}".format(", ".join(MERGE_KEYS)))
+
+    outcomes = fan_out(cached_rankings, [(key,) for key in region_keys])
+
+    regions = {}
+    failed = []
+    for key, (ranking, error) in zip(region_keys, outcomes):
+        if error is None:
+            regions[key] = {"status": ranking["status"], "data": ranking["data"]}
+        else:
+            regions[key] = {"status": None, "error": str(error), "data": []}
+            failed.append(key)
+
+    if len(failed) == len(region_keys):
+        raise Exception("API response: all regions failed ({})".format(", ".join(failed)))
+
+    data = {"regions": regions}
+    if merge:
+        rows = [
+            dict(row, region=key)
+            for key, entry in regions.items()
+            for row in entry["data"]
+        ]
+        if merge == "earnings":
+            rows.sort(key=lambda row: _to_int(row["earnings"]) or 0, reverse=True)
+        else:
+            rows.sort(key=lambda row: (_to_int(row["rank"]) or float("inf"), row["region"]))
+        data["merged"] = rows[:limit] if limit else rows
+
+    return {
+        "status": 200,
+        "data": data,
+        "meta": {
+            "regions_requested": len(region_keys),
+            "regions_succeeded": len(region_keys) - len(failed),
+            "failed_regions": failed,
+        },
+    }
@@ -1,21 +1,68 @@
-import requests
+from urllib.parse import urlencode
+
 from selectolax.parser import HTMLParser
 
-from utils.utils import headers
+from api.entity_index import entity_index
+from utils.fetch import fetch
 
+# vlr.gg stats filter dimensions and the values used when a filter is not set
+STATS_FILTER_DEFAULTS = {
+    "event_group_id": "all",
+    "event_id": "all",
+    "country": "all",
+    "min_rounds": "200",
+    "min_rating": "1550",
+    "agent": "all",
+    "map_id": "all",
+}
 
-def vlr_stats(region: str, timespan: str):
-    base_url = f"https://www.vlr.gg/stats/?event_group_id=all&event_id=all&region={region}&country=all&min_rounds=200&min_rating=1550&agent=all&map_id=all"
-    url = (
-        f"{base_url}&timespan=all"
-        if timespan.lower() == "all"
-        else f"{base_url}&timespan={timespan}d"
-    )
 
-    resp = requests.get(url, headers=headers)
-    html = HTMLParser(resp.text)
-    status = resp.status_code
+def stats_filters(**filters):
+    """Merge filter overrides (None meaning "not set") into STATS_FILTER_DEFAULTS."""
+    merged = dict(STATS_FILTER_DEFAULTS)
+    for name, value in filters.items():
+        if name not in merged:
+            raise ValueError("Unknown stats filter: {}".format(name))
+        if value is not None:
+            merged[name] = str(value)
+    return merged
+
+
+def stats_url(region: str, timespan: str, **filters):
+    params = stats_filters(**filters)
+    params["region"] = region
+    params["timespan"] = "all" if timespan.lower() == "all" else f"{timespan}d"
+    return "https://www.vlr.gg/stats/?" + urlencode(params)
+
+
+def stats_table_key(region: str, timespan: str, **filters):
+    """Readable name of a stats table, e.g. "na/60" or "na/60?map_id=1" (non-default filters only)."""
+    changed = {
+        name: value
+        for name, value in stats_filters(**filters).items()
+        if value != STATS_FILTER_DEFAULTS[name]
+    }
+    key = "{}/{}".format(region, timespan.lower())
+    return key + "?" + urlencode(changed) if changed else key
+
+
+def parse_stats_filter_options(html):
+    """Read the values offered by each filter <select> on a stats page, e.g. every map_id."""
+    options = {}
+    for select in html.css("select[name]"):
+        name = select.attributes.get("name")
+        if name not in STATS_FILTER_DEFAULTS:
+            continue
+        options[name] = [
+            {"value": option.attributes.get("value", ""), "label": option.text(strip=True)}
+            for option in select.css("option")
+            if option.attributes.get("value") not in (None, "", "all")
+        ]
+    return options
+
 
+def parse_stats(html):
+    """Parse the rows of a vlr.gg stats table into a list of dicts (values kept as page strings)."""
     result = []
     for item in html.css("tbody tr"):
         player = item.text().replace("\t", "").replace("\n", " ").strip().split()
@@ -48,10 +95,35 @@ def vlr_stats(region: str, timespan: str):
                 "clutch_success_percentage": color_sq[10],
             }
         )
+    return result
+
+
+def vlr_stats(region: str, timespan: str, **filters):
+    """
+    Scrape the vlr.gg stats table.
+
+    Args:
+        region (str): Region shortname (or "all")
+        timespan (str): Timespan in days, or "all"
+        **filters: Optional stats filter dimensions (see STATS_FILTER_DEFAULTS)
+
+    Returns:
+        dict: Response with status code, player rows and the filter options the page offers
+    """
+    resp = fetch(stats_url(region, timespan, **filters))
+    html = HTMLParser(resp.text)
+    status = resp.status_code
+
+    result = parse_stats(html)
 
-    segments = {"status": status, "segments": result}
+    segments = {
+        "status": status,
+        "segments": result,
+        "filter_options": parse_stats_filter_options(html),
+    }
     data = {"data": segments}
 
     if status != 200:
         raise Exception("API response: {}".format(status))
+    entity_index.add_stats(stats_table_key(region, timespan, **filters), result)
     return data
@@ -0,0 +1,253 @@
+import threading
+import warnings
+
+import numpy as np
+
+from api.stats_table import NUMERIC_FIELDS
+
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+# Decimal places of aggregates in responses
+PRECISION = 4
+
+
+def _num(value):
+    """JSON-friendly float: rounded, NaN -> None."""
+    value = float(value)
+    return None if np.isnan(value) else round(value, PRECISION)
+
+
+def _ranked(values, descending=True):
+    """Indices ordering ``values`` with NaNs last."""
+    order = np.argsort(-values if descending else values, kind="stable")
+    return np.concatenate([order[~np.isnan(values[order])], order[np.isnan(values[order])]])
+
+
+class StatsAnalytics:
+    """
+    Column arrays of one StatsTable and the aggregates computed from them.
+
+    Numeric columns are the ones StatsTable already converted from the page
+    strings ("72%" -> 72.0), with missing values as NaN. Orgs and agents are
+    integer-coded, so group-bys are bincounts and matrix products. Each result
+    is memoized per arguments; a refreshed table gets a new StatsAnalytics,
+    so nothing is ever stale.
+    """
+
+    def __init__(self, table):
+        rows = table.rows
+        self.size = len(rows)
+        self.players = np.array([row.get("player", "") for row in rows], dtype=object)
+        self.orgs = np.array([row.get("org") or "N/A" for row in rows], dtype=object)
+        self.metrics = {
+            field: np.array([np.nan if v is None else v for v in column], dtype=np.float64)
+            for field, column in table.columns.items()
+        }
+        if self.size:
+            self.org_names, self.org_codes = np.unique(self.orgs, return_inverse=True)
+        else:
+            self.org_names, self.org_codes = np.array([], dtype=object), np.array([], dtype=np.int64)
+        self.agent_names = sorted(table.by_agent)
+        self.agent_matrix = np.zeros((self.size, len(self.agent_names)), dtype=bool)
+        for j, agent in enumerate(self.agent_names):
+            self.agent_matrix[table.by_agent[agent], j] = True
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def _memo(self, key, compute):
+        with self._lock:
+            if key in self._results:
+                return self._results[key]
+        value = compute()
+        with self._lock:
+            self._results[key] = value
+        return value
+
+    @staticmethod
+    def metric_names(metrics=None):
+        if not metrics:
+            return list(NUMERIC_FIELDS)
+        unknown = [m for m in metrics if m not in NUMERIC_FIELDS]
+        if unknown:
+            raise ValueError("Unknown metric(s): {}".format(", ".join(unknown)))
+        return list(metrics)
+
+    def _mask(self, min_rounds=None):
+        if min_rounds is None:
+            return np.ones(self.size, dtype=bool)
+        # NaN compares False, so players without a rounds count drop out
+        return self.metrics["rounds_played"] >= min_rounds
+
+    def orgs_summary(self, metrics=None, min_rounds=None, min_players=1, sort=None, descending=True):
+        """
+        Per-org player count, total rounds and the mean of each metric.
+
+        Returns:
+            list: One dict per org with "org", "players", "total_rounds" and
+                a mean per metric (keyed by the metric name)
+        """
+        metrics = self.metric_names(metrics)
+        if sort is not None and sort not in metrics + ["players", "total_rounds"]:
+            raise ValueError("Unknown sort field: {}".format(sort))
+        key = ("orgs", tuple(metrics), min_rounds, min_players, sort, descending)
+
+        def compute():
+            mask = self._mask(min_rounds)
+            codes = self.org_codes[mask]
+            groups = len(self.org_names)
+            columns = {"players": np.bincount(codes, minlength=groups).astype(np.float64)}
+            rounds = self.metrics["rounds_played"][mask]
+            columns["total_rounds"] = np.bincount(
+                codes, weights=np.nan_to_num(rounds), minlength=groups
+            )
+            for metric in metrics:
+                values = self.metrics[metric][mask]
+                present = ~np.isnan(values)
+                sums = np.bincount(codes[present], weights=values[present], minlength=groups)
+                counts = np.bincount(codes[present], minlength=groups)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    columns[metric] = np.where(counts > 0, sums / counts, np.nan)
+
+            keep = np.flatnonzero(columns["players"] >= max(1, min_players))
+            order = keep[_ranked(columns[sort or "players"][keep], descending)]
+            result = []
+            for i in order:
+                row = {
+                    "org": self.org_names[i],
+                    "players": int(columns["players"][i]),
+                    "total_rounds": int(columns["total_rounds"][i]),
+                }
+                row.update({metric: _num(columns[metric][i]) for metric in metrics})
+                result.append(row)
+            return result
+
+        return self._memo(key, compute)
+
+    def distribution(self, metrics=None, percentiles=DEFAULT_PERCENTILES, min_rounds=None):
+        """
+        Count, mean, standard deviation, min, max and percentiles of each metric.
+
+        Returns:
+            dict: metric -> summary, with percentiles keyed "p10", "p50", ...
+        """
+        metrics = self.metric_names(metrics)
+        percentiles = tuple(float(q) for q in percentiles)
+        if any(q < 0 or q > 100 for q in percentiles):
+            raise ValueError("Percentiles must be between 0 and 100")
+        key = ("distribution", tuple(metrics), percentiles, min_rounds)
+
+        def compute():
+            matrix = np.column_stack([self.metrics[m] for m in metrics])[self._mask(min_rounds)]
+            counts = np.sum(~np.isnan(matrix), axis=0)
+            result = {}
+            if not len(matrix):
+                return {m: {"count": 0} for m in metrics}
+            # All-NaN columns warn and give NaN, which is reported as None
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                means = np.nanmean(matrix, axis=0)
+                stds = np.nanstd(matrix, axis=0)
+                mins = np.nanmin(matrix, axis=0)
+                maxs = np.nanmax(matrix, axis=0)
+                quantiles = np.nanpercentile(matrix, percentiles, axis=0) if percentiles else None
+            for j, metric in enumerate(metrics):
+                summary = {
+                    "count": int(counts[j]),
+                    "mean": _num(means[j]),
+                    "std": _num(stds[j]),
+                    "min": _num(mins[j]),
+                    "max": _num(maxs[j]),
+                }
+                if quantiles is not None:
+                    summary["percentiles"] = {
+                        "p{:g}".format(q): _num(quantiles[i, j]) for i, q in enumerate(percentiles)
+                    }
+                result[metric] = summary
+            return result
+
+        return self._memo(key, compute)
+
+    def agent_usage(self, metric="rating", min_rounds=None):
+        """
+        Pick rate of every agent and the mean ``metric`` of the players who play it.
+
+        Returns:
+            list: Agents by number of players, each with "agent", "players",
+                "pick_rate" (share of players) and "mean_<metric>"
+        """
+        metric = self.metric_names([metric])[0]
+        key = ("agents", metric, min_rounds)
+
+        def compute():
+            mask = self._mask(min_rounds)
+            matrix = self.agent_matrix[mask]
+            total = int(mask.sum())
+            picks = matrix.sum(axis=0)
+            values = self.metrics[metric][mask]
+            present = ~np.isnan(values)
+            played = matrix[present].astype(np.float64)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                means = (played.T @ values[present]) / played.sum(axis=0)
+                rates = picks / total if total else np.full(len(picks), np.nan)
+            return [
+                {
+                    "agent": self.agent_names[j],
+                    "players": int(picks[j]),
+                    "pick_rate": _num(rates[j]),
+                    "mean_" + metric: _num(means[j]),
+                }
+                for j in _ranked(picks.astype(np.float64))
+            ]
+
+        return self._memo(key, compute)
+
+    def player_ranking(self, metrics=None, sort="rating", descending=True, min_rounds=None):
+        """
+        Every player's rank and percentile by ``sort`` and z-score per metric.
+
+        Z-scores and percentiles are relative to the players kept by
+        ``min_rounds``.
+
+        Returns:
+            list: Players in rank order with "player", "org", "rank",
+                "percentile", ``sort``'s value and "zscores" per metric
+        """
+        metrics = self.metric_names(metrics)
+        if sort not in NUMERIC_FIELDS:
+            raise ValueError("Unknown sort field: {}".format(sort))
+        key = ("players", tuple(metrics), sort, descending, min_rounds)
+
+        def compute():
+            index = np.flatnonzero(self._mask(min_rounds))
+            if not len(index):
+                return []
+            matrix = np.column_stack([self.metrics[m] for m in metrics])[index]
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                zscores = (matrix - np.nanmean(matrix, axis=0)) / np.nanstd(matrix, axis=0)
+            zscores[~np.isfinite(zscores)] = np.nan
+
+            values = self.metrics[sort][index]
+            known = np.sort(values[~np.isnan(values)])
+            # Share of players at or below each value (at or above when ascending is better)
+            if descending:
+                below = np.searchsorted(known, values, side="right")
+            else:
+                below = len(known) - np.searchsorted(known, values, side="left")
+            with np.errstate(invalid="ignore", divide="ignore"):
+                percentile = np.where(np.isnan(values), np.nan, 100.0 * below / max(1, len(known)))
+
+            result = []
+            for rank, i in enumerate(_ranked(values, descending), start=1):
+                result.append(
+                    {
+                        "player": self.players[index[i]],
+                        "org": self.orgs[index[i]],
+                        "rank": rank,
+                        "percentile": _num(percentile[i]),
+                        sort: _num(values[i]),
+                        "zscores": {m: _num(zscores[i, j]) for j, m in enumerate(metrics)},
+                    }
+                )
+            return result
+
+        return self._memo(key, compute)
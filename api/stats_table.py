@@ -0,0 +1,279 @@
+import threading
+import time
+
+from api.scrapers.stats import vlr_stats
+from api.scrapers.stats import STATS_FILTER_DEFAULTS, stats_filters
+from utils.cache import CACHE_TTL
+from utils.upstream import fan_out
+
+
+# Metric columns and how their page strings are converted for filtering/sorting
+NUMERIC_FIELDS = {
+    "rounds_played": int,
+    "rating": float,
+    "average_combat_score": float,
+    "kill_deaths": float,
+    "kill_assists_survived_traded": float,
+    "average_damage_per_round": float,
+    "kills_per_round": float,
+    "assists_per_round": float,
+    "first_kills_per_round": float,
+    "first_deaths_per_round": float,
+    "headshot_percentage": float,
+    "clutch_success_percentage": float,
+}
+TEXT_FIELDS = ("player", "org", "agents")
+FIELDS = TEXT_FIELDS + tuple(NUMERIC_FIELDS)
+
+# Tables not queried for this long are dropped by the refresher
+IDLE_EVICT_SECONDS = 6 * 3600
+# Upper bound on distinct filter combinations held in memory
+MAX_TABLES = 256
+REFRESH_CHECK_INTERVAL = 60
+
+
+def to_number(value, cast=float):
+    """Convert a stats cell such as "1.18", "72%" or "1,234" to a number (None if blank)."""
+    value = str(value).strip().rstrip("%").replace(",", "")
+    if not value:
+        return None
+    try:
+        return cast(value)
+    except ValueError:
+        try:
+            return cast(float(value))
+        except ValueError:
+            return None
+
+
+class StatsTable:
+    """
+    Typed, indexed copy of one parsed stats table.
+
+    Rows keep the original payload shape; numeric columns and an agent index
+    are built once so queries never reparse strings.
+    """
+
+    def __init__(self, rows, status=200, filter_options=None):
+        self.rows = rows
+        self.status = status
+        self.filter_options = filter_options or {}
+        self.fetched_at = time.time()
+        self.columns = {
+            field: [to_number(row.get(field, ""), cast) for row in rows]
+            for field, cast in NUMERIC_FIELDS.items()
+        }
+        self.by_agent = {}
+        for i, row in enumerate(rows):
+            for agent in row.get("agents", ()):
+                self.by_agent.setdefault(agent.lower(), []).append(i)
+        self._orders = {}
+        self._analytics = None
+        self._lock = threading.Lock()
+
+    def analytics(self):
+        """NumPy columns and memoized aggregates of this table, built on first use."""
+        if self._analytics is None:
+            # Imported here so /stats never pays for loading NumPy
+            from api.stats_analytics import StatsAnalytics
+
+            with self._lock:
+                if self._analytics is None:
+                    self._analytics = StatsAnalytics(self)
+        return self._analytics
+
+    def sort_order(self, field, descending=True):
+        """Row indices sorted by ``field``, computed once per table and direction."""
+        key = (field, descending)
+        order = self._orders.get(key)
+        if order is None:
+            if field in NUMERIC_FIELDS:
+                column = self.columns[field]
+                present = [i for i in range(len(self.rows)) if column[i] is not None]
+                missing = [i for i in range(len(self.rows)) if column[i] is None]
+                present.sort(key=column.__getitem__, reverse=descending)
+            else:
+                present = sorted(
+                    range(len(self.rows)),
+                    key=lambda i: str(self.rows[i].get(field, "")).lower(),
+                    reverse=descending,
+                )
+                missing = []
+            order = present + missing
+            with self._lock:
+                self._orders[key] = order
+        return order
+
+    def query(
+        self,
+        fields=None,
+        sort=None,
+        descending=True,
+        min_rounds=None,
+        min_rating=None,
+        agent=None,
+        limit=None,
+        offset=0,
+    ):
+        """
+        Filter, sort, project and paginate the table.
+
+        Args:
+            fields (list, optional): Columns to keep in each row
+            sort (str, optional): Column to sort by
+            descending (bool): Sort direction
+            min_rounds (int, optional): Minimum rounds played
+            min_rating (float, optional): Minimum rating
+            agent (str, optional): Only players who played this agent
+            limit (int, optional): Maximum rows returned
+            offset (int): Rows skipped after filtering and sorting
+
+        Returns:
+            tuple: (matching row count, list of rows for the requested page)
+        """
+        if fields:
+            unknown = [f for f in fields if f not in FIELDS]
+            if unknown:
+                raise ValueError("Unknown field(s): {}".format(", ".join(unknown)))
+        if sort and sort not in FIELDS:
+            raise ValueError("Unknown sort field: {}".format(sort))
+
+        if agent:
+            candidates = self.by_agent.get(agent.lower(), [])
+        else:
+            candidates = range(len(self.rows))
+
+        rounds = self.columns["rounds_played"]
+        rating = self.columns["rating"]
+        matched = [
+            i
+            for i in candidates
+            if (min_rounds is None or (rounds[i] is not None and rounds[i] >= min_rounds))
+            and (min_rating is None or (rating[i] is not None and rating[i] >= min_rating))
+        ]
+
+        if sort:
+            keep = set(matched)
+            matched = [i for i in self.sort_order(sort, descending) if i in keep]
+
+        total = len(matched)
+        page = matched[offset : offset + limit if limit is not None else None]
+        if fields:
+            rows = [{f: self.rows[i][f] for f in fields} for i in page]
+        else:
+            rows = [self.rows[i] for i in page]
+        return total, rows
+
+
+class StatsStore:
+    """
+    In-memory stats tables keyed by (region, timespan, upstream filters).
+
+    A daemon thread re-scrapes tables once they are older than the stats TTL,
+    so queries are always answered from memory and never trigger a scrape
+    except for the very first request of a key.
+    """
+
+    def __init__(self, ttl=CACHE_TTL["stats"]):
+        self.ttl = ttl
+        self._tables = {}
+        self._last_access = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._refresher = None
+
+    @staticmethod
+    def make_key(region, timespan, **filters):
+        merged = stats_filters(**filters)
+        return (region, timespan.lower()) + tuple(merged[name] for name in STATS_FILTER_DEFAULTS)
+
+    def _scrape(self, key):
+        region, timespan = key[:2]
+        filters = dict(zip(STATS_FILTER_DEFAULTS, key[2:]))
+        data = vlr_stats(region, timespan, **filters)["data"]
+        return StatsTable(data["segments"], data["status"], data.get("filter_options"))
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def has(self, region, timespan, **filters):
+        """Whether the table for these filters is in memory (querying it needs no scrape)."""
+        return self.make_key(region, timespan, **filters) in self._tables
+
+    def get(self, region, timespan, **filters):
+        return self._get(self.make_key(region, timespan, **filters))
+
+    def _get(self, key):
+        self._last_access[key] = time.monotonic()
+        self.start()
+
+        table = self._tables.get(key)
+        if table is not None:
+            return table
+        with self._key_lock(key):
+            table = self._tables.get(key)
+            if table is None:
+                table = self._scrape(key)
+                self._tables[key] = table
+                self._evict_overflow()
+        return table
+
+    def _evict(self, key):
+        self._tables.pop(key, None)
+        self._last_access.pop(key, None)
+        with self._lock:
+            self._key_locks.pop(key, None)
+
+    def _evict_overflow(self):
+        overflow = len(self._tables) - MAX_TABLES
+        if overflow > 0:
+            idle_first = sorted(self._tables, key=lambda k: self._last_access.get(k, 0))
+            for key in idle_first[:overflow]:
+                self._evict(key)
+
+    def get_many(self, combinations):
+        """
+        Fetch several filter combinations, scraping the uncached ones concurrently.
+
+        Args:
+            combinations (list): (region, timespan, filters dict) tuples
+
+        Returns:
+            list: (key, StatsTable or None, exception or None) in input order
+        """
+        keys = [self.make_key(region, timespan, **filters) for region, timespan, filters in combinations]
+        outcomes = fan_out(self._get, [(key,) for key in keys])
+        return [(key, table, error) for key, (table, error) in zip(keys, outcomes)]
+
+    def refresh_stale(self):
+        now = time.monotonic()
+        for key in list(self._tables):
+            if now - self._last_access.get(key, 0) > IDLE_EVICT_SECONDS:
+                self._evict(key)
+                continue
+            if time.time() - self._tables[key].fetched_at < self.ttl:
+                continue
+            try:
+                table = self._scrape(key)
+            except Exception as e:
+                print(f"Warning: failed to refresh stats table {key}: {e}")
+                continue
+            self._tables[key] = table
+
+    def _run(self):
+        while True:
+            time.sleep(REFRESH_CHECK_INTERVAL)
+            self.refresh_stale()
+
+    def start(self):
+        if self._refresher is None:
+            with self._lock:
+                if self._refresher is None:
+                    self._refresher = threading.Thread(
+                        target=self._run, name="stats-refresher", daemon=True
+                    )
+                    self._refresher.start()
+
+
+stats_store = StatsStore()
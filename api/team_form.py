@@ -0,0 +1,291 @@
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+
+from api.entity_index import normalize_name
+from utils.columnar import to_int
+
+# Rolling windows kept up to date per team (last N series)
+FORM_WINDOWS = (5, 10, 20)
+DEFAULT_FORM_WINDOW = 10
+# Newest series tracked per team; "overall" tallies cover all of them
+MAX_TEAM_SERIES = 100
+# Newest meetings tracked per pair of teams
+MAX_H2H_SERIES = 30
+DEFAULT_H2H_MEETINGS = 20
+# Teams and pairs kept; the least recently updated are dropped first
+MAX_FORM_TEAMS = 2000
+MAX_FORM_PAIRS = 10000
+
+# Counters of a tally; "maps" are the series score (maps won in a best-of)
+TALLY_FIELDS = ("series", "wins", "losses", "draws", "maps_won", "maps_lost")
+
+
+def _result(score, opponent_score):
+    return "W" if score > opponent_score else "L" if score < opponent_score else "D"
+
+
+def _tally():
+    return dict.fromkeys(TALLY_FIELDS, 0)
+
+
+def _apply(tally, outcome, sign=1):
+    tally["series"] += sign
+    tally[{"W": "wins", "L": "losses", "D": "draws"}[outcome["result"]]] += sign
+    tally["maps_won"] += sign * outcome["score"]
+    tally["maps_lost"] += sign * outcome["opponent_score"]
+
+
+def _summary(tally):
+    decided = tally["wins"] + tally["losses"]
+    return dict(
+        tally,
+        win_rate=round(tally["wins"] / decided, 4) if decided else None,
+        map_differential=tally["maps_won"] - tally["maps_lost"],
+    )
+
+
+class _Recent:
+    """
+    The newest ``size`` outcomes (newest first) with running tallies over
+    their first N entries and over all of them.
+
+    Outcomes are deduplicated by match_page while they are kept, and one
+    older than every kept outcome of a full list is ignored, so a result
+    re-scraped after it left the list is never counted twice. Inserting
+    touches at most len(windows) + 1 tallies (the new outcome enters, the
+    one pushed to position N leaves), so every window is a lookup.
+    """
+
+    def __init__(self, size, windows=()):
+        self.size = size
+        self.keys = []
+        self.items = []
+        self.pages = set()
+        self.windows = tuple(windows) + (size,)
+        self.tallies = {window: _tally() for window in self.windows}
+
+    def add(self, key, outcome):
+        """Insert ``outcome`` at its ``key`` order; False if it is a repeat or too old to keep."""
+        if outcome["match_page"] in self.pages:
+            return False
+        position = bisect_right(self.keys, key)
+        if position >= self.size:
+            return False
+        self.keys.insert(position, key)
+        self.items.insert(position, outcome)
+        self.pages.add(outcome["match_page"])
+        for window, tally in self.tallies.items():
+            if position < window:
+                _apply(tally, outcome)
+                if len(self.items) > window:
+                    _apply(tally, self.items[window], -1)
+        if len(self.items) > self.size:
+            self.keys.pop()
+            self.pages.discard(self.items.pop()["match_page"])
+        return True
+
+    @property
+    def total(self):
+        return self.tallies[self.size]
+
+
+class _Lru(OrderedDict):
+    """Dict of at most ``limit`` entries; touch() marks one as most recently updated."""
+
+    def __init__(self, limit):
+        super().__init__()
+        self.limit = limit
+
+    def touch(self, key, factory):
+        value = self.get(key)
+        if value is None:
+            value = self[key] = factory()
+            if len(self) > self.limit:
+                self.popitem(last=False)
+        else:
+            self.move_to_end(key)
+        return value
+
+
+class TeamForm:
+    """
+    Head-to-head records and rolling team form, fed by every results scrape.
+
+    Each new result (deduplicated by match_page) updates both teams' rolling
+    windows and the pair's head-to-head table in constant time, so queries
+    are lookups that never re-aggregate or scrape. Results may arrive in any
+    order (crawls go back in time); windows are ordered by completed_at, with
+    ties in the order results were scraped (newest first).
+
+    Memory is bounded: each team tracks its newest MAX_TEAM_SERIES series,
+    each pair its newest MAX_H2H_SERIES meetings, and at most MAX_FORM_TEAMS
+    teams and MAX_FORM_PAIRS pairs are kept.
+    """
+
+    def __init__(self):
+        self._teams = _Lru(MAX_FORM_TEAMS)
+        self._pairs = _Lru(MAX_FORM_PAIRS)
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _new_team(name):
+        return {"name": name, "recent": _Recent(MAX_TEAM_SERIES, FORM_WINDOWS)}
+
+    @staticmethod
+    def _pair_key(key1, key2):
+        # Pairs are stored with the keys sorted; tallies are from the first team's side
+        return (key1, key2) if key1 <= key2 else (key2, key1)
+
+    def add_results(self, matches):
+        """
+        Record result rows from /match?q=results.
+
+        Args:
+            matches (list): Result dicts (string or typed scores) with a
+                "completed_at" epoch (or None), newest first
+
+        Returns:
+            int: Results recorded by at least one team or pair; repeats,
+                results older than everything tracked and rows without both
+                scores are skipped
+        """
+        added = 0
+        with self._lock:
+            for match in matches:
+                match_page = match.get("match_page")
+                score1, score2 = to_int(match.get("score1")), to_int(match.get("score2"))
+                key1, key2 = normalize_name(match.get("team1")), normalize_name(match.get("team2"))
+                if not match_page or score1 is None or score2 is None or not key1 or not key2 or key1 == key2:
+                    continue
+                self._sequence += 1
+                # Newest first: latest completed_at, then earliest scraped
+                order = (-(match.get("completed_at") or 0), self._sequence)
+                common = {
+                    "match_page": match_page,
+                    "completed_at": match.get("completed_at"),
+                    "round_info": match.get("round_info"),
+                    "tournament_name": match.get("tournament_name"),
+                }
+
+                sides = {
+                    key1: (match["team1"], score1, match["team2"], score2),
+                    key2: (match["team2"], score2, match["team1"], score1),
+                }
+                recorded = False
+                for key, (name, score, opponent, opponent_score) in sides.items():
+                    team = self._teams.touch(key, lambda: self._new_team(name))
+                    outcome = dict(
+                        common,
+                        opponent=opponent,
+                        score=score,
+                        opponent_score=opponent_score,
+                        result=_result(score, opponent_score),
+                    )
+                    recorded |= team["recent"].add(order, outcome)
+
+                pair_key = self._pair_key(key1, key2)
+                pair = self._pairs.touch(pair_key, lambda: _Recent(MAX_H2H_SERIES))
+                name, score, opponent, opponent_score = sides[pair_key[0]]
+                meeting = dict(
+                    common,
+                    team1=name,
+                    team2=opponent,
+                    score=score,
+                    opponent_score=opponent_score,
+                    result=_result(score, opponent_score),
+                )
+                recorded |= pair.add(order, meeting)
+                added += recorded
+        return added
+
+    def form(self, name, window=DEFAULT_FORM_WINDOW):
+        """
+        A team's record over its last ``window`` tracked series and over all of them.
+
+        Returns:
+            dict: Tallies with win_rate and map_differential, and the series
+                in the window (newest first); None if the team is unknown
+
+        Raises:
+            ValueError: ``window`` is not one of FORM_WINDOWS
+        """
+        if window not in FORM_WINDOWS:
+            raise ValueError(
+                "Unsupported window: {} (use {})".format(window, ", ".join(map(str, FORM_WINDOWS)))
+            )
+        with self._lock:
+            team = self._teams.get(normalize_name(name))
+            if team is None:
+                return None
+            recent = team["recent"]
+            return {
+                "team": team["name"],
+                "window": window,
+                "form": _summary(recent.tallies[window]),
+                "overall": _summary(recent.total),
+                "results": list(recent.items[:window]),
+            }
+
+    def head_to_head(self, team1, team2, limit=DEFAULT_H2H_MEETINGS):
+        """
+        The tracked meetings of two teams, from ``team1``'s side.
+
+        Returns:
+            dict: Series and map tallies, win rate and the newest meetings;
+                None if either team is unknown
+        """
+        key1, key2 = normalize_name(team1), normalize_name(team2)
+        with self._lock:
+            first, second = self._teams.get(key1), self._teams.get(key2)
+            if first is None or second is None or key1 == key2:
+                return None
+            pair_key = self._pair_key(key1, key2)
+            flipped = pair_key[0] != key1
+            pair = self._pairs.get(pair_key)
+            totals = dict(pair.total) if pair else _tally()
+            meetings = list(pair.items[:limit]) if pair else []
+        if flipped:
+            totals["wins"], totals["losses"] = totals["losses"], totals["wins"]
+            totals["maps_won"], totals["maps_lost"] = totals["maps_lost"], totals["maps_won"]
+        summary = _summary(totals)
+        return {
+            "team1": first["name"],
+            "team2": second["name"],
+            "series": summary["series"],
+            "team1_wins": summary["wins"],
+            "team2_wins": summary["losses"],
+            "draws": summary["draws"],
+            "team1_win_rate": summary["win_rate"],
+            "team1_maps": summary["maps_won"],
+            "team2_maps": summary["maps_lost"],
+            "map_differential": summary["map_differential"],
+            "meetings": [
+                {
+                    "match_page": m["match_page"],
+                    "completed_at": m["completed_at"],
+                    "team1_score": m["opponent_score"] if flipped else m["score"],
+                    "team2_score": m["score"] if flipped else m["opponent_score"],
+                    "winner": (
+                        None if m["result"] == "D"
+                        else m["team1"] if m["result"] == "W" else m["team2"]
+                    ),
+                    "round_info": m["round_info"],
+                    "tournament_name": m["tournament_name"],
+                }
+                for m in meetings
+            ],
+        }
+
+    def counts(self):
+        with self._lock:
+            return {
+                "teams": len(self._teams),
+                "pairs": len(self._pairs),
+                "team_series": sum(len(t["recent"].items) for t in self._teams.values()),
+                "pair_series": sum(len(p.items) for p in self._pairs.values()),
+            }
+
+
+team_form = TeamForm()
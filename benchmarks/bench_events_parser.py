@@ -0,0 +1,82 @@
+"""
+Benchmark the /events card parser against saved pages.
+
+Save a few pages first, e.g.:
+    curl -A "Mozilla/5.0" "https://www.vlr.gg/events/?page=5" -o pages/events_5.html
+
+Then run from the repository root:
+    python -m benchmarks.bench_events_parser pages/*.html --save bench_events.json
+    python -m benchmarks.bench_events_parser pages/*.html --baseline bench_events.json
+
+With --baseline, the run fails (exit code 1) when parsing got slower than the
+saved result by more than --tolerance.
+"""
+import argparse
+import json
+import sys
+import time
+
+from selectolax.parser import HTMLParser
+
+from api.scrapers.events import parse_events_page
+
+
+def bench(paths, repeat):
+    pages = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            pages.append(f.read())
+
+    cards = 0
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cards = 0
+        for text in pages:
+            upcoming, completed = parse_events_page(HTMLParser(text))
+            cards += len(upcoming) + len(completed)
+        best = min(best, time.perf_counter() - start)
+
+    return {
+        "pages": len(pages),
+        "cards": cards,
+        "best_seconds": best,
+        "ms_per_page": best * 1000 / max(len(pages), 1),
+        "cards_per_second": cards / best if best else 0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("pages", nargs="+", help="Saved /events HTML files")
+    parser.add_argument("--repeat", type=int, default=20, help="Timing rounds (best is kept)")
+    parser.add_argument("--save", help="Write the result to this JSON file")
+    parser.add_argument("--baseline", help="Compare against a previously saved JSON result")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.15, help="Allowed slowdown vs baseline (0.15 = 15%%)"
+    )
+    args = parser.parse_args(argv)
+
+    result = bench(args.pages, args.repeat)
+    print(
+        f"{result['pages']} pages, {result['cards']} cards: "
+        f"{result['ms_per_page']:.2f} ms/page, {result['cards_per_second']:.0f} cards/s"
+    )
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        ratio = result["ms_per_page"] / baseline["ms_per_page"]
+        print(f"vs baseline: {ratio:.2f}x ({baseline['ms_per_page']:.2f} ms/page)")
+        if ratio > 1 + args.tolerance:
+            print("Regression: events parser is slower than the baseline")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Measure cold-start import time of the app and guard it against regressions.
+
+Run from the repository root:
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --budget-ms 400 --top 15
+
+Each sample imports main.py in a fresh interpreter. The run fails (exit code
+1) when the median import time exceeds --budget-ms, or when a module that
+should only load on first use (scrapers, requests, selectolax, numpy,
+uvicorn) is imported at startup.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be imported just by loading the app
+LAZY_MODULES = (
+    "api.scrapers",
+    "requests",
+    "selectolax",
+    "numpy",
+    "uvicorn",
+)
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+print(json.dumps({"ms": elapsed * 1000, "modules": sorted(sys.modules)}))
+"""
+
+
+def sample():
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def top_imports(count):
+    """Slowest modules by cumulative import time, from python -X importtime."""
+    err = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.strip()))
+    rows.sort(reverse=True)
+    return rows[:count]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh-interpreter samples")
+    parser.add_argument("--budget-ms", type=float, help="Fail when the median exceeds this")
+    parser.add_argument("--top", type=int, default=0, help="Show the N slowest imports")
+    args = parser.parse_args(argv)
+
+    samples = [sample() for _ in range(args.runs)]
+    times = [s["ms"] for s in samples]
+    median = statistics.median(times)
+    print(f"import main: median {median:.0f} ms (min {min(times):.0f}, max {max(times):.0f}, {args.runs} runs)")
+
+    failed = False
+    loaded = set(samples[-1]["modules"])
+    eager = [m for m in LAZY_MODULES if m in loaded]
+    if eager:
+        print("Imported at startup but should be lazy: " + ", ".join(eager))
+        failed = True
+
+    if args.top:
+        for cumulative, name in top_imports(args.top):
+            print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"Over budget: {median:.0f} ms > {args.budget_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,222 @@
-from fastapi import APIRouter, Query, Request
+from fastapi import APIRouter, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from api.scrape import Vlr
+from utils.admission import lane_for, run_admitted, snapshot as admission_snapshot, stream_admitted
+from utils.columnar import FORMATS as EXPORT_FORMATS
+from utils.rate_limit import RATE_LIMIT, query_bool, query_int, upstream_cost
+from utils.responses import cached_json
+from utils.utils import MAX_REFILL_PAGES, STATS_REGIONS, STATS_TIMESPANS, region as REGIONS
 
 router = APIRouter()
-limiter = Limiter(key_func=get_remote_address)
+# Every route draws from one per-client budget of RATE_LIMIT cost units. A
+# request costs 1 unit when its response is cached and more per vlr.gg page it
+# is expected to fetch otherwise; X-RateLimit-* headers report what is left.
+limiter = Limiter(key_func=get_remote_address, headers_enabled=True, strategy="moving-window")
 vlr = Vlr()
+# Detail pages the live score scraper is expected to fetch besides the homepage
+# (match pages are only refetched when a live match's score changes)
+LIVE_DETAIL_FETCHES = 1
+
+
+def _split(value):
+    return [v.strip() for v in value.split(",") if v.strip()] if value else []
+
+
+def _page_span(request, default):
+    from_page = query_int(request, "from_page")
+    to_page = query_int(request, "to_page")
+    if from_page and to_page:
+        return to_page - from_page + 1
+    return query_int(request, "num_pages", default)
+
+
+def _match_fetches(request):
+    q = request.query_params.get("q")
+    if q == "results" and query_bool(request, "stable"):
+        # A stable crawl may fetch refill pages past the range
+        return _page_span(request, 1) + MAX_REFILL_PAGES
+    if q == "upcoming" and query_int(request, "from_page", 1) == 1:
+        # Plus the homepage, for the exact start times of page 1
+        return _page_span(request, 1) + 1
+    if q in ("results", "upcoming"):
+        return _page_span(request, 1)
+    if q == "live_score":
+        # The homepage, plus the /matches pages unless only page 1 is asked for
+        pages = _page_span(request, 1)
+        if pages == 1 and query_int(request, "from_page", 1) == 1 and query_int(request, "to_page", 1) == 1:
+            pages = 0
+        return 1 + pages + LIVE_DETAIL_FETCHES
+    return 1
+
+
+def _stats_fetches(request):
+    params = request.query_params
+    if "region" not in params or "timespan" not in params:
+        return 1
+    filters = {
+        name: params.get(param)
+        for name, param in (
+            ("event_group_id", "event_group_id"),
+            ("event_id", "event_id"),
+            ("country", "country"),
+            ("map_id", "map_id"),
+            ("agent", "vlr_agent"),
+            ("min_rounds", "vlr_min_rounds"),
+            ("min_rating", "vlr_min_rating"),
+        )
+    }
+    return 0 if vlr.stats_table_loaded(params["region"], params["timespan"], **filters) else 1
+
+
+def _stats_batch_fetches(request):
+    if request.query_params.get("expand"):
+        return MAX_STATS_COMBINATIONS
+    count = 1
+    for name in ("region", "timespan", "event_group_id", "event_id", "country", "map_id", "vlr_agent"):
+        count *= max(1, len(_split(request.query_params.get(name))))
+    return count
+
+
+def _rankings_all_fetches(request):
+    return len(_split(request.query_params.get("regions"))) or len(REGIONS)
+
+
+def _events_crawl_fetches(request):
+    return vlr.uncached_event_pages(query_int(request, "from_page", 1), query_int(request, "to_page", 1))
+
+
+def _events_catalog_fetches(request):
+    # Only pages missing from the events cache are fetched
+    return vlr.uncached_event_pages(1, query_int(request, "max_pages", 100), until_empty=True, upcoming=True)
+
+
+def _export_fetches(request):
+    params = request.query_params
+    dataset = request.path_params.get("dataset")
+    if dataset == "stats":
+        return len(_split(params.get("regions")) or STATS_REGIONS) * len(
+            _split(params.get("timespans")) or STATS_TIMESPANS
+        )
+    if dataset == "rankings":
+        return _rankings_all_fetches(request)
+    if dataset not in ("results", "events"):
+        return 0
+    from_page = query_int(request, "from_page", 1)
+    to_page = query_int(request, "to_page")
+    if dataset == "results":
+        # Results pages are always fetched, plus the stable crawl's refill pages
+        return (to_page or from_page) - from_page + 1 + MAX_REFILL_PAGES
+    # Open-ended events crawls run until an empty page
+    return vlr.uncached_event_pages(
+        from_page, to_page or 100, until_empty=to_page is None, upcoming=from_page == 1
+    )
 
 
 @router.get("/news")
-@limiter.limit("600/minute")
-async def VLR_news(request: Request):
-    return vlr.vlr_news()
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(1))
+async def VLR_news(request: Request, response: Response):
+    return await cached_json(request, ("news",), vlr.vlr_news)
+
+
+@router.get("/news/feed")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(1))
+async def VLR_news_feed(
+    request: Request,
+    response: Response,
+    page: int = Query(1, description="Listing page (ignored when since is given)", ge=1, le=100),
+    since: str = Query(None, description="url_path of the newest item you already have"),
+    limit: int = Query(None, description="Maximum number of items", ge=1, le=200),
+):
+    """
+    Paginated news with incremental fetching.
+
+    Pass the `cursor` from the previous response as `since` to receive only
+    items published after it:
+    - /news/feed?page=2
+    - /news/feed?since=https://vlr.gg/336099/riot-introduces-changes-to-premier
+    """
+    try:
+        return await cached_json(
+            request,
+            ("news", "feed", page, since, limit),
+            lambda: vlr.vlr_news_feed(page, since, limit),
+        )
+    except ValueError as e:
+        return {"error": str(e)}
+
+
+@router.get("/news/article")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(1))
+async def VLR_news_article(
+    request: Request,
+    response: Response,
+    url: str = Query(..., description="Article url_path from /news, e.g. https://vlr.gg/336099/slug"),
+):
+    """
+    Get the full body of a news article.
+
+    Article bodies are cached indefinitely, and the newest articles are
+    prefetched in the background whenever the news list is refreshed.
+    """
+    try:
+        return await cached_json(request, ("news", "article", url), lambda: vlr.vlr_news_article(url))
+    except ValueError as e:
+        return {"error": str(e)}
+
+
+# Upper bound on filter combinations a single /stats/batch request may fan out to
+MAX_STATS_COMBINATIONS = 32
+
+
+def _stats_page(table, field_list, sort, order, min_rounds, min_rating, agent, limit, offset):
+    total, rows = table.query(
+        fields=field_list,
+        sort=sort,
+        descending=order != "asc",
+        min_rounds=min_rounds,
+        min_rating=min_rating,
+        agent=agent,
+        limit=limit,
+        offset=offset,
+    )
+    return {
+        "status": table.status,
+        "segments": rows,
+        "meta": {
+            "total_rows": len(table.rows),
+            "matched_rows": total,
+            "returned_rows": len(rows),
+            "offset": offset,
+            "fetched_at": int(table.fetched_at),
+        },
+    }
 
 
 @router.get("/stats")
-@limiter.limit("600/minute")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(_stats_fetches))
 async def VLR_stats(
     request: Request,
+    response: Response,
     region: str = Query(..., description="Region shortname"),
     timespan: str = Query(..., description="Timespan (30, 60, 90, or all)"),
+    fields: str = Query(None, description="Comma-separated fields to return (default: all)"),
+    sort: str = Query(None, description="Field to sort by, e.g. rating"),
+    order: str = Query("desc", description="Sort order", enum=["asc", "desc"]),
+    min_rounds: int = Query(None, description="Minimum rounds played", ge=0),
+    min_rating: float = Query(None, description="Minimum rating", ge=0),
+    agent: str = Query(None, description="Only players who played this agent"),
+    limit: int = Query(None, description="Maximum number of rows", ge=1),
+    offset: int = Query(0, description="Rows to skip", ge=0),
+    event_group_id: str = Query(None, description="vlr.gg event group id (default: all)"),
+    event_id: str = Query(None, description="vlr.gg event id (default: all)"),
+    country: str = Query(None, description="Country code (default: all)"),
+    map_id: str = Query(None, description="vlr.gg map id (default: all)"),
+    vlr_agent: str = Query(None, description="Upstream agent filter (default: all)"),
+    vlr_min_rounds: int = Query(None, description="Upstream minimum rounds (default: 200)", ge=0),
+    vlr_min_rating: int = Query(None, description="Upstream minimum rating (default: 1550)", ge=0),
 ):
     """
     Get VLR stats with query parameters.
@@ -33,14 +229,282 @@ async def VLR_stats(
         "jp": "japan",\n
         "oce": "oceania",\n
         "mn": "mena"\n
+
+    Filtering, sorting and pagination are applied server-side to an in-memory
+    copy of the table that is refreshed in the background.
+
+    vlr.gg filter dimensions (each distinct combination is cached separately):
+    - event_group_id, event_id, country, map_id
+    - vlr_agent, vlr_min_rounds, vlr_min_rating: vlr.gg's own agent, min_rounds
+      and min_rating filters, applied upstream (default: all, 200, 1550)
+
+    Examples:
+    - /stats?region=na&timespan=30&sort=rating&limit=10
+    - /stats?region=eu&timespan=all&agent=jett&min_rounds=500&fields=player,org,rating
+    - /stats?region=all&timespan=all&event_id=2097&map_id=8
+    """
+    filters = {
+        "event_group_id": event_group_id,
+        "event_id": event_id,
+        "country": country,
+        "map_id": map_id,
+        "agent": vlr_agent,
+        "min_rounds": vlr_min_rounds,
+        "min_rating": vlr_min_rating,
+    }
+    table = await run_admitted(
+        request, lane_for(request), lambda: vlr.vlr_stats_table(region, timespan, **filters)
+    )
+    field_list = _split(fields) or None
+
+    try:
+        return await cached_json(
+            request,
+            ("stats", region, timespan.lower(), tuple(filters.values()), table.fetched_at,
+             fields, sort, order, min_rounds, min_rating, agent, limit, offset),
+            lambda: {
+                "data": _stats_page(
+                    table, field_list, sort, order, min_rounds, min_rating, agent, limit, offset
+                )
+            },
+        )
+    except ValueError as e:
+        return {"error": str(e)}
+
+
+@router.get("/stats/batch")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(_stats_batch_fetches))
+async def VLR_stats_batch(
+    request: Request,
+    response: Response,
+    region: str = Query(..., description="Comma-separated region shortnames"),
+    timespan: str = Query(..., description="Comma-separated timespans (30, 60, 90, or all)"),
+    event_group_id: str = Query(None, description="Comma-separated event group ids"),
+    event_id: str = Query(None, description="Comma-separated event ids"),
+    country: str = Query(None, description="Comma-separated country codes"),
+    map_id: str = Query(None, description="Comma-separated map ids"),
+    vlr_agent: str = Query(None, description="Comma-separated upstream agent filters"),
+    expand: str = Query(
+        None,
+        description="Fan out over every value vlr.gg offers for this dimension",
+        enum=["event_group_id", "event_id", "country", "map_id", "agent"],
+    ),
+    fields: str = Query(None, description="Comma-separated fields to return (default: all)"),
+    sort: str = Query(None, description="Field to sort by, e.g. rating"),
+    order: str = Query("desc", description="Sort order", enum=["asc", "desc"]),
+    limit: int = Query(None, description="Maximum number of rows per combination", ge=1),
+):
+    """
+    Get stats for several filter combinations in one call.
+
+    Every comma-separated value list is expanded into the cartesian product of
+    combinations. Uncached combinations are scraped concurrently under the
+    shared upstream budget, and each one is cached on its own.
+
+    `expand` reads the options vlr.gg lists for a dimension from the first
+    combination's page, e.g. every map of an event:
+    - /stats/batch?region=all&timespan=all&event_id=2097&expand=map_id
+    - /stats/batch?region=na,eu,ap&timespan=30&sort=rating&limit=5
+    """
+    dimensions = {
+        "region": _split(region),
+        "timespan": _split(timespan),
+        "event_group_id": _split(event_group_id) or [None],
+        "event_id": _split(event_id) or [None],
+        "country": _split(country) or [None],
+        "map_id": _split(map_id) or [None],
+        "agent": _split(vlr_agent) or [None],
+    }
+
+    def combine():
+        combos = [{}]
+        for name, values in dimensions.items():
+            combos = [dict(c, **{name: v}) for c in combos for v in values]
+        return combos
+
+    if expand:
+        base = combine()[0]
+        table = await run_admitted(
+            request,
+            lane_for(request),
+            lambda: vlr.vlr_stats_table(
+                base["region"], base["timespan"],
+                **{k: v for k, v in base.items() if k not in ("region", "timespan")},
+            ),
+        )
+        dimensions[expand] = [o["value"] for o in table.filter_options.get(expand, [])]
+        if not dimensions[expand]:
+            return {"error": "vlr.gg offers no values for {}".format(expand)}
+
+    combos = combine()
+    if len(combos) > MAX_STATS_COMBINATIONS:
+        return {
+            "error": "Too many combinations ({}), the maximum is {}".format(
+                len(combos), MAX_STATS_COMBINATIONS
+            )
+        }
+
+    field_list = _split(fields) or None
+    outcomes = await run_admitted(
+        request,
+        lane_for(request),
+        vlr.vlr_stats_tables,
+        [
+            (c["region"], c["timespan"], {k: v for k, v in c.items() if k not in ("region", "timespan")})
+            for c in combos
+        ],
+    )
+
+    results = []
+    for combo, (_, table, error) in zip(combos, outcomes):
+        entry = {"filters": {k: v for k, v in combo.items() if v is not None}}
+        if error is None:
+            try:
+                entry.update(
+                    _stats_page(table, field_list, sort, order, None, None, None, limit, 0)
+                )
+            except ValueError as e:
+                error = e
+        if error is not None:
+            entry.update({"status": None, "error": str(error)})
+        results.append(entry)
+
+    return {"data": {"status": 200, "combinations": results}}
+
+
+async def _stats_analytics(request, region, timespan, view, args, compute):
+    """Serve an aggregate of one stats table, cached until the table is refreshed."""
+    table = await run_admitted(request, lane_for(request), lambda: vlr.vlr_stats_table(region, timespan))
+    try:
+        return await cached_json(
+            request,
+            ("stats_analytics", view, region, timespan.lower(), table.fetched_at) + tuple(args),
+            lambda: {
+                "data": {
+                    "status": table.status,
+                    "segments": compute(table.analytics()),
+                    "meta": {"total_rows": len(table.rows), "fetched_at": int(table.fetched_at)},
+                }
+            },
+        )
+    except ValueError as e:
+        return {"error": str(e)}
+
+
+def _percentile_list(value):
+    try:
+        return [float(q) for q in _split(value)]
+    except ValueError:
+        raise ValueError("Percentiles must be numbers, e.g. 10,50,90")
+
+
+@router.get("/stats/analytics/orgs")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(_stats_fetches))
+async def VLR_stats_orgs(
+    request: Request,
+    response: Response,
+    region: str = Query(..., description="Region shortname"),
+    timespan: str = Query(..., description="Timespan (30, 60, 90, or all)"),
+    metrics: str = Query(None, description="Comma-separated metrics to average (default: all)"),
+    min_rounds: int = Query(None, description="Only players with at least this many rounds", ge=0),
+    min_players: int = Query(1, description="Only orgs with at least this many players", ge=1),
+    sort: str = Query(None, description="players, total_rounds or a metric (default: players)"),
+    order: str = Query("desc", description="Sort order", enum=["asc", "desc"]),
+    limit: int = Query(None, description="Maximum number of orgs", ge=1),
+):
+    """
+    Per-org aggregates of a stats table: player count, total rounds and the mean of each metric.
+
+    Example: /stats/analytics/orgs?region=na&timespan=90&min_players=3&sort=rating
+    """
+    return await _stats_analytics(
+        request, region, timespan, "orgs",
+        (metrics, min_rounds, min_players, sort, order, limit),
+        lambda a: a.orgs_summary(
+            _split(metrics), min_rounds, min_players, sort, order != "asc"
+        )[:limit],
+    )
+
+
+@router.get("/stats/analytics/percentiles")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(_stats_fetches))
+async def VLR_stats_percentiles(
+    request: Request,
+    response: Response,
+    region: str = Query(..., description="Region shortname"),
+    timespan: str = Query(..., description="Timespan (30, 60, 90, or all)"),
+    metrics: str = Query(None, description="Comma-separated metrics (default: all)"),
+    percentiles: str = Query("10,25,50,75,90", description="Comma-separated percentiles (0-100)"),
+    min_rounds: int = Query(None, description="Only players with at least this many rounds", ge=0),
+):
+    """
+    Distribution of each metric: count, mean, std, min, max and percentiles.
+
+    Example: /stats/analytics/percentiles?region=eu&timespan=60&metrics=rating,average_combat_score&percentiles=50,90,99
+    """
+    return await _stats_analytics(
+        request, region, timespan, "percentiles",
+        (metrics, percentiles, min_rounds),
+        lambda a: [a.distribution(_split(metrics), _percentile_list(percentiles), min_rounds)],
+    )
+
+
+@router.get("/stats/analytics/agents")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(_stats_fetches))
+async def VLR_stats_agents(
+    request: Request,
+    response: Response,
+    region: str = Query(..., description="Region shortname"),
+    timespan: str = Query(..., description="Timespan (30, 60, 90, or all)"),
+    metric: str = Query("rating", description="Metric averaged over each agent's players"),
+    min_rounds: int = Query(None, description="Only players with at least this many rounds", ge=0),
+):
+    """
+    Agent pick rates (share of players who played the agent) and the mean metric of those players.
+
+    Example: /stats/analytics/agents?region=ap&timespan=30&metric=average_combat_score
+    """
+    return await _stats_analytics(
+        request, region, timespan, "agents",
+        (metric, min_rounds),
+        lambda a: a.agent_usage(metric, min_rounds),
+    )
+
+
+@router.get("/stats/analytics/players")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(_stats_fetches))
+async def VLR_stats_player_ranking(
+    request: Request,
+    response: Response,
+    region: str = Query(..., description="Region shortname"),
+    timespan: str = Query(..., description="Timespan (30, 60, 90, or all)"),
+    sort: str = Query("rating", description="Metric players are ranked by"),
+    order: str = Query("desc", description="desc ranks the highest value first", enum=["asc", "desc"]),
+    metrics: str = Query(None, description="Comma-separated metrics to z-score (default: all)"),
+    min_rounds: int = Query(None, description="Only players with at least this many rounds", ge=0),
+    limit: int = Query(None, description="Maximum number of players", ge=1),
+    offset: int = Query(0, description="Players to skip", ge=0),
+):
+    """
+    Player rankings with percentile ranks and per-metric z-scores.
+
+    Z-scores and percentiles are relative to the players kept by min_rounds.
+
+    Example: /stats/analytics/players?region=na&timespan=90&sort=rating&min_rounds=500&limit=20
     """
-    return vlr.vlr_stats(region, timespan)
+    return await _stats_analytics(
+        request, region, timespan, "players",
+        (sort, order, metrics, min_rounds, limit, offset),
+        lambda a: a.player_ranking(_split(metrics), sort, order != "asc", min_rounds)[
+            offset : offset + limit if limit is not None else None
+        ],
+    )
 
 
 @router.get("/rankings")
-@limiter.limit("600/minute")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(1))
 async def VLR_ranks(
-    request: Request, region: str = Query(..., description="Region shortname")
+    request: Request, response: Response, region: str = Query(..., description="Region shortname")
 ):
     """
     Get VLR rankings for a specific region.
@@ -61,20 +525,54 @@ async def VLR_ranks(
         "jp": "japan",\n
         "col": "collegiate",\n
     """
-    return vlr.vlr_rankings(region)
+    return await cached_json(request, ("rankings", region), lambda: vlr.vlr_rankings(region))
+
+
+@router.get("/rankings/all")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(_rankings_all_fetches))
+async def VLR_ranks_all(
+    request: Request,
+    response: Response,
+    regions: str = Query(None, description="Comma-separated region shortnames (default: all regions)"),
+    merge: str = Query(None, description="Also return a merged leaderboard", enum=["earnings", "rank"]),
+    limit: int = Query(None, description="Maximum rows in the merged leaderboard", ge=1),
+):
+    """
+    Get VLR rankings for several (or all) regions in one call.
+
+    Regions are fetched concurrently and cached individually. If some
+    regions fail, the others are still returned and each region carries its
+    own status; failed regions are listed in meta.failed_regions.
+
+    Examples:
+    - /rankings/all
+    - /rankings/all?regions=na,eu,ap&merge=earnings&limit=50
+    """
+    region_keys = _split(regions) or None
+    try:
+        return await cached_json(
+            request,
+            ("rankings", "multi", tuple(region_keys or ()), merge, limit),
+            lambda: vlr.vlr_rankings_multi(region_keys, merge, limit),
+        )
+    except ValueError as e:
+        return {"error": str(e)}
 
 
 @router.get("/match")
-@limiter.limit("600/minute")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(_match_fetches))
 async def VLR_match(
-    request: Request, 
+    request: Request,
+    response: Response,
     q: str,
     num_pages: int = Query(1, description="Number of pages to scrape (default: 1)", ge=1, le=600),
     from_page: int = Query(None, description="Starting page number (1-based, optional)", ge=1, le=600),
     to_page: int = Query(None, description="Ending page number (1-based, inclusive, optional)", ge=1, le=600),
     max_retries: int = Query(3, description="Maximum retry attempts per page (default: 3)", ge=1, le=5),
     request_delay: float = Query(1.0, description="Delay between requests in seconds (default: 1.0)", ge=0.5, le=5.0),
-    timeout: int = Query(30, description="Request timeout in seconds (default: 30)", ge=10, le=120)
+    timeout: int = Query(30, description="Request timeout in seconds (default: 30)", ge=10, le=120),
+    typed: bool = Query(False, description="Return epoch timestamps and integer scores instead of display strings"),
+    stable: bool = Query(False, description="Results only: drop rows repeated by pagination drift and refill the rows it skipped"),
 ):
     """
     query parameters:\n
@@ -91,27 +589,48 @@ async def VLR_match(
     - max_retries: Maximum retry attempts per failed page (1-5, default: 3)
     - request_delay: Delay between requests in seconds (0.5-5.0, default: 1.0)
     - timeout: Request timeout in seconds (10-120, default: 30)
+    - stable: Deduplicate results by match page and refill rows that newly finished
+      matches pushed past the last page during the crawl (default: false)
+
+    Typed output (typed=true):
+    - unix_timestamp / completed_at are epoch seconds, scores and round counts are integers
+    - relative strings ("2h 30m from now", "... ago") are dropped, so cached payloads stay correct
     
     Examples:
     - /match?q=results&num_pages=5 (scrapes pages 1-5)
     - /match?q=results&from_page=10&to_page=15 (scrapes pages 10-15)
     - /match?q=results&from_page=5&num_pages=3 (scrapes pages 5-7)
+    - /match?q=upcoming&num_pages=3 (upcoming matches from /matches pages 1-3)
+    - /match?q=live_score&num_pages=2 (homepage live matches plus any others on /matches pages 1-2)
     """
     if q == "upcoming":
-        return vlr.vlr_upcoming_matches(num_pages, from_page, to_page)
+        return await cached_json(
+            request,
+            ("upcoming", num_pages, from_page, to_page, typed),
+            lambda: vlr.vlr_upcoming_matches(num_pages, from_page, to_page, typed),
+        )
     elif q == "live_score":
-        return vlr.vlr_live_score(num_pages, from_page, to_page)
+        return await cached_json(
+            request,
+            ("live_score", num_pages, from_page, to_page, typed),
+            lambda: vlr.vlr_live_score(num_pages, from_page, to_page, typed),
+        )
     elif q == "results":
-        return vlr.vlr_match_results(num_pages, from_page, to_page, max_retries, request_delay, timeout)
+        return await cached_json(
+            request,
+            ("results", num_pages, from_page, to_page, typed, stable),
+            lambda: vlr.vlr_match_results(num_pages, from_page, to_page, max_retries, request_delay, timeout, typed, stable),
+        )
 
     else:
         return {"error": "Invalid query parameter"}
 
 
 @router.get("/events")
-@limiter.limit("600/minute")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(1))
 async def VLR_events(
     request: Request,
+    response: Response,
     q: str = Query(
         None, 
         description="Event type filter",
@@ -151,13 +670,258 @@ async def VLR_events(
     Returns event details including title, status, prize pool, dates, region, thumbnail, and event URL.
     """
     if q == "upcoming":
-        return vlr.vlr_events(upcoming=True, completed=False, page=page)
+        upcoming, completed = True, False
     elif q == "completed":
-        return vlr.vlr_events(upcoming=False, completed=True, page=page)
+        upcoming, completed = False, True
     else:
-        return vlr.vlr_events(upcoming=True, completed=True, page=page)
+        upcoming, completed = True, True
+    return await cached_json(
+        request,
+        ("events", upcoming, completed, page),
+        lambda: vlr.vlr_events(upcoming=upcoming, completed=completed, page=page),
+    )
+
+
+@router.get("/events/crawl")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(_events_crawl_fetches))
+async def VLR_events_crawl(
+    request: Request,
+    response: Response,
+    from_page: int = Query(1, description="First page of completed events", ge=1, le=100),
+    to_page: int = Query(..., description="Last page of completed events (inclusive)", ge=1, le=100),
+):
+    """
+    Get completed events for a range of pages in one call.
+
+    Uncached pages are fetched concurrently. Completed-event pages are cached
+    for hours since past events rarely change; each event carries the
+    page_number it came from.
+
+    Example: /events/crawl?from_page=1&to_page=10
+    """
+    try:
+        return await cached_json(
+            request,
+            ("events", "crawl", from_page, to_page),
+            lambda: vlr.vlr_events_crawl(from_page, to_page),
+        )
+    except ValueError as e:
+        return {"error": str(e)}
+
+
+@router.get("/events/catalog")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(_events_catalog_fetches))
+async def VLR_events_catalog(
+    request: Request,
+    response: Response,
+    max_pages: int = Query(100, description="Maximum completed pages to crawl", ge=1, le=100),
+):
+    """
+    Get the full event catalog: upcoming plus all completed events, deduplicated by event URL.
+
+    Built from the per-page events cache, so only pages that are not cached
+    yet are fetched from vlr.gg.
+    """
+    return await cached_json(
+        request,
+        ("events", "catalog", max_pages),
+        lambda: vlr.vlr_events_catalog(max_pages),
+    )
+
+
+@router.get("/export/{dataset}")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(_export_fetches))
+async def VLR_export(
+    request: Request,
+    response: Response,
+    dataset: str,
+    format: str = Query("csv", description="csv, arrow (Arrow IPC stream) or parquet"),
+    from_page: int = Query(1, description="First results/events page", ge=1, le=600),
+    to_page: int = Query(None, description="Last results/events page (inclusive)", ge=1, le=600),
+    regions: str = Query(None, description="Comma-separated regions (stats, rankings; default all)"),
+    timespans: str = Query(None, description="Comma-separated stats timespans (default all)"),
+    request_delay: float = Query(1.0, description="Delay between results pages in seconds", ge=0.5, le=5.0),
+):
+    """
+    Export a dataset as a typed columnar file, streamed batch by batch.
+
+    datasets:\n
+        "results": match results (to_page defaults to from_page),\n
+        "stats": one stats table per region/timespan pair,\n
+        "rankings": rankings of every requested region,\n
+        "events": upcoming and completed events (without to_page, crawled until an empty page)\n
+
+    Each results/events page, stats table or rankings region is written as
+    one CSV chunk, Arrow record batch or Parquet row group, so memory stays
+    bounded. Arrow and Parquet need pyarrow installed on the server.
+
+    Examples:
+    - /export/results?from_page=1&to_page=20&format=parquet
+    - /export/stats?regions=na,eu&timespans=30&format=arrow
+    - /export/rankings
+    """
+    if format not in EXPORT_FORMATS:
+        return {"error": "Unknown format: {} (use {})".format(format, ", ".join(EXPORT_FORMATS))}
+    try:
+        chunks = vlr.export(
+            dataset,
+            format,
+            from_page=from_page,
+            to_page=to_page,
+            regions=_split(regions),
+            timespans=_split(timespans),
+            request_delay=request_delay,
+        )
+    except ValueError as e:
+        return {"error": str(e)}
+
+    media_type, extension = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        await stream_admitted(request, lane_for(request), chunks),
+        media_type=media_type,
+        headers={"Content-Disposition": 'attachment; filename="{}{}"'.format(dataset, extension)},
+    )
+
+
+@router.get("/teams/search")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(0))
+async def VLR_teams_search(
+    request: Request,
+    response: Response,
+    q: str = Query(..., description="Name prefix (case, accents and punctuation are ignored)"),
+    limit: int = Query(20, description="Maximum matches", ge=1, le=50),
+):
+    """
+    Search teams seen in scraped results and rankings by name prefix.
+
+    Any word of the name matches, so "liq" finds "Team Liquid". Answered
+    from the in-memory entity index; teams appear once a /match?q=results or
+    /rankings scrape has included them.
+    """
+    return {"data": {"status": 200, "segments": vlr.search_teams(q, limit)}}
+
+
+@router.get("/teams")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(0))
+async def VLR_team(
+    request: Request,
+    response: Response,
+    name: str = Query(..., description="Team name"),
+    limit: int = Query(None, description="Maximum results returned", ge=1),
+):
+    """
+    Get a team's indexed results (newest first) and ranking rows per region.
+
+    Never triggers a scrape: only results and rankings already scraped by
+    this instance are returned.
+    """
+    team = vlr.team(name, limit)
+    if team is None:
+        return {"error": "Unknown team: {}".format(name)}
+    return {"data": {"status": 200, "segments": [team]}}
+
+
+@router.get("/teams/form")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(0))
+async def VLR_team_form(
+    request: Request,
+    response: Response,
+    name: str = Query(..., description="Team name"),
+    window: int = Query(10, description="Last N series (5, 10 or 20)"),
+):
+    """
+    Get a team's rolling form: wins, losses, win rate and map differential
+    over its last N series, plus the same tallies over all indexed series.
+
+    Maintained incrementally as results are scraped, so this is a lookup
+    that never triggers a scrape.
+    """
+    try:
+        form = vlr.team_form(name, window)
+    except ValueError as e:
+        return {"error": str(e)}
+    if form is None:
+        return {"error": "Unknown team: {}".format(name)}
+    return {"data": {"status": 200, "segments": [form]}}
+
+
+@router.get("/teams/h2h")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(0))
+async def VLR_head_to_head(
+    request: Request,
+    response: Response,
+    team1: str = Query(..., description="Team name"),
+    team2: str = Query(..., description="Opponent name"),
+    limit: int = Query(20, description="Maximum meetings returned", ge=0, le=30),
+):
+    """
+    Get the head-to-head record of two teams from team1's side, with their
+    newest meetings.
+
+    Answered from the head-to-head table kept up to date as results are
+    scraped; never triggers a scrape.
+    """
+    record = vlr.head_to_head(team1, team2, limit)
+    if record is None:
+        return {"error": "Unknown team(s): {}, {}".format(team1, team2)}
+    return {"data": {"status": 200, "segments": [record]}}
+
+
+@router.get("/players/search")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(0))
+async def VLR_players_search(
+    request: Request,
+    response: Response,
+    q: str = Query(..., description="Name prefix (case, accents and punctuation are ignored)"),
+    limit: int = Query(20, description="Maximum matches", ge=1, le=50),
+):
+    """Search players seen in scraped /stats tables by name prefix."""
+    return {"data": {"status": 200, "segments": vlr.search_players(q, limit)}}
+
+
+@router.get("/players")
+@limiter.shared_limit(RATE_LIMIT, scope="vlr", cost=upstream_cost(0))
+async def VLR_player(request: Request, response: Response, name: str = Query(..., description="Player name")):
+    """
+    Get a player's stats rows from every stats table scraped so far.
+
+    Rows are keyed by table, e.g. "na/60" or "eu/all?map_id=1", so one call
+    covers every region and filter already loaded through /stats.
+    """
+    player = vlr.player(name)
+    if player is None:
+        return {"error": "Unknown player: {}".format(name)}
+    return {"data": {"status": 200, "segments": [player]}}
 
 
 @router.get("/health")
 def health():
+    """
+    Last-known health of the API deployment and vlr.gg.
+
+    Probes run concurrently on a background thread, so this endpoint never
+    waits on the network. Each site reports its last status, the age of the
+    check and rolling latency percentiles. Sites report "Unknown" until the
+    first probe round completes.
+    """
     return vlr.check_health()
+
+
+@router.get("/health/load")
+def load():
+    """
+    Admission control state per priority lane.
+
+    Cache hits, live scores and in-memory lookups use the high lane, which is
+    always admitted. Other uncached requests share a limited number of normal
+    slots; requests expected to fetch many vlr.gg pages (page ranges, stats
+    batches, crawls) get a few bulk slots. When a lane's queue is full, or a
+    queued request waits too long, the request gets 503 with Retry-After.
+    """
+    return admission_snapshot()
+
+
+@router.get("/health/live")
+def liveness():
+    """Liveness probe: answers without any outbound I/O."""
+    return {"status": "ok"}
@@ -0,0 +1,139 @@
+import random
+import unittest
+
+from api import team_form as tf
+from api.team_form import FORM_WINDOWS, MAX_H2H_SERIES, MAX_TEAM_SERIES, TeamForm
+
+TEAMS = ["Sentinels", "G2 Esports", "FNATIC", "Team Liquid", "NRG", "Leviatán"]
+SCORES = [(2, 0), (2, 1), (1, 2), (0, 2), (1, 1), (3, 2), (0, 3)]
+
+
+def make_results(count, seed):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        team1, team2 = rng.sample(TEAMS, 2)
+        score1, score2 = rng.choice(SCORES)
+        rows.append(
+            {
+                "team1": team1,
+                "team2": team2,
+                # String scores, as in untyped /match?q=results rows
+                "score1": str(score1),
+                "score2": str(score2),
+                "match_page": "/{}/match".format(i),
+                # Coarse times, so many results tie on completed_at
+                "completed_at": 1_700_000_000 + (i // 3) * 60,
+                "round_info": "Playoffs-Final",
+                "tournament_name": "Event {}".format(i % 4),
+            }
+        )
+    return rows
+
+
+def feed_shuffled(form, rows, seed):
+    """Feed rows in random batches, re-sending part of each batch; returns first-fed order."""
+    rng = random.Random(seed)
+    rows = list(rows)
+    rng.shuffle(rows)
+    fed = []
+    for start in range(0, len(rows), 40):
+        batch = rows[start:start + 40]
+        form.add_results(batch)
+        fed.extend(batch)
+        form.add_results(rng.sample(fed, min(15, len(fed))))
+    return {row["match_page"]: i for i, row in enumerate(fed)}
+
+
+def recount(rows, first_fed, team, limit, opponent=None):
+    """Brute-force tallies of ``team``'s newest ``limit`` series (optionally against one opponent)."""
+    matches = [
+        row for row in rows
+        if team in (row["team1"], row["team2"])
+        and (opponent is None or opponent in (row["team1"], row["team2"]))
+    ]
+    matches.sort(key=lambda row: (-row["completed_at"], first_fed[row["match_page"]]))
+    tally = dict.fromkeys(("series", "wins", "losses", "draws", "maps_won", "maps_lost"), 0)
+    for row in matches[:limit]:
+        score, other = int(row["score1"]), int(row["score2"])
+        if row["team1"] != team:
+            score, other = other, score
+        tally["series"] += 1
+        tally["wins" if score > other else "losses" if score < other else "draws"] += 1
+        tally["maps_won"] += score
+        tally["maps_lost"] += other
+    return tally, [row["match_page"] for row in matches[:limit]]
+
+
+def tallies(summary):
+    return {key: summary[key] for key in ("series", "wins", "losses", "draws", "maps_won", "maps_lost")}
+
+
+class TeamFormTest(unittest.TestCase):
+    def setUp(self):
+        # Far more series per team and pair than are tracked
+        self.rows = make_results(1500, seed=1)
+        self.form = TeamForm()
+        self.first_fed = feed_shuffled(self.form, self.rows, seed=2)
+
+    def test_windows_match_recount(self):
+        for team in TEAMS:
+            for window in FORM_WINDOWS:
+                result = self.form.form(team.upper(), window)
+                expected, pages = recount(self.rows, self.first_fed, team, window)
+                self.assertEqual(tallies(result["form"]), expected, (team, window))
+                self.assertEqual([r["match_page"] for r in result["results"]], pages)
+            overall, _ = recount(self.rows, self.first_fed, team, MAX_TEAM_SERIES)
+            self.assertEqual(tallies(self.form.form(team)["overall"]), overall, team)
+
+    def test_head_to_head_matches_recount(self):
+        for team1 in TEAMS:
+            for team2 in TEAMS:
+                if team1 == team2:
+                    continue
+                record = self.form.head_to_head(team1, team2, MAX_H2H_SERIES)
+                expected, pages = recount(self.rows, self.first_fed, team1, MAX_H2H_SERIES, team2)
+                self.assertEqual(record["series"], expected["series"])
+                self.assertEqual(record["team1_wins"], expected["wins"])
+                self.assertEqual(record["team2_wins"], expected["losses"])
+                self.assertEqual(record["draws"], expected["draws"])
+                self.assertEqual(record["team1_maps"], expected["maps_won"])
+                self.assertEqual(record["team2_maps"], expected["maps_lost"])
+                self.assertEqual([m["match_page"] for m in record["meetings"]], pages)
+
+    def test_rescraping_changes_nothing(self):
+        before = {team: self.form.form(team, 20) for team in TEAMS}
+        self.assertEqual(self.form.add_results(self.rows), 0)
+        self.assertEqual({team: self.form.form(team, 20) for team in TEAMS}, before)
+
+    def test_memory_is_bounded(self):
+        counts = self.form.counts()
+        self.assertLessEqual(counts["team_series"], len(TEAMS) * MAX_TEAM_SERIES)
+        self.assertLessEqual(counts["pair_series"], counts["pairs"] * MAX_H2H_SERIES)
+
+    def test_least_recently_updated_teams_are_dropped(self):
+        original = tf.MAX_FORM_TEAMS
+        tf.MAX_FORM_TEAMS = 2
+        try:
+            form = TeamForm()
+        finally:
+            tf.MAX_FORM_TEAMS = original
+        form.add_results([dict(self.rows[0], team1="A", team2="B", match_page="/a")])
+        form.add_results([dict(self.rows[0], team1="C", team2="D", match_page="/c")])
+        self.assertEqual(form.counts()["teams"], 2)
+        self.assertIsNone(form.form("A"))
+        self.assertIsNotNone(form.form("D"))
+
+    def test_rows_without_scores_are_skipped(self):
+        form = TeamForm()
+        row = dict(self.rows[0], score1="–", score2="–")
+        self.assertEqual(form.add_results([row]), 0)
+        self.assertIsNone(form.form(row["team1"]))
+
+    def test_unsupported_window(self):
+        with self.assertRaises(ValueError):
+            self.form.form("NRG", 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
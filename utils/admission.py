@@ -0,0 +1,220 @@
+import asyncio
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
+
+from utils import deadline
+
+# Concurrent uncached requests per lane; the high lane is never limited
+NORMAL_SLOTS = int(os.environ.get("VLR_ADMISSION_SLOTS", 8))
+BULK_SLOTS = int(os.environ.get("VLR_ADMISSION_BULK_SLOTS", 2))
+# Requests allowed to wait for a slot before new ones are shed
+NORMAL_QUEUE = int(os.environ.get("VLR_ADMISSION_QUEUE", 32))
+BULK_QUEUE = int(os.environ.get("VLR_ADMISSION_BULK_QUEUE", 4))
+# Seconds a queued request waits for a slot before it is shed
+ADMISSION_WAIT = float(os.environ.get("VLR_ADMISSION_WAIT", 10))
+# Requests expected to fetch more vlr.gg pages than this go to the bulk lane
+BULK_FETCHES = 3
+# How often running work checks whether its client has gone away
+DISCONNECT_POLL_SECONDS = 0.5
+
+HIGH = "high"
+NORMAL = "normal"
+BULK = "bulk"
+
+
+class Overloaded(Exception):
+    """Raised when a lane is saturated; answered with 503 and Retry-After."""
+
+    def __init__(self, lane, retry_after):
+        super().__init__("Server busy ({} lane), retry in {}s".format(lane, retry_after))
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+class Lane:
+    """
+    A bounded pool of slots for uncached work with a bounded wait queue.
+
+    slots=None means the lane is always admitted (in-flight work is still
+    counted). Durations of finished work feed a moving average used to
+    estimate Retry-After.
+    """
+
+    def __init__(self, name, slots=None, max_queue=0):
+        self.name = name
+        self.slots = slots
+        self.max_queue = max_queue
+        self.inflight = 0
+        self.waiting = 0
+        self.shed = 0
+        self.avg_seconds = 1.0
+        self._semaphore = None
+        self._loop = None
+
+    def _get_semaphore(self):
+        # Semaphores bind to the running loop, so one is kept per loop
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.slots)
+        return self._semaphore
+
+    def retry_after(self):
+        slots = self.slots or 1
+        return max(1, math.ceil(self.avg_seconds * (self.waiting + 1) / slots))
+
+    def _reject(self):
+        self.shed += 1
+        return Overloaded(self.name, self.retry_after())
+
+    @asynccontextmanager
+    async def admit(self):
+        semaphore = None
+        if self.slots is not None:
+            semaphore = self._get_semaphore()
+            if self.inflight + self.waiting >= self.slots + self.max_queue:
+                raise self._reject()
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(semaphore.acquire(), ADMISSION_WAIT)
+            except asyncio.TimeoutError:
+                raise self._reject()
+            finally:
+                self.waiting -= 1
+
+        self.inflight += 1
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.inflight -= 1
+            self.avg_seconds = 0.8 * self.avg_seconds + 0.2 * (time.monotonic() - start)
+            if semaphore is not None:
+                semaphore.release()
+
+    def snapshot(self):
+        return {
+            "slots": self.slots,
+            "inflight": self.inflight,
+            "waiting": self.waiting,
+            "max_queue": self.max_queue if self.slots is not None else None,
+            "shed": self.shed,
+            "avg_seconds": round(self.avg_seconds, 3),
+        }
+
+
+lanes = {
+    HIGH: Lane(HIGH),
+    NORMAL: Lane(NORMAL, NORMAL_SLOTS, NORMAL_QUEUE),
+    BULK: Lane(BULK, BULK_SLOTS, BULK_QUEUE),
+}
+
+
+def lane_for(request, key=None):
+    """
+    Pick the lane for a request that cannot be served from cache.
+
+    Live scores and requests that need no upstream fetch are high priority;
+    otherwise the upstream estimate recorded by the rate limiter decides
+    between the normal and bulk lanes.
+    """
+    if key is not None and key[0] == "live_score":
+        return HIGH
+    fetches = getattr(request.state, "upstream_fetches", 1)
+    if fetches <= 0:
+        return HIGH
+    return BULK if fetches > BULK_FETCHES else NORMAL
+
+
+def request_deadline(request):
+    """The request's Deadline, created on first use and shared by all its work."""
+    current = getattr(request.state, "deadline", None)
+    if current is None:
+        current = request.state.deadline = deadline.request_deadline(request)
+    return current
+
+
+async def run_admitted(request, lane, func, *args):
+    """
+    Run blocking ``func(*args)`` in the threadpool once ``lane`` admits it.
+
+    The work runs under the request's deadline (see utils/deadline.py). While
+    it runs, the client connection is polled; a disconnect cancels the
+    deadline, so scraper loops and fetches stop at their next check.
+    """
+    current = request_deadline(request)
+    token = deadline.set_current(current)
+    try:
+        async with lanes[lane].admit():
+            current.check()
+            # The task (and the worker thread) inherit the context holding the deadline
+            task = asyncio.ensure_future(run_in_threadpool(func, *args))
+            try:
+                while True:
+                    done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+                    if done:
+                        return task.result()
+                    if await request.is_disconnected():
+                        current.cancel()
+            except asyncio.CancelledError:
+                current.cancel()
+                raise
+    finally:
+        deadline.reset_current(token)
+
+
+def _next_chunk(current, chunks):
+    token = deadline.set_current(current)
+    try:
+        return next(chunks, None)
+    finally:
+        deadline.reset_current(token)
+
+
+async def stream_admitted(request, lane, chunks):
+    """
+    Stream a blocking iterator of bytes chunks under the request's deadline.
+
+    The first chunk is produced through run_admitted, so overload, upstream
+    errors and timeouts before any byte is sent still get a proper status.
+    The remaining chunks are pulled one at a time in the threadpool; when the
+    client goes away the stream is cancelled, which cancels the deadline so
+    the producer stops at its next check.
+
+    Returns:
+        async iterator: The chunks, for a StreamingResponse
+    """
+    current = request_deadline(request)
+    first = await run_admitted(request, lane, _next_chunk, current, chunks)
+
+    async def body():
+        try:
+            if first is not None:
+                yield first
+            while True:
+                chunk = await run_in_threadpool(_next_chunk, current, chunks)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            current.cancel()
+            chunks.close()
+
+    return body()
+
+
+def snapshot():
+    return {name: lane.snapshot() for name, lane in lanes.items()}
+
+
+def overloaded_handler(request, exc):
+    return ORJSONResponse(
+        {"error": str(exc)},
+        status_code=503,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import defaultdict, deque
+
+from utils.fetch import DEFAULT_TIMEOUT, FetchResponse, ReplayMissError
+
+# Directory of the raw HTML archive; archiving is off when unset
+ARCHIVE_DIR = os.environ.get("VLR_ARCHIVE_DIR", "")
+COMPRESS_LEVEL = 6
+
+
+class HtmlArchive:
+    """
+    Content-addressed store of raw upstream pages.
+
+    Each distinct body is zlib-compressed once into objects/<2 hex>/<sha256>.z,
+    so a page fetched many times unchanged costs one object. index.jsonl is an
+    append-only log with one entry per fetch (url, fetched_at, status_code,
+    sha256, size).
+    """
+
+    def __init__(self, directory=ARCHIVE_DIR):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.jsonl")
+        self._lock = threading.Lock()
+        self._entries = None
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+
+    def object_path(self, digest):
+        return os.path.join(self.directory, "objects", digest[:2], digest + ".z")
+
+    def _load_index(self):
+        entries = []
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                entries = [json.loads(line) for line in f if line.strip()]
+        return entries
+
+    def entries(self, url_prefix=None, since=None, until=None):
+        """
+        Index entries in fetch order, optionally filtered.
+
+        Args:
+            url_prefix (str, optional): Only URLs starting with this
+            since (float, optional): Only fetches at or after this epoch time
+            until (float, optional): Only fetches before this epoch time
+        """
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load_index()
+            entries = list(self._entries)
+        return [
+            entry
+            for entry in entries
+            if (url_prefix is None or entry["url"].startswith(url_prefix))
+            and (since is None or entry["fetched_at"] >= since)
+            and (until is None or entry["fetched_at"] < until)
+        ]
+
+    def put(self, url, status_code, body, fetched_at=None):
+        """Store one fetched page and return its sha256 digest."""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = "{}.{}.tmp".format(path, threading.get_ident())
+            with open(tmp, "wb") as f:
+                f.write(zlib.compress(body, COMPRESS_LEVEL))
+            os.replace(tmp, path)
+
+        entry = {
+            "url": url,
+            "fetched_at": fetched_at if fetched_at is not None else time.time(),
+            "status_code": status_code,
+            "sha256": digest,
+            "size": len(body),
+        }
+        with self._lock:
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            if self._entries is not None:
+                self._entries.append(entry)
+        return digest
+
+    def read(self, digest):
+        """Raw page bytes for ``digest``."""
+        with open(self.object_path(digest), "rb") as f:
+            return zlib.decompress(f.read())
+
+
+class ArchiveBackend:
+    """Fetch backend wrapper that archives every response ``inner`` returns."""
+
+    def __init__(self, inner, archive):
+        self.inner = inner
+        self.archive = archive
+
+    def fetch(self, url, timeout=DEFAULT_TIMEOUT):
+        fetched_at = time.time()
+        resp = self.inner.fetch(url, timeout)
+        try:
+            self.archive.put(url, resp.status_code, resp.text, fetched_at)
+        except OSError as e:
+            print(f"Warning: failed to archive {url}: {e}")
+        return resp
+
+
+class ArchiveReplayBackend:
+    """
+    Fetch backend serving pages from an archive instead of the network.
+
+    Like the JSONL replay backend, each URL returns its archived fetches in
+    order and then repeats the last one, so whole scrapers (not only their
+    parse functions) can be re-run over history.
+    """
+
+    def __init__(self, archive, since=None, until=None):
+        self.archive = archive
+        self._queues = defaultdict(deque)
+        self._lock = threading.Lock()
+        for entry in archive.entries(since=since, until=until):
+            self._queues[entry["url"]].append(entry)
+
+    def fetch(self, url, timeout=DEFAULT_TIMEOUT):
+        with self._lock:
+            queue = self._queues.get(url)
+            if not queue:
+                raise ReplayMissError("No archived response for {}".format(url))
+            entry = queue.popleft() if len(queue) > 1 else queue[0]
+        body = self.archive.read(entry["sha256"]).decode("utf-8")
+        return FetchResponse(url, entry["status_code"], body)
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_archive():
+    """The archive under VLR_ARCHIVE_DIR, or None when archiving is off."""
+    global _archive
+    if not ARCHIVE_DIR:
+        return None
+    if _archive is None:
+        with _archive_lock:
+            if _archive is None:
+                _archive = HtmlArchive(ARCHIVE_DIR)
+    return _archive
@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+# Default time-to-live (seconds) for each kind of scraped payload
+CACHE_TTL = {
+    "news": 300,
+    "stats": 1800,
+    "rankings": 1800,
+    "upcoming": 60,
+    "live_score": 15,
+    # One /matches listing page, shared by upcoming and live_score
+    "matches": 30,
+    "results": 300,
+    "events": 600,
+    "events_upcoming": 300,
+    "events_completed": 6 * 3600,
+}
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a per-entry TTL.
+
+    Args:
+        maxsize (int): Maximum number of entries kept before evicting the least recently used
+        default_ttl (float): TTL in seconds used when ``set`` is called without one
+    """
+
+    def __init__(self, maxsize=256, default_ttl=60):
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key, producer, ttl=None):
+        """Return the cached value for ``key``, calling ``producer()`` to fill it on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = producer()
+            self.set(key, value, ttl)
+        return value
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+# Encoded response bodies, keyed by endpoint name plus its arguments
+response_cache = TTLCache(maxsize=512)
+# Parsed scraper payloads shared between endpoints (e.g. per-region rankings)
+data_cache = TTLCache(maxsize=512)
@@ -0,0 +1,210 @@
+import csv
+import io
+import re
+from datetime import date, datetime, timezone
+
+# Export format -> (media type, file extension). Arrow is the IPC stream format.
+FORMATS = {
+    "csv": ("text/csv; charset=utf-8", ".csv"),
+    "arrow": ("application/vnd.apache.arrow.stream", ".arrows"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+}
+# Separator of list values (agents) in CSV cells
+CSV_LIST_SEPARATOR = ";"
+
+NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+def _pyarrow():
+    """
+    Import pyarrow on first use.
+
+    It is optional (only the arrow and parquet formats need it) and slow to
+    import, so it never loads at startup.
+    """
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("The arrow and parquet formats need pyarrow (pip3 install pyarrow)")
+    return pyarrow
+
+
+def _number(value):
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    match = NUMBER_RE.search(str(value).replace(",", ""))
+    return match.group() if match else None
+
+
+def to_int(value):
+    """Integer from a cell such as 13, "13", "$1,250" or "72%" (None when there is none)."""
+    number = _number(value)
+    return int(float(number)) if number is not None else None
+
+
+def to_float(value):
+    number = _number(value)
+    return float(number) if number is not None else None
+
+
+def to_str(value):
+    return None if value is None else str(value)
+
+
+def to_list(value):
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        return [str(v) for v in value]
+    return [v for v in str(value).split(CSV_LIST_SEPARATOR) if v]
+
+
+def to_timestamp(value):
+    """UTC datetime from epoch seconds (or None)."""
+    number = to_int(value)
+    return datetime.fromtimestamp(number, tz=timezone.utc) if number is not None else None
+
+
+def to_date(value):
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)) if value else None
+    except ValueError:
+        return None
+
+
+# Column type -> converter from scraped values
+CONVERTERS = {
+    "int": to_int,
+    "float": to_float,
+    "str": to_str,
+    "list": to_list,
+    "timestamp": to_timestamp,
+    "date": to_date,
+}
+
+
+def _arrow_type(pa, kind):
+    return {
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "str": pa.string(),
+        "list": pa.list_(pa.string()),
+        "timestamp": pa.timestamp("s", tz="UTC"),
+        "date": pa.date32(),
+    }[kind]
+
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return CSV_LIST_SEPARATOR.join(value)
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def typed_columns(schema, rows):
+    """Convert a batch of row dicts into {column: [typed values]} following ``schema``."""
+    return {
+        name: [CONVERTERS[kind](row.get(name)) for row in rows]
+        for name, kind in schema
+    }
+
+
+def csv_chunks(schema, batches):
+    """Encoded CSV, one chunk per batch of rows (the header comes with the first)."""
+    names = [name for name, _ in schema]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    for rows in batches:
+        columns = typed_columns(schema, rows)
+        for i in range(len(rows)):
+            writer.writerow([_csv_cell(columns[name][i]) for name in names])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # No batches at all: just the header
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _Sink(io.RawIOBase):
+    """Write-only file whose contents are handed out (and dropped) with drain()."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def arrow_chunks(schema, batches, fmt="arrow"):
+    """
+    Arrow IPC stream or Parquet bytes, one record batch / row group per batch.
+
+    Only the current batch is held in memory; its bytes are yielded as soon
+    as it is written. Parquet's footer comes with the last chunk.
+    """
+    pa = _pyarrow()
+    arrow_schema = pa.schema([(name, _arrow_type(pa, kind)) for name, kind in schema])
+    sink = _Sink()
+    if fmt == "parquet":
+        writer = pa.parquet.ParquetWriter(sink, arrow_schema, compression="zstd")
+        write = lambda batch: writer.write_table(pa.Table.from_batches([batch]))
+    else:
+        writer = pa.ipc.new_stream(sink, arrow_schema)
+        write = writer.write_batch
+    try:
+        for rows in batches:
+            if not rows:
+                continue
+            write(pa.RecordBatch.from_pydict(typed_columns(schema, rows), schema=arrow_schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_chunks(schema, batches, fmt):
+    """
+    Serialize batches of row dicts in an export format.
+
+    Args:
+        schema (list): (column, type) pairs; types are the keys of CONVERTERS
+        batches (iterable): Lists of row dicts, each written as one chunk / row group
+        fmt (str): A key of FORMATS
+
+    Returns:
+        iterator: bytes chunks of the encoded file
+    """
+    if fmt not in FORMATS:
+        raise ValueError("Unknown format: {} (use {})".format(fmt, ", ".join(FORMATS)))
+    if fmt == "csv":
+        return csv_chunks(schema, batches)
+    _pyarrow()
+    return arrow_chunks(schema, batches, fmt)
@@ -0,0 +1,131 @@
+import gzip
+import os
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = int(os.environ.get("VLR_MIN_COMPRESS_SIZE", 1024))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript")
+
+
+def available_encodings():
+    """Encodings this process can produce, in order of preference."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError("Unsupported encoding: {}".format(encoding))
+
+
+def negotiate(accept_encoding):
+    """
+    Pick the best encoding we support from an Accept-Encoding header.
+
+    Args:
+        accept_encoding (str): Raw header value, e.g. "gzip, deflate, br;q=0.9"
+
+    Returns:
+        str or None: "br", "gzip", or None for identity
+    """
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in available_encodings():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type):
+    return any(content_type.startswith(t) for t in COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing single-message responses above MIN_COMPRESS_SIZE.
+
+    Responses that already carry a Content-Encoding (e.g. precompressed cache
+    hits) and streaming responses are passed through untouched.
+    """
+
+    def __init__(self, app, minimum_size=MIN_COMPRESS_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                encoding = negotiate(value.decode("latin-1"))
+                break
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = {k.lower(): v for k, v in start["headers"]}
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or b"content-encoding" in headers
+                or len(body) < self.minimum_size
+                or not is_compressible(headers.get(b"content-type", b"").decode("latin-1"))
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            body = compress(body, encoding)
+            raw_headers = [
+                (k, v) for k, v in start["headers"] if k.lower() != b"content-length"
+            ]
+            raw_headers += [
+                (b"content-encoding", encoding.encode("latin-1")),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"vary", b"Accept-Encoding"),
+            ]
+            await send({**start, "headers": raw_headers})
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,115 @@
+import contextvars
+import os
+import threading
+import time
+
+from fastapi.responses import ORJSONResponse
+
+# Longest a request may run; clients can ask for less with REQUEST_TIMEOUT_HEADER
+MAX_REQUEST_SECONDS = float(os.environ.get("VLR_MAX_REQUEST_SECONDS", 300))
+REQUEST_TIMEOUT_HEADER = "x-request-timeout"
+
+
+class RequestAborted(Exception):
+    """Base for work stopped because nobody is waiting for its result any more."""
+
+    status_code = 504
+
+
+class DeadlineExceeded(RequestAborted):
+    status_code = 504
+
+
+class ClientDisconnected(RequestAborted):
+    # nginx's "client closed request"; the client never sees it
+    status_code = 499
+
+
+class Deadline:
+    """
+    Time budget and cancellation flag of one request.
+
+    It lives in a context variable, so it follows the request into threadpool
+    workers and fan_out jobs, and scraper loops and fetches check it between
+    pages.
+    """
+
+    def __init__(self, seconds):
+        self.expires_at = time.monotonic() + seconds
+        self._cancelled = threading.Event()
+
+    def remaining(self):
+        return self.expires_at - time.monotonic()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def check(self):
+        if self._cancelled.is_set():
+            raise ClientDisconnected("Client disconnected")
+        if self.remaining() <= 0:
+            raise DeadlineExceeded("Request deadline exceeded")
+
+    def sleep(self, seconds):
+        """Sleep, waking early (and raising) if the request is cancelled or runs out of time."""
+        self.check()
+        self._cancelled.wait(min(seconds, max(0, self.remaining())))
+        self.check()
+
+
+_current = contextvars.ContextVar("vlr_deadline", default=None)
+
+
+def request_deadline(request):
+    """Deadline from the client's X-Request-Timeout header, capped at MAX_REQUEST_SECONDS."""
+    seconds = MAX_REQUEST_SECONDS
+    try:
+        seconds = min(seconds, float(request.headers[REQUEST_TIMEOUT_HEADER]))
+    except (KeyError, ValueError):
+        pass
+    return Deadline(max(0, seconds))
+
+
+def current():
+    return _current.get()
+
+
+def set_current(deadline):
+    """Make ``deadline`` the current one; returns a token for reset_current."""
+    return _current.set(deadline)
+
+
+def reset_current(token):
+    _current.reset(token)
+
+
+def check():
+    """Raise if the current request was cancelled or is out of time (no-op outside requests)."""
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check()
+
+
+def sleep(seconds):
+    """time.sleep that stops early when the current request is aborted."""
+    deadline = _current.get()
+    if deadline is None:
+        time.sleep(seconds)
+    else:
+        deadline.sleep(seconds)
+
+
+def clamp_timeout(timeout):
+    """Shorten a network timeout so it ends no later than the current deadline."""
+    deadline = _current.get()
+    if deadline is None:
+        return timeout
+    return max(0.1, min(timeout, deadline.remaining()))
+
+
+def aborted_handler(request, exc):
+    return ORJSONResponse({"error": str(exc)}, status_code=exc.status_code)
@@ -0,0 +1,213 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils import deadline
+from utils.upstream import UPSTREAM_CONCURRENCY
+from utils.utils import headers
+
+# Transport used for vlr.gg: "session" (pooled HTTP/1.1 keep-alive), "http2"
+# (needs httpx[http2]), "record" (session, saving every response) or "replay"
+# (serve recorded responses, no network) or "archive" (serve pages from the
+# raw HTML archive, no network)
+FETCH_BACKEND = os.environ.get("VLR_FETCH_BACKEND", "session")
+# Directory holding record/replay logs
+FETCH_RECORD_DIR = os.environ.get("VLR_FETCH_RECORD_DIR", "recordings")
+DEFAULT_TIMEOUT = 30
+
+
+class FetchResponse:
+    """The parts of an upstream response the scrapers use."""
+
+    __slots__ = ("url", "status_code", "text")
+
+    def __init__(self, url, status_code, text):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+
+
+class ReplayMissError(LookupError):
+    """Raised in replay mode for a URL that was never recorded."""
+
+
+class SessionBackend:
+    """One requests.Session shared by all threads, keeping connections to vlr.gg alive."""
+
+    def __init__(self, pool_size=UPSTREAM_CONCURRENCY * 2):
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def fetch(self, url, timeout=DEFAULT_TIMEOUT):
+        resp = self.session.get(url, timeout=timeout)
+        return FetchResponse(resp.url, resp.status_code, resp.text)
+
+
+class Http2Backend:
+    """
+    Multiplexes requests over HTTP/2 with httpx.
+
+    Transport errors are re-raised as their requests equivalents, so callers
+    handle one set of exceptions whatever the backend.
+    """
+
+    def __init__(self):
+        try:
+            import httpx
+
+            self.client = httpx.Client(http2=True, headers=headers, follow_redirects=True)
+        except ImportError:
+            raise RuntimeError("The http2 fetch backend needs httpx[http2] installed")
+        self._httpx = httpx
+
+    def fetch(self, url, timeout=DEFAULT_TIMEOUT):
+        httpx = self._httpx
+        try:
+            resp = self.client.get(url, timeout=timeout)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e))
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e))
+        return FetchResponse(str(resp.url), resp.status_code, resp.text)
+
+
+class RecordBackend:
+    """
+    Fetches through ``inner`` and appends every response to a JSON lines log.
+
+    Logs are split per UTC day (fetch-YYYY-MM-DD.jsonl) and hold the URL,
+    fetch time, latency, status and body of each response, in fetch order.
+    """
+
+    def __init__(self, inner, directory=FETCH_RECORD_DIR):
+        self.inner = inner
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def fetch(self, url, timeout=DEFAULT_TIMEOUT):
+        start = time.time()
+        resp = self.inner.fetch(url, timeout)
+        record = {
+            "url": url,
+            "fetched_at": start,
+            "elapsed_ms": round((time.time() - start) * 1000, 1),
+            "status_code": resp.status_code,
+            "text": resp.text,
+        }
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        path = os.path.join(
+            self.directory, "fetch-{}.jsonl".format(time.strftime("%Y-%m-%d", time.gmtime(start)))
+        )
+        with self._lock:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+        return resp
+
+
+class ReplayBackend:
+    """
+    Serves responses from record logs instead of the network.
+
+    Each URL replays its recorded responses in order, then keeps returning the
+    last one, so a replayed run is deterministic and runs as fast as parsing
+    allows. Unrecorded URLs raise ReplayMissError.
+    """
+
+    def __init__(self, paths=None, directory=FETCH_RECORD_DIR):
+        if paths is None:
+            paths = sorted(
+                os.path.join(directory, name)
+                for name in os.listdir(directory)
+                if name.startswith("fetch-") and name.endswith(".jsonl")
+            )
+        self._responses = defaultdict(deque)
+        self._lock = threading.Lock()
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self._responses[record["url"]].append(
+                            FetchResponse(record["url"], record["status_code"], record["text"])
+                        )
+
+    def fetch(self, url, timeout=DEFAULT_TIMEOUT):
+        with self._lock:
+            queue = self._responses.get(url)
+            if not queue:
+                raise ReplayMissError("No recorded response for {}".format(url))
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+
+def create_backend(name=FETCH_BACKEND):
+    """
+    Build the named backend. When VLR_ARCHIVE_DIR is set, network backends
+    also store every page in the raw HTML archive (see utils/archive.py).
+    """
+    from utils.archive import ArchiveBackend, ArchiveReplayBackend, get_archive
+
+    archive = get_archive()
+    if name == "replay":
+        return ReplayBackend()
+    if name == "archive":
+        if archive is None:
+            raise ValueError("The archive fetch backend needs VLR_ARCHIVE_DIR set")
+        return ArchiveReplayBackend(archive)
+
+    if name == "session":
+        backend = SessionBackend()
+    elif name == "http2":
+        backend = Http2Backend()
+    elif name == "record":
+        backend = RecordBackend(SessionBackend())
+    else:
+        raise ValueError("Unknown fetch backend: {}".format(name))
+    return ArchiveBackend(backend, archive) if archive is not None else backend
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend()
+    return _backend
+
+
+def set_backend(backend):
+    """Swap the process-wide backend (e.g. to replay a recording in a benchmark)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+def fetch(url, timeout=DEFAULT_TIMEOUT):
+    """
+    GET ``url`` through the configured backend.
+
+    Args:
+        url (str): Absolute URL to fetch
+        timeout (float): Seconds before the request times out
+
+    Returns:
+        FetchResponse: Response with url, status_code and text
+
+    Raises:
+        RequestAborted: The current request was cancelled or is past its
+            deadline; the timeout is also shortened to end by the deadline
+    """
+    deadline.check()
+    return get_backend().fetch(url, deadline.clamp_timeout(timeout))
@@ -0,0 +1,71 @@
+import os
+
+from limits import parse
+
+from utils.cache import TTLCache, response_cache
+
+# Budget per client, in cost units (a cached response costs CACHE_HIT_COST)
+RATE_LIMIT = os.environ.get("VLR_RATE_LIMIT", "1200/minute")
+CACHE_HIT_COST = 1
+# Units charged per vlr.gg page a request is expected to fetch
+FETCH_COST = 10
+
+# A single request never costs more than the whole window, so the heaviest
+# calls are still possible but use up the client's budget for that window
+MAX_COST = parse(RATE_LIMIT).amount
+
+# Request URL -> response cache key, recorded by cached_json so the limiter can
+# tell a cache hit before the endpoint runs
+_request_keys = TTLCache(maxsize=4096, default_ttl=3600)
+
+
+def request_signature(request):
+    return (request.url.path, tuple(sorted(request.query_params.multi_items())))
+
+
+def remember_key(request, key):
+    _request_keys.set(request_signature(request), key)
+
+
+def is_cached(request):
+    key = _request_keys.get(request_signature(request))
+    return key is not None and key in response_cache
+
+
+def query_int(request, name, default=None):
+    try:
+        return int(request.query_params[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def query_bool(request, name, default=False):
+    value = request.query_params.get(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "t", "yes", "y", "on")
+
+
+def upstream_cost(fetches):
+    """
+    Build a slowapi ``cost`` callable for a route.
+
+    Args:
+        fetches (callable or int): Estimated vlr.gg fetches for a request, or a
+            function of the request returning that estimate
+
+    Returns:
+        callable: request -> cost units; CACHE_HIT_COST when the response is cached.
+            The estimate is stored on request.state.upstream_fetches.
+    """
+
+    def cost(request):
+        if is_cached(request):
+            estimate = 0
+        else:
+            estimate = max(0, fetches(request) if callable(fetches) else fetches)
+        # Also read by admission control to pick the request's lane
+        request.state.upstream_fetches = estimate
+        return min(MAX_COST, CACHE_HIT_COST + FETCH_COST * estimate)
+
+    return cost
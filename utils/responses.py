@@ -0,0 +1,99 @@
+import orjson
+from fastapi.responses import ORJSONResponse
+from starlette.responses import Response
+
+from utils.admission import lane_for, run_admitted
+from utils.cache import CACHE_TTL, response_cache
+from utils.rate_limit import remember_key
+from utils.compression import (
+    MIN_COMPRESS_SIZE,
+    available_encodings,
+    compress,
+    negotiate,
+)
+
+
+def encode_json(content):
+    """Serialize a payload to JSON bytes with orjson (same options as ORJSONResponse)."""
+    return orjson.dumps(
+        content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+
+
+class EncodedBody:
+    """
+    A JSON payload that has already been serialized to bytes.
+
+    Bodies above MIN_COMPRESS_SIZE are also compressed once with every
+    supported encoding, so cache hits never pay compression CPU.
+    """
+
+    __slots__ = ("body", "variants")
+
+    def __init__(self, body, precompress=True):
+        self.body = body
+        self.variants = {}
+        if precompress and len(body) >= MIN_COMPRESS_SIZE:
+            for encoding in available_encodings():
+                self.variants[encoding] = compress(body, encoding)
+
+    @classmethod
+    def from_content(cls, content, precompress=True):
+        return cls(encode_json(content), precompress)
+
+    def response(self, accept_encoding=None, status_code=200):
+        """Build a response, picking a precompressed variant the client accepts."""
+        encoding = negotiate(accept_encoding) if self.variants else None
+        if encoding in self.variants:
+            return json_bytes_response(
+                self.variants[encoding],
+                status_code=status_code,
+                headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+            )
+        headers = {"Vary": "Accept-Encoding"} if self.variants else None
+        return json_bytes_response(self.body, status_code=status_code, headers=headers)
+
+
+def json_bytes_response(body, status_code=200, headers=None):
+    """Write pre-encoded JSON bytes straight to the client, skipping jsonable_encoder."""
+    return Response(
+        content=body,
+        status_code=status_code,
+        headers=headers,
+        media_type=ORJSONResponse.media_type,
+    )
+
+
+async def cached_json(request, key, producer, ttl=None):
+    """
+    Serve ``producer()`` as JSON, caching the encoded body under ``key``.
+
+    A cache hit never touches the payload dict again: the stored bytes (or a
+    precompressed variant negotiated from Accept-Encoding) are written to the
+    response as-is. On a miss the producer runs in the threadpool once its
+    admission lane lets it in, so scrapes never block cache hits.
+
+    Args:
+        request (Request): Incoming request, used for encoding negotiation
+        key (tuple): Cache key; its first element names the payload kind in CACHE_TTL
+        producer (callable): Zero-argument callable returning the payload dict
+        ttl (float, optional): Override for the kind's default TTL
+
+    Returns:
+        Response: JSON response built from the cached bytes
+    """
+    remember_key(request, key)
+    entry = response_cache.get(key)
+    if entry is None:
+
+        def produce():
+            # Another request may have filled the entry while this one was queued
+            cached = response_cache.get(key)
+            if cached is not None:
+                return cached
+            encoded = EncodedBody.from_content(producer())
+            response_cache.set(key, encoded, ttl if ttl is not None else CACHE_TTL.get(key[0]))
+            return encoded
+
+        entry = await run_admitted(request, lane_for(request, key), produce)
+    return entry.response(request.headers.get("accept-encoding"))
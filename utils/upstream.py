@@ -0,0 +1,62 @@
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.deadline import RequestAborted
+
+
+# Maximum number of vlr.gg pages fetched at the same time by fan-out requests
+UPSTREAM_CONCURRENCY = int(os.environ.get("VLR_UPSTREAM_CONCURRENCY", 4))
+
+_executor = ThreadPoolExecutor(
+    max_workers=UPSTREAM_CONCURRENCY, thread_name_prefix="vlr-upstream"
+)
+_worker = threading.local()
+
+
+def _run_job(func, args):
+    was_active = getattr(_worker, "active", False)
+    _worker.active = True
+    try:
+        return func(*args), None
+    except Exception as e:
+        return None, e
+    finally:
+        _worker.active = was_active
+
+
+def fan_out(func, jobs):
+    """
+    Run ``func(*args)`` for every args tuple in ``jobs`` under the shared upstream budget.
+
+    All fan-out requests share one pool of UPSTREAM_CONCURRENCY workers, so the
+    total number of concurrent vlr.gg fetches stays bounded no matter how many
+    clients fan out at once. Calls made from inside a worker run inline to
+    avoid exhausting the pool.
+
+    Args:
+        func (callable): Function to call
+        jobs (list): Argument tuples, one per call
+
+    Returns:
+        list: (result, exception) pairs in the same order as ``jobs``
+
+    Raises:
+        RequestAborted: A job stopped because the calling request was
+            cancelled or ran out of time
+    """
+    jobs = list(jobs)
+    if getattr(_worker, "active", False) or len(jobs) <= 1:
+        outcomes = [_run_job(func, args) for args in jobs]
+    else:
+        # Each job runs in a copy of the caller's context so it sees the request deadline
+        futures = [
+            _executor.submit(contextvars.copy_context().run, _run_job, func, args)
+            for args in jobs
+        ]
+        outcomes = [future.result() for future in futures]
+    for _, error in outcomes:
+        if isinstance(error, RequestAborted):
+            raise error
+    return outcomes
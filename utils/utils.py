@@ -19,3 +19,10 @@ region = {
     "jp": "japan",
     "col": "collegiate",
 }
+
+# Regions and timespans vlr.gg offers stats tables for
+STATS_REGIONS = ("na", "eu", "ap", "sa", "jp", "oce", "mn", "all")
+STATS_TIMESPANS = ("30", "60", "90", "all")
+
+# Pages past the end of a results range a stable crawl may fetch to refill drifted rows
+MAX_REFILL_PAGES = 2